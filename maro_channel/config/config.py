@@ -7,6 +7,15 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 OPENAI_TEXT_MODEL = os.getenv("OPENAI_TEXT_MODEL", "gpt-4o-mini")
 OPENAI_TTS_MODEL = os.getenv("OPENAI_TTS_MODEL", "tts-1")
 OPENAI_TTS_VOICE = os.getenv("OPENAI_TTS_VOICE", "alloy")
+OPENAI_TTS_SPEED = float(os.getenv("OPENAI_TTS_SPEED", "1.0"))
+# TTS 캐시 (같은 모델/목소리/속도/문장은 API를 다시 호출하지 않음, 디렉토리를 비우면 사용 안 함)
+TTS_CACHE_DIR = os.path.expanduser(os.getenv("TTS_CACHE_DIR", os.path.join("~", ".cache", "maro", "tts")))
+TTS_CACHE_MAX_MB = int(os.getenv("TTS_CACHE_MAX_MB", "500"))
+# TTS 동시 요청 수와 분당 요청 한도 (API 요금제의 RPM에 맞춤)
+TTS_CONCURRENCY = int(os.getenv("TTS_CONCURRENCY", "4"))
+TTS_REQUESTS_PER_MINUTE = int(os.getenv("TTS_REQUESTS_PER_MINUTE", "50"))
+# 대본을 문장 단위로 나눌 때 TTS 요청 하나의 최대 글자 수
+TTS_MAX_CHARS = int(os.getenv("TTS_MAX_CHARS", "300"))
 
 YOUTUBE_CLIENT_SECRETS_FILE = os.getenv("YOUTUBE_CLIENT_SECRETS_FILE", "./client_secret.json")
 
@@ -42,4 +51,14 @@ CONTENT_TYPES = {
 
 VIDEO_RESOLUTION = os.getenv("VIDEO_RESOLUTION", "1920x1080")
 BACKGROUND_IMAGE = os.getenv("BACKGROUND_IMAGE", "./background.jpg")
+# 배경 애니메이션: none / auto (콘텐츠 타입별) / starlight / petals / waves
+BACKGROUND_ANIMATION = os.getenv("BACKGROUND_ANIMATION", "none")
+# 배경 사진 움직임: none / kenburns (천천히 확대/이동)
+BACKGROUND_MOTION = os.getenv("BACKGROUND_MOTION", "none")
+# 인코딩 품질 단계: draft (QA용 저화질) / review / publish (최종 업로드)
+ENCODING_PROFILE = os.getenv("ENCODING_PROFILE", "publish")
+# 렌더 백엔드: auto (calibrate 측정 결과 기준 최속, 없으면 우선순위) / scenes / vfr / stills / ffmpeg / ass / pipe / moviepy
+RENDER_BACKEND = os.getenv("RENDER_BACKEND", "auto")
+# 채널 인트로/아웃트로 범퍼 (한 번 렌더링 후 재사용, 켜면 모든 업로드 영상 앞뒤에 붙으므로 기본은 끔)
+USE_BUMPERS = os.getenv("USE_BUMPERS", "false").lower() == "true"
 OUTPUT_DIR = os.getenv("OUTPUT_DIR", "./maro_content")
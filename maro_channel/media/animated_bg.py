@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import zlib
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+import numpy as np
+from encoding_profiles import get_profile
+from frame_sink import FFmpegFrameSink
+
+# 루프 가능한 미니멀 애니메이션 배경 (별빛, 꽃잎, 파도 라인)
+# 모든 움직임의 주기를 루프 길이의 정수배로 맞춰 마지막 프레임 다음이 첫 프레임과 이어진다.
+# 스타일/해상도/배경별로 한 번만 렌더링해 인코딩 클립으로 캐시하고, 렌더 시에는
+# ffmpeg -stream_loop로 반복 재생한 위에 텍스트만 overlay한다.
+
+BACKGROUND_LOOP_DIR = os.getenv("MARO_BACKGROUND_LOOP_DIR", str(Path.home() / ".cache" / "maro" / "backgrounds"))
+ANIMATION_VERSION = 1
+
+# count: 입자/선 개수, size: 입자 반지름(px, 1080p 기준), loop_seconds: 루프 길이
+ANIMATION_STYLES = {
+    "starlight": {"kind": "stars", "count": 180, "size": 1.5, "color": (255, 248, 225), "loop_seconds": 10.0},
+    "petals": {"kind": "petals", "count": 36, "size": 5.0, "color": (255, 205, 215), "loop_seconds": 20.0},
+    "waves": {"kind": "waves", "count": 4, "size": 1.5, "color": (205, 225, 255), "loop_seconds": 12.0},
+}
+
+# background_animation이 "auto"일 때 콘텐츠 타입별 스타일
+CONTENT_ANIMATIONS = {
+    "daily_comfort": "starlight",
+    "healing_sound": "waves",
+    "overcome_story": "petals",
+    "custom_comfort": "petals",
+}
+
+def animation_for(content: Dict) -> Optional[str]:
+    """콘텐츠의 background_animation 값을 스타일 이름으로 해석 (없음/none이면 None)"""
+    style = content.get("background_animation")
+    if not style or style == "none":
+        return None
+    if style == "auto":
+        return CONTENT_ANIMATIONS.get(content.get("type"))
+    if style not in ANIMATION_STYLES:
+        raise ValueError(f"지원하지 않는 배경 애니메이션: {style}")
+    return style
+
+def _splat(alpha: np.ndarray, ys: np.ndarray, xs: np.ndarray, weights: np.ndarray):
+    """점 목록을 알파 맵에 누적 (화면 밖 좌표는 버림)"""
+    H, W = alpha.shape
+    keep = (ys >= 0) & (ys < H) & (xs >= 0) & (xs < W)
+    np.add.at(alpha, (ys[keep], xs[keep]), weights[keep])
+
+def _kernel(radius: float):
+    """반지름 radius의 부드러운 원형 커널 (오프셋 y, 오프셋 x, 가중치)"""
+    r = max(1, int(np.ceil(radius * 1.5)))
+    oy, ox = np.mgrid[-r:r + 1, -r:r + 1]
+    w = np.exp(-(oy ** 2 + ox ** 2) / (2.0 * max(radius, 0.5) ** 2))
+    keep = w > 0.05
+    return oy[keep], ox[keep], w[keep].astype(np.float32)
+
+def animation_frames(W: int, H: int, style: str, fps: int, base: np.ndarray) -> Iterator[np.ndarray]:
+    """한 루프 분량의 RGB 프레임을 순서대로 생성
+
+    입자/선의 초기값은 미리 배열로 만들어 두고, 프레임마다 모든 입자를
+    NumPy 연산 한 번으로 갱신/누적한다 (입자별 파이썬 반복 없음).
+    """
+    params = ANIMATION_STYLES[style]
+    loop = params["loop_seconds"]
+    n_frames = int(round(loop * fps))
+    scale = min(W, H) / 1080.0
+    rng = np.random.default_rng(zlib.crc32(f"{style}:{W}x{H}".encode()))
+    n = params["count"]
+    color = np.array(params["color"], dtype=np.float32)
+    base = np.ascontiguousarray(base, dtype=np.uint8)
+    base_flat = base.reshape(-1, 3).astype(np.float32)
+    omega = 2.0 * np.pi / loop
+
+    if params["kind"] == "waves":
+        xs = np.arange(W)
+        y0 = H * (0.62 + 0.07 * np.arange(n))
+        amp = H * rng.uniform(0.012, 0.025, n)
+        wavelength = W / rng.integers(1, 4, n)
+        speed = rng.integers(1, 3, n) * rng.choice([-1, 1], n)  # 루프당 위상 회전 수
+        phase = rng.uniform(0, 2 * np.pi, n)
+        thickness = max(params["size"] * scale, 1.0)
+        dy = np.arange(-int(np.ceil(thickness)) - 1, int(np.ceil(thickness)) + 2)
+    else:
+        oy, ox, kw = _kernel(params["size"] * scale)
+        px = rng.uniform(0, W, n)
+        py = rng.uniform(0, H, n)
+        phase = rng.uniform(0, 2 * np.pi, n)
+        freq = rng.integers(1, 4, n)
+        if params["kind"] == "petals":
+            # 루프 한 번에 화면 높이만큼(정수 배) 떨어지고 좌우로 흔들림
+            fall = H * rng.integers(1, 3, n)
+            sway = W * 0.02 * rng.uniform(0.5, 1.5, n)
+
+    for i in range(n_frames):
+        t = i / fps
+        alpha = np.zeros((H, W), dtype=np.float32)
+        if params["kind"] == "waves":
+            y = y0[:, None] + amp[:, None] * np.sin(2 * np.pi * xs[None, :] / wavelength[:, None]
+                                                    + speed[:, None] * omega * t + phase[:, None])
+            rows = np.floor(y)[:, None, :] + dy[None, :, None]
+            weights = np.clip(1.0 - (np.abs(rows - y[:, None, :]) - thickness / 2), 0, 1) * 0.35
+            _splat(alpha, rows.astype(np.int64).ravel(),
+                   np.broadcast_to(xs, rows.shape).ravel(), weights.astype(np.float32).ravel())
+        else:
+            if params["kind"] == "stars":
+                x, y = px, py
+                strength = 0.35 + 0.65 * (0.5 + 0.5 * np.sin(freq * omega * t + phase))
+            else:
+                x = (px + sway * np.sin(freq * omega * t + phase)) % W
+                y = (py + fall * t / loop) % H
+                strength = np.full(n, 0.7)
+            ys = (np.round(y).astype(np.int64)[:, None] + oy[None, :]).ravel()
+            cols = (np.round(x).astype(np.int64)[:, None] + ox[None, :]).ravel()
+            _splat(alpha, ys, cols, (strength[:, None] * kw[None, :]).ravel())
+        # 입자가 닿은 픽셀만 블렌딩
+        idx = np.flatnonzero(alpha)
+        a = np.minimum(alpha.ravel()[idx], 1.0)[:, None]
+        frame = base.copy()
+        frame.reshape(-1, 3)[idx] = (base_flat[idx] * (1.0 - a) + color * a + 0.5).astype(np.uint8)
+        yield frame
+
+def render_background_loop(W: int, H: int, style: str, profile: Union[str, Dict, None] = None,
+                           background_image: Optional[str] = None) -> str:
+    """애니메이션 배경 루프 클립 경로 (캐시에 없을 때만 렌더링)
+
+    클립은 렌더 해상도 그대로 저장되며 (프로파일 해상도 축소는 텍스트 합성 후 적용),
+    움직임이 있으므로 stillimage 튜닝 없이 인코딩한다.
+    """
+    from video_maker import background_frame, background_signature
+    profile = get_profile(profile)
+    loop_profile = dict(profile, tune=None, short_side=None)
+    payload = json.dumps({"style": ANIMATION_STYLES[style], "size": [W, H], "profile": loop_profile,
+                          "background": background_signature(background_image), "version": ANIMATION_VERSION},
+                         sort_keys=True)
+    key = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+    path = Path(BACKGROUND_LOOP_DIR) / f"{style}_{W}x{H}_{profile['fps']}fps_{key}.mp4"
+    if path.exists():
+        return str(path)
+
+    print(f"✨ 배경 애니메이션 루프 렌더링 (최초 1회): {path.name}")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp.mp4")
+    base = background_frame(background_image, W, H)
+    with FFmpegFrameSink(str(tmp_path), W, H, fps=profile["fps"], pix_fmt="rgb24", profile=loop_profile) as sink:
+        for frame in animation_frames(W, H, style, profile["fps"], base):
+            sink.write(frame)
+    os.replace(tmp_path, path)
+    return str(path)
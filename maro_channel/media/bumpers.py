@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from ffmpeg_encode import run_ffmpeg, write_concat_list, encode_stills
+from encoding_profiles import get_profile, video_codec_args, audio_codec_args
+from media_info import probe_audio_format, probe_video_format
+from compositor import TimelineCompositor
+from text_render import find_korean_font
+from video_maker import parse_resolution, background_frame, background_signature, plan_still_segments, text_layer
+
+# 채널 인트로/아웃트로 범퍼
+# 3분 구성안의 로고 인트로(10-15초)와 아웃트로(20-30초)는 매일 같으므로 채널 설정/해상도/
+# 프로파일/오디오 형식별로 한 번만 렌더링해 두고, 본편 앞뒤에 concat demuxer 스트림 복사로 붙인다.
+# 주제 소개와 요약처럼 회차마다 달라지는 부분은 본편에 남긴다.
+# 본편의 코덱/프로파일/크기/타임스케일/오디오 형식이 범퍼와 다르면 스트림 복사 대신 재인코딩으로 연결한다.
+
+BUMPER_CACHE_DIR = os.getenv("MARO_BUMPER_CACHE_DIR", str(Path.home() / ".cache" / "maro" / "bumpers"))
+BUMPER_VERSION = 1
+
+INTRO_SECONDS = 12.0
+OUTRO_SECONDS = 25.0
+
+DEFAULT_OUTRO_LINES = [
+    "오늘 하루도 잘 살아내셨습니다.\n내일도 함께 걸어가겠습니다.",
+    "당신은 혼자가 아닙니다.\n구독과 좋아요 부탁드려요!",
+]
+
+def bumper_layout(kind: str, channel: Dict, W: int, H: int, duration: float) -> List[dict]:
+    """범퍼 텍스트 레이아웃 (build_text_layout과 같은 항목 형식)"""
+    if kind == "intro":
+        return [
+            {"text": channel.get("name", ""), "fontsize": 72, "color": "white", "align": "center",
+             "box_width": W - 160, "position": ("center", H // 2 - 90), "start": 0.5, "duration": duration - 0.5},
+            {"text": channel.get("slogan", ""), "fontsize": 36, "color": "lightblue", "align": "center",
+             "box_width": W - 160, "position": ("center", H // 2 + 30), "start": 1.5, "duration": duration - 1.5},
+        ]
+    lines = channel.get("outro_lines") or DEFAULT_OUTRO_LINES
+    step = duration / len(lines)
+    return [{"text": line, "fontsize": 44, "color": "white", "align": "center", "box_width": W - 160,
+             "position": ("center", "center"), "start": i * step, "duration": step}
+            for i, line in enumerate(lines)]
+
+def _bumper_key(kind: str, channel: Dict, resolution: str, duration: float, profile: Dict,
+                audio_format: Optional[Tuple[int, int]], background: Dict) -> str:
+    payload = json.dumps({"kind": kind, "channel": channel, "resolution": resolution, "duration": duration,
+                          "profile": profile, "audio": audio_format, "background": background,
+                          "font": find_korean_font(), "version": BUMPER_VERSION},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+def render_bumper(kind: str, channel: Dict, resolution: str, profile: Union[str, Dict, None] = None,
+                  audio_format: Optional[Tuple[int, int]] = None, background_image: Optional[str] = None,
+                  duration: Optional[float] = None) -> str:
+    """범퍼 클립 경로 (캐시에 없을 때만 렌더링)
+
+    audio_format=(샘플레이트, 채널 수)이면 본편 오디오와 같은 형식의 무음 AAC 트랙을 넣어
+    스트림 복사로 이어 붙일 수 있게 한다.
+    """
+    profile = get_profile(profile)
+    duration = duration or (INTRO_SECONDS if kind == "intro" else OUTRO_SECONDS)
+    key = _bumper_key(kind, channel, resolution, duration, profile, audio_format,
+                      background_signature(background_image))
+    path = Path(BUMPER_CACHE_DIR) / f"{kind}_{key}.mp4"
+    if path.exists():
+        return str(path)
+
+    print(f"🎞️ {kind} 범퍼 렌더링 (최초 1회): {path.name}")
+    W, H = parse_resolution(resolution)
+    layout = bumper_layout(kind, channel, W, H, duration)
+    compositor = TimelineCompositor(background_frame(background_image, W, H), [text_layer(item, W, H) for item in layout])
+    stills = [(compositor.frame_at(start), end - start) for start, end in plan_still_segments(layout, duration)]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix="maro_bumper_") as work_dir:
+        silence = None
+        if audio_format:
+            sample_rate, channels = audio_format
+            silence = str(Path(work_dir) / "silence.wav")
+            run_ffmpeg(["-f", "lavfi", "-i", f"anullsrc=r={sample_rate}:cl={'mono' if channels == 1 else 'stereo'}",
+                        "-ac", channels, "-t", f"{duration:.6f}", silence])
+        tmp_path = str(Path(work_dir) / "bumper.mp4")
+        encode_stills(stills, silence, tmp_path, profile=profile)
+        shutil.move(tmp_path, str(path) + ".tmp")
+        os.replace(str(path) + ".tmp", path)
+    return str(path)
+
+def stream_formats(path: str) -> Tuple[Optional[Dict], Optional[Tuple[int, int]]]:
+    """스트림 복사 연결 가능 여부를 비교할 (비디오 형식, 오디오 형식)"""
+    return probe_video_format(path), probe_audio_format(path)
+
+def _reencode_concat(parts: List[str], main_path: str, out_path: str, profile: Dict):
+    """형식이 다른 클립을 본편 형식(크기/오디오 샘플레이트, 채널)에 맞춰 concat 필터로 재인코딩 연결"""
+    video_format, audio_format = stream_formats(main_path)
+    W, H = video_format["size"]
+    has_audio = all(probe_audio_format(p) for p in parts)
+    args, chains, inputs = [], [], ""
+    for i, part in enumerate(parts):
+        args += ["-i", part]
+        chains.append(f"[{i}:v]scale={W}:{H},setsar=1,fps={profile['fps']},format=yuv420p[v{i}]")
+        inputs += f"[v{i}]"
+        if has_audio:
+            sample_rate, channels = audio_format
+            chains.append(f"[{i}:a]aresample={sample_rate},"
+                          f"aformat=channel_layouts={'mono' if channels == 1 else 'stereo'}[a{i}]")
+            inputs += f"[a{i}]"
+    graph = ";".join(chains) + f";{inputs}concat=n={len(parts)}:v=1:a={int(has_audio)}[v]" + ("[a]" if has_audio else "")
+    args += ["-filter_complex", graph, "-map", "[v]"] + video_codec_args(profile)
+    if has_audio:
+        args += ["-map", "[a]"] + audio_codec_args(profile)
+    run_ffmpeg(args + ["-movflags", "+faststart", out_path])
+
+def splice_bumpers(main_path: str, out_path: str, intro: Optional[str] = None, outro: Optional[str] = None,
+                   profile: Union[str, Dict, None] = None) -> str:
+    """인트로 + 본편 + 아웃트로 연결
+
+    모든 클립의 스트림 형식이 같으면 재인코딩 없이 복사하고, 다르면 본편 형식에 맞춰 재인코딩한다.
+    """
+    parts = [p for p in (intro, main_path, outro) if p]
+    main_format = stream_formats(main_path)
+    if any(stream_formats(p) != main_format for p in parts if p != main_path):
+        print("⚠️ 범퍼와 본편의 스트림 형식이 달라 재인코딩으로 연결합니다")
+        _reencode_concat(parts, main_path, out_path, get_profile(profile))
+        return out_path
+    with tempfile.TemporaryDirectory(prefix="maro_splice_") as work_dir:
+        list_path = Path(work_dir) / "parts.ffconcat"
+        write_concat_list([(p, None) for p in parts], list_path)
+        run_ffmpeg(["-f", "concat", "-safe", "0", "-i", list_path, "-map", "0", "-c", "copy",
+                    "-movflags", "+faststart", out_path])
+    return out_path
+
+def add_bumpers(main_path: str, out_path: str, channel: Dict, resolution: str,
+                profile: Union[str, Dict, None] = None, background_image: Optional[str] = None) -> str:
+    """본편 영상의 오디오 형식에 맞춘 범퍼를 앞뒤에 붙여 out_path로 저장"""
+    audio_format = probe_audio_format(main_path)
+    intro = render_bumper("intro", channel, resolution, profile, audio_format, background_image)
+    outro = render_bumper("outro", channel, resolution, profile, audio_format, background_image)
+    return splice_bumpers(main_path, out_path, intro, outro, profile)
@@ -0,0 +1,167 @@
+from typing import List, Optional, Tuple
+import numpy as np
+
+# maro 채널 타임라인 합성기
+# CompositeVideoClip은 매 프레임마다 모든 클립의 시작/끝을 검사하므로
+# 스크립트가 길수록 프레임당 비용이 선형으로 증가한다. 여기서는 타임라인을
+# 정렬된 경계 배열로 색인해 O(log n) 탐색으로 활성 레이어만 합성한다.
+
+def resolve_position(pos, w: int, h: int, W: int, H: int) -> Tuple[int, int]:
+    """MoviePy 스타일 위치 ("center", 80) 등을 좌상단 픽셀 좌표로 변환"""
+    x, y = pos
+    named_x = {"left": 0, "center": (W - w) // 2, "right": W - w}
+    named_y = {"top": 0, "center": (H - h) // 2, "bottom": H - h}
+    x = named_x[x] if isinstance(x, str) else int(x)
+    y = named_y[y] if isinstance(y, str) else int(y)
+    return x, y
+
+class Layer:
+    """배경 위에 올라가는 정지 레이어 (RGB + 선택적 알파)"""
+
+    def __init__(self, rgb: np.ndarray, alpha: Optional[np.ndarray], x: int, y: int, start: float, end: float):
+        self.rgb = rgb
+        # 완전 불투명이면 알파 블렌딩 없이 복사
+        if alpha is not None and np.all(alpha >= 1.0):
+            alpha = None
+        self.alpha = None if alpha is None else alpha.astype(np.float32)[..., None]
+        self.x, self.y = int(x), int(y)
+        self.start, self.end = float(start), float(end)
+
+    def bbox(self, W: int, H: int) -> Optional[Tuple[int, int, int, int]]:
+        """프레임 안에 보이는 영역 (x0, y0, x1, y1) - 화면 밖이면 None"""
+        h, w = self.rgb.shape[:2]
+        x0, y0 = max(self.x, 0), max(self.y, 0)
+        x1, y1 = min(self.x + w, W), min(self.y + h, H)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        return x0, y0, x1, y1
+
+    def clip_region(self, W: int, H: int, rect: Optional[Tuple[int, int, int, int]] = None):
+        """(프레임 슬라이스, 레이어 슬라이스) - 프레임(과 rect)과 겹치지 않으면 None"""
+        box = self.bbox(W, H)
+        if box is None:
+            return None
+        x0, y0, x1, y1 = box
+        if rect is not None:
+            x0, y0 = max(x0, rect[0]), max(y0, rect[1])
+            x1, y1 = min(x1, rect[2]), min(y1, rect[3])
+            if x0 >= x1 or y0 >= y1:
+                return None
+        return (np.s_[y0:y1, x0:x1],
+                np.s_[y0 - self.y:y1 - self.y, x0 - self.x:x1 - self.x])
+
+    def blend_into(self, frame: np.ndarray, rect: Optional[Tuple[int, int, int, int]] = None):
+        """프레임과 겹치는 영역에만 레이어를 합성 (화면 밖 부분은 잘라냄, rect가 있으면 그 안만)"""
+        region = self.clip_region(frame.shape[1], frame.shape[0], rect)
+        if region is None:
+            return
+        dst_slice, src_slice = region
+        src = self.rgb[src_slice]
+        dst = frame[dst_slice]
+        if self.alpha is None:
+            dst[:] = src
+        else:
+            a = self.alpha[src_slice]
+            dst[:] = (dst * (1.0 - a) + src * a + 0.5).astype(np.uint8)
+
+class TimelineCompositor:
+    """구간 색인 기반 합성기
+
+    모든 레이어의 시작/끝 시각을 정렬된 경계 배열로 만들고, 각 기본 구간마다
+    활성 레이어 목록을 미리 계산한다. 프레임 시각 t의 활성 레이어는
+    np.searchsorted 한 번으로 찾는다.
+
+    정지 배경에서 순서대로 프레임을 뽑을 때는 next_frame()을 사용한다. 배경을 합성해 둔
+    작업 버퍼를 유지하고, 활성 레이어가 바뀐 구간에서만 바뀐 레이어의 영역(더티 사각형)을
+    배경으로 되돌린 뒤 그 안에 걸치는 레이어만 다시 합성한다.
+    """
+
+    def __init__(self, background, layers: List[Layer]):
+        # 배경은 정지 프레임 또는 시각 t → 프레임 함수 (Ken Burns 등 움직이는 배경)
+        self._background_fn = background if callable(background) else None
+        self.background = background(0.0) if callable(background) else background
+        self.layers = layers
+        bounds = sorted({t for layer in layers for t in (layer.start, layer.end)})
+        self._bounds = np.array(bounds, dtype=np.float64)
+        self._active = [[] for _ in range(max(len(bounds) - 1, 0))]
+        for idx, layer in enumerate(layers):
+            first = int(np.searchsorted(self._bounds, layer.start, side="left"))
+            last = int(np.searchsorted(self._bounds, layer.end, side="left"))
+            for k in range(first, last):
+                self._active[k].append(idx)
+        self._active = [tuple(a) for a in self._active]
+        # next_frame() 작업 버퍼와 현재 합성된 레이어 목록
+        self._frame = None
+        self._shown = ()
+
+    def active_at(self, t: float) -> Tuple[int, ...]:
+        """시각 t에 보이는 레이어 인덱스 (추가 순서 = 합성 순서)"""
+        k = int(np.searchsorted(self._bounds, t, side="right")) - 1
+        if k < 0 or k >= len(self._active):
+            return ()
+        return self._active[k]
+
+    def background_at(self, t: float) -> np.ndarray:
+        """시각 t의 배경 프레임 (정지 배경이면 복사본)"""
+        if self._background_fn is not None:
+            return np.array(self._background_fn(t), dtype=np.uint8)
+        return self.background.copy()
+
+    def frame_at(self, t: float) -> np.ndarray:
+        frame = self.background_at(t)
+        for idx in self.active_at(t):
+            self.layers[idx].blend_into(frame)
+        return frame
+
+    def next_frame(self, t: float) -> np.ndarray:
+        """시각 t의 프레임을 작업 버퍼에 증분 합성해 반환
+
+        반환 버퍼는 다음 호출 때 재사용되므로 보관하려면 복사해야 한다.
+        화면 구성이 바뀌지 않았으면 같은 버퍼 객체를 복사 없이 그대로 반환한다.
+        """
+        if self._background_fn is not None:
+            return self.frame_at(t)
+        active = self.active_at(t)
+        if self._frame is None:
+            self._frame, self._shown = self.frame_at(t), active
+            return self._frame
+        if active == self._shown:
+            return self._frame
+
+        H, W = self._frame.shape[:2]
+        changed = set(active).symmetric_difference(self._shown)
+        for idx in sorted(changed):
+            rect = self.layers[idx].bbox(W, H)
+            if rect is None:
+                continue
+            x0, y0, x1, y1 = rect
+            self._frame[y0:y1, x0:x1] = self.background[y0:y1, x0:x1]
+            for other in active:
+                self.layers[other].blend_into(self._frame, rect)
+        self._shown = active
+        return self._frame
+
+    def overlay_at(self, t: float) -> np.ndarray:
+        """배경 없이 활성 레이어만 합성한 RGBA 프레임 (움직이는 배경 위 ffmpeg overlay 입력용)"""
+        H, W = self.background.shape[:2]
+        rgb = np.zeros((H, W, 3), dtype=np.float32)  # 알파 곱셈(premultiplied) 색
+        alpha = np.zeros((H, W, 1), dtype=np.float32)
+        for idx in self.active_at(t):
+            layer = self.layers[idx]
+            region = layer.clip_region(W, H)
+            if region is None:
+                continue
+            dst_slice, src_slice = region
+            a = layer.alpha[src_slice] if layer.alpha is not None else 1.0
+            rgb[dst_slice] = layer.rgb[src_slice] * a + rgb[dst_slice] * (1.0 - a)
+            alpha[dst_slice] = a + alpha[dst_slice] * (1.0 - a)
+        np.divide(rgb, alpha, out=rgb, where=alpha > 0)
+        out = np.empty((H, W, 4), dtype=np.uint8)
+        out[..., :3] = rgb + 0.5
+        out[..., 3:] = alpha * 255.0 + 0.5
+        return out
+
+    def to_clip(self, duration: float):
+        """MoviePy VideoClip으로 감싸 write_videofile 등에 사용"""
+        from moviepy.editor import VideoClip
+        return VideoClip(make_frame=self.next_frame, duration=duration)
@@ -1,8 +1,8 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 """
-maro 채널 영상 생성기 - 3분 정확한 시간 맞춤
-3분 구성안에 맞춰서 정확한 시간으로 영상 생성
+maro 채널 영상 생성기 - 3분 구성안 비율
+3분 구성안(인트로 15초 / 본문 130초 / 아웃로 35초)의 비율을 나레이션 길이에 맞춰 영상 생성
 """
 
 import os
@@ -11,10 +11,16 @@ import cv2
 import numpy as np
 import subprocess
 import sys
+from frame_sink import FFmpegFrameSink, card_frame_counts
+from media_info import probe_duration
+from encoding_profiles import get_profile, video_codec_args, audio_codec_args
+from config import ENCODING_PROFILE
+
+PROFILE = get_profile(ENCODING_PROFILE)
 
 def create_3min_video():
-    """3분 정확한 시간으로 영상 생성"""
-    print("🎬 3분 정확한 시간으로 영상 생성...")
+    """3분 구성안 비율로 영상 생성 (전체 길이는 나레이션에 맞춤)"""
+    print("🎬 3분 구성안 비율로 영상 생성...")
     
     try:
         # 샘플 콘텐츠 로드
@@ -24,12 +30,33 @@ def create_3min_video():
         
         # 비디오 설정
         width, height = 1920, 1080
-        fps = 24
+        fps = PROFILE["fps"]
         
         # 비디오 라이터 생성
         output_file = "maro_sample_content/maro_3min_video.mp4"
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(output_file, fourcc, fps, (width, height))
+        audio_file = "maro_sample_content/narration.mp3"
+        # ffmpeg 한 프로세스로 H.264 인코딩 + 나레이션 먹싱
+        out = FFmpegFrameSink(output_file, width, height, fps,
+                              audio_path=audio_file if os.path.exists(audio_file) else None,
+                              profile=PROFILE, vfr=True)
+        
+        # 본문 텍스트들 (8개)
+        content_texts = [
+            "You did well today.",
+            "It's okay to take a break.",
+            "You are stronger than you think.",
+            "Small steps matter.",
+            "You are not alone.",
+            "You are doing great.",
+            "Take care of yourself.",
+            "Tomorrow will be better."
+        ]
+        
+        # 구성안 길이(인트로 15초, 본문 130초를 문장 수로 나눔, 아웃로 35초)를 나레이션 길이에 비례해 조정
+        # (나레이션이 없으면 구성안 그대로 180초)
+        narration = probe_duration(audio_file) if os.path.exists(audio_file) else None
+        body_seconds = [130 / len(content_texts)] * len(content_texts)
+        card_frames = card_frame_counts([15] + body_seconds + [35], fps, narration)
         
         # 배경 색상
         bg_color = (240, 248, 255)  # BGR 형식
@@ -40,8 +67,8 @@ def create_3min_video():
         color = (80, 62, 44)  # BGR 형식
         thickness = 3
         
-        # 1. 인트로 (15초) - 0:00-0:15
-        print("📝 인트로 프레임 생성 (15초)...")
+        # 1. 인트로 (3분 기준 15초) - 0:00-0:15
+        print(f"📝 인트로 프레임 생성 ({card_frames[0] / fps:.1f}초)...")
         intro_img = np.full((height, width, 3), bg_color, dtype=np.uint8)
         
         # 제목 텍스트
@@ -52,29 +79,14 @@ def create_3min_video():
         
         cv2.putText(intro_img, title_text, (x, y), font, font_scale, color, thickness)
         
-        # 15초 = 15 * 24 = 360 프레임
-        for i in range(15 * fps):
+        for i in range(card_frames[0]):
             out.write(intro_img)
         
-        # 2. 본문 (130초) - 0:15-2:25
-        print("📝 본문 프레임 생성 (130초)...")
-        
-        # 본문 텍스트들 (8개)
-        content_texts = [
-            "You did well today.",
-            "It's okay to take a break.",
-            "You are stronger than you think.",
-            "Small steps matter.",
-            "You are not alone.",
-            "You are doing great.",
-            "Take care of yourself.",
-            "Tomorrow will be better."
-        ]
-        
-        # 각 텍스트당 130초 / 8개 = 16.25초씩
-        frames_per_text = int(130 * fps / len(content_texts))
+        # 2. 본문 (3분 기준 130초) - 0:15-2:25
+        print(f"📝 본문 프레임 생성 ({sum(card_frames[1:-1]) / fps:.1f}초)...")
         
         for idx, text in enumerate(content_texts):
+            frames_per_text = card_frames[1 + idx]
             print(f"  - 프레임 {idx+1}: {text} ({frames_per_text/fps:.1f}초)")
             line_img = np.full((height, width, 3), bg_color, dtype=np.uint8)
             
@@ -87,8 +99,8 @@ def create_3min_video():
             for i in range(frames_per_text):
                 out.write(line_img)
         
-        # 3. 아웃로 (35초) - 2:25-3:00
-        print("📝 아웃로 프레임 생성 (35초)...")
+        # 3. 아웃로 (3분 기준 35초) - 2:25-3:00
+        print(f"📝 아웃로 프레임 생성 ({card_frames[-1] / fps:.1f}초)...")
         outro_img = np.full((height, width, 3), bg_color, dtype=np.uint8)
         
         # 아웃로 텍스트
@@ -99,19 +111,13 @@ def create_3min_video():
         
         cv2.putText(outro_img, outro_text, (x, y), font, font_scale, color, thickness)
         
-        # 35초 = 35 * 24 = 840 프레임
-        for i in range(35 * fps):
+        for i in range(card_frames[-1]):
             out.write(outro_img)
         
         out.release()
         
-        print(f"✅ 3분 영상 생성 완료: {output_file}")
-        print(f"📊 총 시간: {15 + 130 + 35}초 = 3분")
-        
-        # 오디오 추가
-        audio_file = "maro_sample_content/narration.mp3"
-        if os.path.exists(audio_file):
-            add_audio_to_video(output_file, audio_file)
+        print(f"✅ 3분 구성 영상 생성 완료: {output_file}")
+        print(f"📊 총 시간: {sum(card_frames) / fps:.1f}초")
         
         return True
         
@@ -121,45 +127,6 @@ def create_3min_video():
         traceback.print_exc()
         return False
 
-def add_audio_to_video(video_file, audio_file):
-    """FFmpeg로 오디오 추가"""
-    print("🎵 오디오 추가 중...")
-    
-    ffmpeg_path = "ffmpeg/ffmpeg-master-latest-win64-gpl/bin/ffmpeg.exe"
-    if not os.path.exists(ffmpeg_path):
-        print("❌ FFmpeg를 찾을 수 없음")
-        return False
-    
-    temp_file = video_file.replace('.mp4', '_with_audio.mp4')
-    
-    cmd = [
-        ffmpeg_path, '-y',
-        '-i', video_file,
-        '-i', audio_file,
-        '-c:v', 'copy',
-        '-c:a', 'aac',
-        '-b:a', '128k',
-        '-shortest',
-        temp_file
-    ]
-    
-    try:
-        subprocess.run(cmd, check=True, capture_output=True)
-        
-        if os.path.exists(temp_file):
-            os.replace(temp_file, video_file)
-            print("✅ 오디오 추가 완료")
-            return True
-        else:
-            print("❌ 임시 파일이 생성되지 않음")
-            return False
-        
-    except subprocess.CalledProcessError as e:
-        print(f"❌ 오디오 추가 실패: {e}")
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
-        return False
-
 def create_3min_video_with_ffmpeg():
     """FFmpeg로 3분 영상 생성"""
     print("🎬 FFmpeg로 3분 영상 생성...")
@@ -180,16 +147,15 @@ def create_3min_video_with_ffmpeg():
         # 출력 파일
         output_file = "maro_sample_content/maro_3min_ffmpeg.mp4"
         
-        # FFmpeg 명령어로 3분 영상 생성
+        # FFmpeg 명령어로 나레이션 길이만큼 영상 생성 (배경 길이를 맞추므로 -shortest 불필요)
+        duration = probe_duration(audio_file)
         cmd = [
             ffmpeg_path, '-y',
-            '-f', 'lavfi', '-i', 'color=c=0xFFF8F0:size=1920x1080:duration=180',  # 3분 = 180초
+            '-f', 'lavfi', '-i', f'color=c=0xFFF8F0:size=1920x1080:rate={PROFILE["fps"]}:duration={duration:.3f}',
             '-i', audio_file,
             '-vf', 'drawtext=text="Today\'s Comfort: Self-Esteem":fontsize=60:fontcolor=0x2C3E50:x=(w-text_w)/2:y=(h-text_h)/2:enable=\'between(t,0,15)\'',
-            '-c:v', 'libx264',
-            '-c:a', 'aac',
-            '-b:a', '128k',
-            '-shortest',
+            *video_codec_args(PROFILE),
+            *audio_codec_args(PROFILE),
             output_file
         ]
         
@@ -7,10 +7,18 @@ PIL 폰트 문제를 완전히 우회하는 방법
 
 import os
 import json
+import datetime
 import cv2
 import numpy as np
 import subprocess
 import sys
+import srt
+from frame_sink import FFmpegFrameSink, card_frame_counts
+from media_info import probe_duration
+from encoding_profiles import get_profile, video_codec_args, audio_codec_args
+from config import ENCODING_PROFILE
+
+PROFILE = get_profile(ENCODING_PROFILE)
 
 def create_video_with_cv2_only():
     """OpenCV만 사용한 영상 생성 (PIL 없이)"""
@@ -24,17 +32,36 @@ def create_video_with_cv2_only():
         
         # 비디오 설정
         width, height = 1920, 1080
-        fps = 24
+        fps = PROFILE["fps"]
         
         # 비디오 라이터 생성
         output_file = "maro_sample_content/maro_cv2_only.mp4"
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(output_file, fourcc, fps, (width, height))
+        audio_file = "maro_sample_content/narration.mp3"
+        # ffmpeg 한 프로세스로 H.264 인코딩 + 나레이션 먹싱
+        out = FFmpegFrameSink(output_file, width, height, fps,
+                              audio_path=audio_file if os.path.exists(audio_file) else None,
+                              profile=PROFILE, vfr=True)
+        
+        # 콘텐츠 텍스트 (영문으로)
+        content_texts = [
+            "You did well today.",
+            "It's okay to take a break.",
+            "You are stronger than you think.",
+            "Small steps matter.",
+            "You are not alone.",
+            "You are doing great.",
+            "Take care of yourself.",
+            "Tomorrow will be better."
+        ]
+        
+        # 카드 길이 (제목 3초, 문장 4초씩, 마무리 3초)를 나레이션 길이에 비례해 조정
+        narration = probe_duration(audio_file) if os.path.exists(audio_file) else None
+        card_frames = card_frame_counts([3] + [4] * len(content_texts) + [3], fps, narration)
         
         # 배경 색상
         bg_color = (240, 248, 255)  # BGR 형식
         
-        # 제목 프레임 (3초)
+        # 제목 프레임
         print("📝 제목 프레임 생성...")
         title_img = np.full((height, width, 3), bg_color, dtype=np.uint8)
         
@@ -52,25 +79,14 @@ def create_video_with_cv2_only():
         
         cv2.putText(title_img, title_text, (x, y), font, font_scale, color, thickness)
         
-        for i in range(3 * fps):
+        for i in range(card_frames[0]):
             out.write(title_img)
         
-        # 콘텐츠 프레임들 (영문으로)
-        content_texts = [
-            "You did well today.",
-            "It's okay to take a break.",
-            "You are stronger than you think.",
-            "Small steps matter.",
-            "You are not alone.",
-            "You are doing great.",
-            "Take care of yourself.",
-            "Tomorrow will be better."
-        ]
-        
+        # 콘텐츠 프레임들
         print(f"📝 콘텐츠 프레임 생성 ({len(content_texts)}개)...")
         
         for idx, text in enumerate(content_texts):
-            print(f"  - 프레임 {idx+1}: {text}")
+            print(f"  - 프레임 {idx+1}: {text} ({card_frames[idx + 1] / fps:.1f}초)")
             line_img = np.full((height, width, 3), bg_color, dtype=np.uint8)
             
             text_size = cv2.getTextSize(text, font, font_scale, thickness)[0]
@@ -79,7 +95,7 @@ def create_video_with_cv2_only():
             
             cv2.putText(line_img, text, (x, y), font, font_scale, color, thickness)
             
-            for i in range(4 * fps):
+            for i in range(card_frames[idx + 1]):
                 out.write(line_img)
         
         # 마무리 프레임
@@ -93,18 +109,13 @@ def create_video_with_cv2_only():
         
         cv2.putText(outro_img, outro_text, (x, y), font, font_scale, color, thickness)
         
-        for i in range(3 * fps):
+        for i in range(card_frames[-1]):
             out.write(outro_img)
         
         out.release()
         
         print(f"✅ OpenCV만 사용한 영상 생성 완료: {output_file}")
         
-        # 오디오 추가
-        audio_file = "maro_sample_content/narration.mp3"
-        if os.path.exists(audio_file):
-            add_audio_to_video(output_file, audio_file)
-        
         return True
         
     except Exception as e:
@@ -113,45 +124,6 @@ def create_video_with_cv2_only():
         traceback.print_exc()
         return False
 
-def add_audio_to_video(video_file, audio_file):
-    """FFmpeg로 오디오 추가"""
-    print("🎵 오디오 추가 중...")
-    
-    ffmpeg_path = "ffmpeg/ffmpeg-master-latest-win64-gpl/bin/ffmpeg.exe"
-    if not os.path.exists(ffmpeg_path):
-        print("❌ FFmpeg를 찾을 수 없음")
-        return False
-    
-    temp_file = video_file.replace('.mp4', '_with_audio.mp4')
-    
-    cmd = [
-        ffmpeg_path, '-y',
-        '-i', video_file,
-        '-i', audio_file,
-        '-c:v', 'copy',
-        '-c:a', 'aac',
-        '-b:a', '128k',
-        '-shortest',
-        temp_file
-    ]
-    
-    try:
-        subprocess.run(cmd, check=True, capture_output=True)
-        
-        if os.path.exists(temp_file):
-            os.replace(temp_file, video_file)
-            print("✅ 오디오 추가 완료")
-            return True
-        else:
-            print("❌ 임시 파일이 생성되지 않음")
-            return False
-        
-    except subprocess.CalledProcessError as e:
-        print(f"❌ 오디오 추가 실패: {e}")
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
-        return False
-
 def create_video_with_ffmpeg_text():
     """FFmpeg의 drawtext 필터를 사용한 영상 생성"""
     print("🎬 FFmpeg drawtext를 사용한 영상 생성...")
@@ -177,16 +149,15 @@ def create_video_with_ffmpeg_text():
         # 출력 파일
         output_file = "maro_sample_content/maro_ffmpeg_text.mp4"
         
-        # FFmpeg 명령어로 텍스트가 포함된 영상 생성
+        # FFmpeg 명령어로 텍스트가 포함된 영상 생성 (배경 길이를 나레이션에 맞추므로 -shortest 불필요)
+        duration = probe_duration(audio_file)
         cmd = [
             ffmpeg_path, '-y',
-            '-f', 'lavfi', '-i', 'color=c=0xFFF8F0:size=1920x1080:duration=35',
+            '-f', 'lavfi', '-i', f'color=c=0xFFF8F0:size=1920x1080:rate={PROFILE["fps"]}:duration={duration:.3f}',
             '-i', audio_file,
             '-vf', 'drawtext=text="Today\'s Comfort: Self-Esteem":fontsize=60:fontcolor=0x2C3E50:x=(w-text_w)/2:y=(h-text_h)/2:enable=\'between(t,0,3)\'',
-            '-c:v', 'libx264',
-            '-c:a', 'aac',
-            '-b:a', '128k',
-            '-shortest',
+            *video_codec_args(PROFILE),
+            *audio_codec_args(PROFILE),
             output_file
         ]
         
@@ -212,36 +183,33 @@ def create_video_with_subtitles_only():
         with open(content_file, 'r', encoding='utf-8') as f:
             content = json.load(f)
         
+        # 자막 텍스트 (영문으로)
+        content_texts = [
+            "You did well today.",
+            "It's okay to take a break.",
+            "You are stronger than you think.",
+            "Small steps matter.",
+            "You are not alone.",
+            "You are doing great.",
+            "Take care of yourself.",
+            "Tomorrow will be better."
+        ]
+        texts = ["Today's Comfort: Self-Esteem"] + content_texts + ["You are not alone."]
+        
+        # 자막 길이 (제목 3초, 문장 4초씩, 마무리 3초)를 나레이션 길이에 비례해 ms 단위로 조정
+        audio_file = "maro_sample_content/narration.mp3"
+        duration = probe_duration(audio_file)
+        card_ms = card_frame_counts([3] + [4] * len(content_texts) + [3], 1000, duration)
+        
         # 자막 파일 생성
         subtitle_file = "maro_sample_content/subtitles_english.srt"
+        subs, start_ms = [], 0
+        for i, (text, ms) in enumerate(zip(texts, card_ms), start=1):
+            subs.append(srt.Subtitle(index=i, start=datetime.timedelta(milliseconds=start_ms),
+                                     end=datetime.timedelta(milliseconds=start_ms + ms), content=text))
+            start_ms += ms
         with open(subtitle_file, 'w', encoding='utf-8') as f:
-            f.write("1\n")
-            f.write("00:00:00,000 --> 00:00:03,000\n")
-            f.write("Today's Comfort: Self-Esteem\n\n")
-            
-            content_texts = [
-                "You did well today.",
-                "It's okay to take a break.",
-                "You are stronger than you think.",
-                "Small steps matter.",
-                "You are not alone.",
-                "You are doing great.",
-                "Take care of yourself.",
-                "Tomorrow will be better."
-            ]
-            
-            start_time = 3
-            for i, text in enumerate(content_texts):
-                end_time = start_time + 4
-                f.write(f"{i+2}\n")
-                f.write(f"00:00:{start_time:02d},000 --> 00:00:{end_time:02d},000\n")
-                f.write(f"{text}\n\n")
-                start_time = end_time
-            
-            # 마무리 자막
-            f.write(f"{len(content_texts)+2}\n")
-            f.write(f"00:00:{start_time:02d},000 --> 00:00:{start_time+3:02d},000\n")
-            f.write("You are not alone.\n\n")
+            f.write(srt.compose(subs))
         
         print(f"✅ 영문 자막 파일 생성: {subtitle_file}")
         
@@ -253,17 +221,15 @@ def create_video_with_subtitles_only():
         
         # 단색 배경 영상 생성
         output_file = "maro_sample_content/maro_subtitles_only.mp4"
-        audio_file = "maro_sample_content/narration.mp3"
         
+        # 배경 길이를 나레이션에 맞추므로 -shortest 불필요
         cmd = [
             ffmpeg_path, '-y',
-            '-f', 'lavfi', '-i', 'color=c=0xFFF8F0:size=1920x1080:duration=35',
+            '-f', 'lavfi', '-i', f'color=c=0xFFF8F0:size=1920x1080:rate={PROFILE["fps"]}:duration={duration:.3f}',
             '-i', audio_file,
             '-vf', f'subtitles={subtitle_file}:force_style=\'FontSize=40,PrimaryColour=&H000000FF,OutlineColour=&HFFFFFF00,Outline=2\'',
-            '-c:v', 'libx264',
-            '-c:a', 'aac',
-            '-b:a', '128k',
-            '-shortest',
+            *video_codec_args(PROFILE),
+            *audio_codec_args(PROFILE),
             output_file
         ]
         
@@ -10,6 +10,10 @@ import json
 import subprocess
 import sys
 from pathlib import Path
+from encoding_profiles import get_profile, video_codec_args, audio_codec_args
+from config import ENCODING_PROFILE
+
+PROFILE = get_profile(ENCODING_PROFILE)
 
 def check_moviepy_installation():
     """MoviePy 설치 상태 확인"""
@@ -113,9 +117,12 @@ def create_simple_video_with_moviepy():
         output_file = "maro_sample_content/maro_sample_video.mp4"
         final_video.write_videofile(
             output_file,
-            fps=24,
+            fps=PROFILE["fps"],
             codec='libx264',
+            preset=PROFILE["preset"],
+            ffmpeg_params=['-crf', str(PROFILE["crf"]), '-g', str(PROFILE["gop"])],
             audio_codec='aac',
+            audio_bitrate=PROFILE["audio_bitrate"],
             temp_audiofile='temp-audio.m4a',
             remove_temp=True
         )
@@ -171,11 +178,11 @@ def create_video_with_ffmpeg():
     output_file = "maro_sample_content/maro_sample_video.mp4"
     cmd = [
         'ffmpeg', '-y',
-        '-f', 'lavfi', '-i', 'color=c=0xFFF8F0:size=1920x1080:duration=30',
+        '-f', 'lavfi', '-i', f'color=c=0xFFF8F0:size=1920x1080:rate={PROFILE["fps"]}:duration=30',
         '-i', audio_file,
         '-vf', f'subtitles={subtitle_file}:force_style=\'FontSize=40,PrimaryColour=&H000000FF\'',
-        '-c:v', 'libx264',
-        '-c:a', 'aac',
+        *video_codec_args(PROFILE),
+        *audio_codec_args(PROFILE),
         '-shortest',
         output_file
     ]
@@ -10,9 +10,14 @@ import json
 import cv2
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
-import subprocess
 import sys
+from frame_sink import FFmpegFrameSink, card_frame_counts
+from media_info import probe_duration
 import platform
+from encoding_profiles import get_profile
+from config import ENCODING_PROFILE
+
+PROFILE = get_profile(ENCODING_PROFILE)
 
 def get_korean_font():
     """한글 폰트 경로 찾기"""
@@ -100,66 +105,6 @@ def create_text_image_korean(text, width=1920, height=200, font_size=60, bg_colo
     cv_img = cv2.cvtColor(np.array(img), cv2.COLOR_RGB2BGR)
     return cv_img
 
-def add_audio_with_ffmpeg(video_file, audio_file):
-    """FFmpeg를 사용해 오디오 추가 (개선된 버전)"""
-    print("🎵 오디오 추가 중...")
-    
-    # FFmpeg 경로 찾기
-    ffmpeg_paths = [
-        "ffmpeg",  # PATH에 있는 경우
-        "C:/ProgramData/chocolatey/bin/ffmpeg.exe",  # Chocolatey 설치
-        "C:/ffmpeg/bin/ffmpeg.exe",  # 수동 설치
-    ]
-    
-    ffmpeg_cmd = None
-    for path in ffmpeg_paths:
-        try:
-            result = subprocess.run([path, '-version'], capture_output=True, check=True)
-            ffmpeg_cmd = path
-            print(f"✅ FFmpeg 발견: {path}")
-            break
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            continue
-    
-    if not ffmpeg_cmd:
-        print("❌ FFmpeg를 찾을 수 없음")
-        return False
-    
-    # 임시 파일명
-    temp_file = video_file.replace('.mp4', '_with_audio.mp4')
-    
-    # FFmpeg 명령어로 오디오 추가
-    cmd = [
-        ffmpeg_cmd, '-y',
-        '-i', video_file,
-        '-i', audio_file,
-        '-c:v', 'copy',
-        '-c:a', 'aac',
-        '-b:a', '128k',
-        '-shortest',
-        temp_file
-    ]
-    
-    try:
-        print("🔄 FFmpeg 실행 중...")
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        
-        # 원본 파일을 임시 파일로 교체
-        if os.path.exists(temp_file):
-            os.replace(temp_file, video_file)
-            print("✅ 오디오 추가 완료")
-            return True
-        else:
-            print("❌ 임시 파일이 생성되지 않음")
-            return False
-        
-    except subprocess.CalledProcessError as e:
-        print(f"❌ FFmpeg 실행 실패: {e}")
-        print(f"stderr: {e.stderr}")
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
-        return False
-
 def create_improved_video():
     """개선된 영상 생성"""
     print("🎬 개선된 영상 생성 시작...")
@@ -178,14 +123,20 @@ def create_improved_video():
         
         # 비디오 설정
         width, height = 1920, 1080
-        fps = 24
+        fps = PROFILE["fps"]
         
         # 비디오 라이터 생성
         output_file = "maro_sample_content/maro_fixed_video.mp4"
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(output_file, fourcc, fps, (width, height))
+        # ffmpeg 한 프로세스로 H.264 인코딩 + 나레이션 먹싱
+        out = FFmpegFrameSink(output_file, width, height, fps,
+                              audio_path=audio_file if os.path.exists(audio_file) else None,
+                              profile=PROFILE, vfr=True)
         
-        # 제목 프레임 (3초)
+        # 카드 길이 (제목 3초, 문단 4초씩, 마무리 3초)를 나레이션 길이에 비례해 조정
+        content_lines = [line.strip() for line in content['content'].split('\n\n') if line.strip()]
+        card_frames = card_frame_counts([3] + [4] * len(content_lines) + [3], fps, probe_duration(audio_file))
+        
+        # 제목 프레임
         print("📝 제목 프레임 생성...")
         title_img = create_text_image_korean(
             content['title'], 
@@ -195,28 +146,26 @@ def create_improved_video():
             text_color=(44, 62, 80)
         )
         
-        for i in range(3 * fps):  # 3초
+        for i in range(card_frames[0]):
             out.write(title_img)
         
-        # 콘텐츠 프레임들 (각 4초씩)
-        content_lines = content['content'].split('\n\n')
+        # 콘텐츠 프레임들
         print(f"📝 콘텐츠 프레임 생성 ({len(content_lines)}개)...")
         
         for idx, line in enumerate(content_lines):
-            if line.strip():
-                print(f"  - 프레임 {idx+1}: {line.strip()[:30]}...")
-                line_img = create_text_image_korean(
-                    line.strip(),
-                    width, height,
-                    font_size=50,
-                    bg_color=(255, 248, 240),
-                    text_color=(52, 73, 94)
-                )
-                
-                for i in range(4 * fps):  # 4초
-                    out.write(line_img)
+            print(f"  - 프레임 {idx+1}: {line[:30]}... ({card_frames[idx + 1] / fps:.1f}초)")
+            line_img = create_text_image_korean(
+                line,
+                width, height,
+                font_size=50,
+                bg_color=(255, 248, 240),
+                text_color=(52, 73, 94)
+            )
+            
+            for i in range(card_frames[idx + 1]):
+                out.write(line_img)
         
-        # 마무리 프레임 (3초)
+        # 마무리 프레임
         print("📝 마무리 프레임 생성...")
         outro_text = "당신은 혼자가 아닙니다.\n\n구독과 좋아요 부탁드려요!"
         outro_img = create_text_image_korean(
@@ -227,19 +176,13 @@ def create_improved_video():
             text_color=(44, 62, 80)
         )
         
-        for i in range(3 * fps):  # 3초
+        for i in range(card_frames[-1]):
             out.write(outro_img)
         
         out.release()
         
         print(f"✅ 영상 생성 완료: {output_file}")
         
-        # 오디오 추가
-        if add_audio_with_ffmpeg(output_file, audio_file):
-            print("✅ 오디오 추가 완료!")
-        else:
-            print("⚠️ 영상은 생성되었지만 오디오 추가 실패")
-        
         return True
         
     except Exception as e:
@@ -260,7 +203,7 @@ def create_simple_video_without_ffmpeg():
         
         # 비디오 설정
         width, height = 1920, 1080
-        fps = 24
+        fps = PROFILE["fps"]
         
         # 비디오 라이터 생성
         output_file = "maro_sample_content/maro_simple_video.mp4"
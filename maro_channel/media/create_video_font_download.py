@@ -7,13 +7,21 @@ maro 채널 영상 생성기 - 폰트 다운로드 방식
 
 import os
 import json
+import datetime
 import cv2
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 import subprocess
 import sys
+from frame_sink import FFmpegFrameSink, card_frame_counts
+from media_info import probe_duration
 import platform
 import urllib.request
+import srt
+from encoding_profiles import get_profile, video_codec_args, audio_codec_args
+from config import ENCODING_PROFILE
+
+PROFILE = get_profile(ENCODING_PROFILE)
 
 def download_korean_font():
     """한글 폰트 다운로드"""
@@ -149,14 +157,22 @@ def create_video_with_downloaded_font():
         
         # 비디오 설정
         width, height = 1920, 1080
-        fps = 24
+        fps = PROFILE["fps"]
         
         # 비디오 라이터 생성
         output_file = "maro_sample_content/maro_downloaded_font.mp4"
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(output_file, fourcc, fps, (width, height))
+        audio_file = "maro_sample_content/narration.mp3"
+        # ffmpeg 한 프로세스로 H.264 인코딩 + 나레이션 먹싱
+        out = FFmpegFrameSink(output_file, width, height, fps,
+                              audio_path=audio_file if os.path.exists(audio_file) else None,
+                              profile=PROFILE, vfr=True)
         
-        # 제목 프레임 (3초)
+        # 카드 길이 (제목 3초, 문단 4초씩, 마무리 3초)를 나레이션 길이에 비례해 조정
+        content_lines = [line.strip() for line in content['content'].split('\n\n') if line.strip()]
+        narration = probe_duration(audio_file) if os.path.exists(audio_file) else None
+        card_frames = card_frame_counts([3] + [4] * len(content_lines) + [3], fps, narration)
+        
+        # 제목 프레임
         print("📝 제목 프레임 생성...")
         title_img = create_text_image_with_downloaded_font(
             content['title'], 
@@ -167,32 +183,31 @@ def create_video_with_downloaded_font():
         )
         
         if title_img is not None:
-            for i in range(3 * fps):
+            for i in range(card_frames[0]):
                 out.write(title_img)
         else:
             print("❌ 제목 이미지 생성 실패")
             return False
         
         # 콘텐츠 프레임들
-        content_lines = content['content'].split('\n\n')
         print(f"📝 콘텐츠 프레임 생성 ({len(content_lines)}개)...")
         
         for idx, line in enumerate(content_lines):
-            if line.strip():
-                print(f"  - 프레임 {idx+1}: {line.strip()[:30]}...")
-                line_img = create_text_image_with_downloaded_font(
-                    line.strip(),
-                    width, height,
-                    font_size=50,
-                    bg_color=(255, 248, 240),
-                    text_color=(52, 73, 94)
-                )
-                
-                if line_img is not None:
-                    for i in range(4 * fps):
-                        out.write(line_img)
-                else:
-                    print(f"❌ 프레임 {idx+1} 이미지 생성 실패")
+            print(f"  - 프레임 {idx+1}: {line[:30]}... ({card_frames[idx + 1] / fps:.1f}초)")
+            line_img = create_text_image_with_downloaded_font(
+                line,
+                width, height,
+                font_size=50,
+                bg_color=(255, 248, 240),
+                text_color=(52, 73, 94)
+            )
+            
+            if line_img is None:
+                # 나레이션과 어긋나지 않도록 이미지 생성에 실패한 카드는 제목 화면으로 채움
+                print(f"❌ 프레임 {idx+1} 이미지 생성 실패")
+                line_img = title_img
+            for i in range(card_frames[idx + 1]):
+                out.write(line_img)
         
         # 마무리 프레임
         print("📝 마무리 프레임 생성...")
@@ -205,19 +220,13 @@ def create_video_with_downloaded_font():
             text_color=(44, 62, 80)
         )
         
-        if outro_img is not None:
-            for i in range(3 * fps):
-                out.write(outro_img)
+        for i in range(card_frames[-1]):
+            out.write(outro_img if outro_img is not None else title_img)
         
         out.release()
         
         print(f"✅ 다운로드한 폰트 영상 생성 완료: {output_file}")
         
-        # 오디오 추가
-        audio_file = "maro_sample_content/narration.mp3"
-        if os.path.exists(audio_file):
-            add_audio_to_video(output_file, audio_file)
-        
         return True
         
     except Exception as e:
@@ -226,45 +235,6 @@ def create_video_with_downloaded_font():
         traceback.print_exc()
         return False
 
-def add_audio_to_video(video_file, audio_file):
-    """FFmpeg로 오디오 추가"""
-    print("🎵 오디오 추가 중...")
-    
-    ffmpeg_path = "ffmpeg/ffmpeg-master-latest-win64-gpl/bin/ffmpeg.exe"
-    if not os.path.exists(ffmpeg_path):
-        print("❌ FFmpeg를 찾을 수 없음")
-        return False
-    
-    temp_file = video_file.replace('.mp4', '_with_audio.mp4')
-    
-    cmd = [
-        ffmpeg_path, '-y',
-        '-i', video_file,
-        '-i', audio_file,
-        '-c:v', 'copy',
-        '-c:a', 'aac',
-        '-b:a', '128k',
-        '-shortest',
-        temp_file
-    ]
-    
-    try:
-        subprocess.run(cmd, check=True, capture_output=True)
-        
-        if os.path.exists(temp_file):
-            os.replace(temp_file, video_file)
-            print("✅ 오디오 추가 완료")
-            return True
-        else:
-            print("❌ 임시 파일이 생성되지 않음")
-            return False
-        
-    except subprocess.CalledProcessError as e:
-        print(f"❌ 오디오 추가 실패: {e}")
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
-        return False
-
 def create_video_with_ffmpeg_subtitles():
     """FFmpeg 자막을 사용한 영상 생성"""
     print("🎬 FFmpeg 자막을 사용한 영상 생성...")
@@ -275,27 +245,23 @@ def create_video_with_ffmpeg_subtitles():
         with open(content_file, 'r', encoding='utf-8') as f:
             content = json.load(f)
         
+        audio_file = "maro_sample_content/narration.mp3"
+        duration = probe_duration(audio_file)
+        
+        # 자막 길이 (제목 3초, 문단 4초씩, 마무리 3초)를 나레이션 길이에 비례해 ms 단위로 조정
+        content_lines = [line.strip() for line in content['content'].split('\n\n') if line.strip()]
+        texts = [content['title']] + content_lines + ["당신은 혼자가 아닙니다."]
+        card_ms = card_frame_counts([3] + [4] * len(content_lines) + [3], 1000, duration)
+        
         # 자막 파일 생성 (UTF-8 BOM 포함)
         subtitle_file = "maro_sample_content/subtitles_utf8.srt"
+        subs, start_ms = [], 0
+        for i, (text, ms) in enumerate(zip(texts, card_ms), start=1):
+            subs.append(srt.Subtitle(index=i, start=datetime.timedelta(milliseconds=start_ms),
+                                     end=datetime.timedelta(milliseconds=start_ms + ms), content=text))
+            start_ms += ms
         with open(subtitle_file, 'w', encoding='utf-8-sig') as f:  # BOM 포함
-            f.write("1\n")
-            f.write("00:00:00,000 --> 00:00:03,000\n")
-            f.write(f"{content['title']}\n\n")
-            
-            content_lines = content['content'].split('\n\n')
-            start_time = 3
-            for i, line in enumerate(content_lines):
-                if line.strip():
-                    end_time = start_time + 4
-                    f.write(f"{i+2}\n")
-                    f.write(f"00:00:{start_time:02d},000 --> 00:00:{end_time:02d},000\n")
-                    f.write(f"{line.strip()}\n\n")
-                    start_time = end_time
-            
-            # 마무리 자막
-            f.write(f"{len(content_lines)+2}\n")
-            f.write(f"00:00:{start_time:02d},000 --> 00:00:{start_time+3:02d},000\n")
-            f.write("당신은 혼자가 아닙니다.\n\n")
+            f.write(srt.compose(subs))
         
         print(f"✅ UTF-8 자막 파일 생성: {subtitle_file}")
         
@@ -307,17 +273,15 @@ def create_video_with_ffmpeg_subtitles():
         
         # 단색 배경 영상 생성
         output_file = "maro_sample_content/maro_ffmpeg_subtitle.mp4"
-        audio_file = "maro_sample_content/narration.mp3"
         
+        # 배경 길이를 나레이션에 맞추므로 -shortest 불필요
         cmd = [
             ffmpeg_path, '-y',
-            '-f', 'lavfi', '-i', 'color=c=0xFFF8F0:size=1920x1080:duration=35',
+            '-f', 'lavfi', '-i', f'color=c=0xFFF8F0:size=1920x1080:rate={PROFILE["fps"]}:duration={duration:.3f}',
             '-i', audio_file,
             '-vf', f'subtitles={subtitle_file}:force_style=\'FontSize=40,PrimaryColour=&H000000FF,OutlineColour=&HFFFFFF00,Outline=2\'',
-            '-c:v', 'libx264',
-            '-c:a', 'aac',
-            '-b:a', '128k',
-            '-shortest',
+            *video_codec_args(PROFILE),
+            *audio_codec_args(PROFILE),
             output_file
         ]
         
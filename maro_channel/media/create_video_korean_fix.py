@@ -10,9 +10,14 @@ import json
 import cv2
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
-import subprocess
 import sys
+from frame_sink import FFmpegFrameSink, card_frame_counts
+from media_info import probe_duration
 import platform
+from encoding_profiles import get_profile
+from config import ENCODING_PROFILE
+
+PROFILE = get_profile(ENCODING_PROFILE)
 
 def get_best_korean_font():
     """최적의 한글 폰트 찾기"""
@@ -146,17 +151,25 @@ def create_video_with_cv2_text():
         
         # 비디오 설정
         width, height = 1920, 1080
-        fps = 24
+        fps = PROFILE["fps"]
         
         # 비디오 라이터 생성
         output_file = "maro_sample_content/maro_cv2_video.mp4"
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(output_file, fourcc, fps, (width, height))
+        audio_file = "maro_sample_content/narration.mp3"
+        # ffmpeg 한 프로세스로 H.264 인코딩 + 나레이션 먹싱
+        out = FFmpegFrameSink(output_file, width, height, fps,
+                              audio_path=audio_file if os.path.exists(audio_file) else None,
+                              profile=PROFILE, vfr=True)
+        
+        # 카드 길이 (제목 3초, 문단 4초씩, 마무리 3초)를 나레이션 길이에 비례해 조정
+        content_lines = [line.strip() for line in content['content'].split('\n\n') if line.strip()]
+        narration = probe_duration(audio_file) if os.path.exists(audio_file) else None
+        card_frames = card_frame_counts([3] + [4] * len(content_lines) + [3], fps, narration)
         
         # 배경 색상
         bg_color = (240, 248, 255)  # BGR 형식
         
-        # 제목 프레임 (3초)
+        # 제목 프레임
         print("📝 제목 프레임 생성...")
         title_img = np.full((height, width, 3), bg_color, dtype=np.uint8)
         
@@ -177,50 +190,48 @@ def create_video_with_cv2_text():
             
             cv2.putText(title_img, line, (x, y), font, font_scale, color, thickness)
         
-        for i in range(3 * fps):
+        for i in range(card_frames[0]):
             out.write(title_img)
         
         # 콘텐츠 프레임들
-        content_lines = content['content'].split('\n\n')
         print(f"📝 콘텐츠 프레임 생성 ({len(content_lines)}개)...")
         
         for idx, line in enumerate(content_lines):
-            if line.strip():
-                print(f"  - 프레임 {idx+1}: {line.strip()[:30]}...")
-                line_img = np.full((height, width, 3), bg_color, dtype=np.uint8)
-                
-                # 텍스트를 여러 줄로 나누기
-                words = line.strip().split()
-                lines = []
-                current_line = ""
+            print(f"  - 프레임 {idx+1}: {line[:30]}... ({card_frames[idx + 1] / fps:.1f}초)")
+            line_img = np.full((height, width, 3), bg_color, dtype=np.uint8)
+            
+            # 텍스트를 여러 줄로 나누기
+            words = line.split()
+            lines = []
+            current_line = ""
+            
+            for word in words:
+                test_line = current_line + " " + word if current_line else word
+                text_size = cv2.getTextSize(test_line, font, font_scale, thickness)[0]
                 
-                for word in words:
-                    test_line = current_line + " " + word if current_line else word
-                    text_size = cv2.getTextSize(test_line, font, font_scale, thickness)[0]
-                    
-                    if text_size[0] <= width - 100:
-                        current_line = test_line
+                if text_size[0] <= width - 100:
+                    current_line = test_line
+                else:
+                    if current_line:
+                        lines.append(current_line)
+                        current_line = word
                     else:
-                        if current_line:
-                            lines.append(current_line)
-                            current_line = word
-                        else:
-                            lines.append(word)
-                
-                if current_line:
-                    lines.append(current_line)
-                
-                # 각 줄을 그리기
-                y_start = height // 2 - len(lines) * 60
-                for i, text_line in enumerate(lines):
-                    text_size = cv2.getTextSize(text_line, font, font_scale, thickness)[0]
-                    x = (width - text_size[0]) // 2
-                    y = y_start + i * 120
-                    
-                    cv2.putText(line_img, text_line, (x, y), font, font_scale, color, thickness)
+                        lines.append(word)
+            
+            if current_line:
+                lines.append(current_line)
+            
+            # 각 줄을 그리기
+            y_start = height // 2 - len(lines) * 60
+            for i, text_line in enumerate(lines):
+                text_size = cv2.getTextSize(text_line, font, font_scale, thickness)[0]
+                x = (width - text_size[0]) // 2
+                y = y_start + i * 120
                 
-                for i in range(4 * fps):
-                    out.write(line_img)
+                cv2.putText(line_img, text_line, (x, y), font, font_scale, color, thickness)
+            
+            for i in range(card_frames[idx + 1]):
+                out.write(line_img)
         
         # 마무리 프레임
         print("📝 마무리 프레임 생성...")
@@ -233,18 +244,13 @@ def create_video_with_cv2_text():
         
         cv2.putText(outro_img, outro_text, (x, y), font, font_scale, color, thickness)
         
-        for i in range(3 * fps):
+        for i in range(card_frames[-1]):
             out.write(outro_img)
         
         out.release()
         
         print(f"✅ OpenCV 영상 생성 완료: {output_file}")
         
-        # 오디오 추가
-        audio_file = "maro_sample_content/narration.mp3"
-        if os.path.exists(audio_file):
-            add_audio_to_video(output_file, audio_file)
-        
         return True
         
     except Exception as e:
@@ -253,45 +259,6 @@ def create_video_with_cv2_text():
         traceback.print_exc()
         return False
 
-def add_audio_to_video(video_file, audio_file):
-    """FFmpeg로 오디오 추가"""
-    print("🎵 오디오 추가 중...")
-    
-    ffmpeg_path = "ffmpeg/ffmpeg-master-latest-win64-gpl/bin/ffmpeg.exe"
-    if not os.path.exists(ffmpeg_path):
-        print("❌ FFmpeg를 찾을 수 없음")
-        return False
-    
-    temp_file = video_file.replace('.mp4', '_with_audio.mp4')
-    
-    cmd = [
-        ffmpeg_path, '-y',
-        '-i', video_file,
-        '-i', audio_file,
-        '-c:v', 'copy',
-        '-c:a', 'aac',
-        '-b:a', '128k',
-        '-shortest',
-        temp_file
-    ]
-    
-    try:
-        subprocess.run(cmd, check=True, capture_output=True)
-        
-        if os.path.exists(temp_file):
-            os.replace(temp_file, video_file)
-            print("✅ 오디오 추가 완료")
-            return True
-        else:
-            print("❌ 임시 파일이 생성되지 않음")
-            return False
-        
-    except subprocess.CalledProcessError as e:
-        print(f"❌ 오디오 추가 실패: {e}")
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
-        return False
-
 def create_simple_text_video():
     """간단한 텍스트 영상 생성 (한글 문제 해결)"""
     print("🎬 간단한 텍스트 영상 생성...")
@@ -304,12 +271,28 @@ def create_simple_text_video():
         
         # 비디오 설정
         width, height = 1920, 1080
-        fps = 24
+        fps = PROFILE["fps"]
         
         # 비디오 라이터 생성
         output_file = "maro_sample_content/maro_simple_text.mp4"
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(output_file, fourcc, fps, (width, height))
+        audio_file = "maro_sample_content/narration.mp3"
+        # ffmpeg 한 프로세스로 H.264 인코딩 + 나레이션 먹싱
+        out = FFmpegFrameSink(output_file, width, height, fps,
+                              audio_path=audio_file if os.path.exists(audio_file) else None,
+                              profile=PROFILE, vfr=True)
+        
+        # 콘텐츠 텍스트 (영문으로 테스트)
+        content_texts = [
+            "You did well today.",
+            "It's okay to take a break.",
+            "You are stronger than you think.",
+            "Small steps matter.",
+            "You are not alone."
+        ]
+        
+        # 카드 길이 (제목 3초, 문장 4초씩, 마무리 3초)를 나레이션 길이에 비례해 조정
+        narration = probe_duration(audio_file) if os.path.exists(audio_file) else None
+        card_frames = card_frame_counts([3] + [4] * len(content_texts) + [3], fps, narration)
         
         # 배경 색상
         bg_color = (240, 248, 255)  # BGR 형식
@@ -330,19 +313,11 @@ def create_simple_text_video():
         
         cv2.putText(title_img, title_text, (x, y), font, font_scale, color, thickness)
         
-        for i in range(3 * fps):
+        for i in range(card_frames[0]):
             out.write(title_img)
         
         # 콘텐츠 프레임들 (영문으로)
-        content_texts = [
-            "You did well today.",
-            "It's okay to take a break.",
-            "You are stronger than you think.",
-            "Small steps matter.",
-            "You are not alone."
-        ]
-        
-        for text in content_texts:
+        for idx, text in enumerate(content_texts):
             line_img = np.full((height, width, 3), bg_color, dtype=np.uint8)
             
             text_size = cv2.getTextSize(text, font, font_scale, thickness)[0]
@@ -351,7 +326,7 @@ def create_simple_text_video():
             
             cv2.putText(line_img, text, (x, y), font, font_scale, color, thickness)
             
-            for i in range(4 * fps):
+            for i in range(card_frames[idx + 1]):
                 out.write(line_img)
         
         # 마무리 프레임
@@ -364,18 +339,13 @@ def create_simple_text_video():
         
         cv2.putText(outro_img, outro_text, (x, y), font, font_scale, color, thickness)
         
-        for i in range(3 * fps):
+        for i in range(card_frames[-1]):
             out.write(outro_img)
         
         out.release()
         
         print(f"✅ 간단한 텍스트 영상 생성 완료: {output_file}")
         
-        # 오디오 추가
-        audio_file = "maro_sample_content/narration.mp3"
-        if os.path.exists(audio_file):
-            add_audio_to_video(output_file, audio_file)
-        
         return True
         
     except Exception as e:
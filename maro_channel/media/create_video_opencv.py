@@ -10,8 +10,13 @@ import json
 import cv2
 import numpy as np
 from PIL import Image, ImageDraw, ImageFont
-import subprocess
 import sys
+from frame_sink import FFmpegFrameSink
+from media_info import probe_duration
+from encoding_profiles import get_profile
+from config import ENCODING_PROFILE
+
+PROFILE = get_profile(ENCODING_PROFILE)
 
 def create_text_image(text, width=1920, height=200, font_size=60, bg_color=(255, 248, 240), text_color=(44, 62, 80)):
     """텍스트 이미지 생성"""
@@ -57,19 +62,21 @@ def create_video_with_opencv():
         
         # 비디오 설정
         width, height = 1920, 1080
-        fps = 24
-        duration = 30  # 30초 영상
+        fps = PROFILE["fps"]
+        duration = probe_duration(audio_file)  # 나레이션 길이에 맞춤
         
         # 비디오 라이터 생성
         output_file = "maro_sample_content/maro_sample_video.mp4"
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(output_file, fourcc, fps, (width, height))
+        # ffmpeg 한 프로세스로 H.264 인코딩 + 나레이션 먹싱
+        out = FFmpegFrameSink(output_file, width, height, fps,
+                              audio_path=audio_file if os.path.exists(audio_file) else None,
+                              profile=PROFILE, vfr=True)
         
         # 배경 색상 (따뜻한 크림색)
         bg_color = (240, 248, 255)  # BGR 형식
         
         # 프레임 생성
-        total_frames = duration * fps
+        total_frames = int(round(duration * fps))
         
         # 제목 프레임 (3초)
         title_frames = 3 * fps
@@ -106,57 +113,12 @@ def create_video_with_opencv():
         
         print(f"✅ OpenCV 영상 생성 완료: {output_file}")
         
-        # 오디오 추가 (FFmpeg 사용)
-        if add_audio_to_video(output_file, audio_file):
-            print("✅ 오디오 추가 완료!")
-            return True
-        else:
-            print("⚠️ 영상은 생성되었지만 오디오 추가 실패")
-            return True
+        return True
             
     except Exception as e:
         print(f"❌ OpenCV 영상 생성 실패: {e}")
         return False
 
-def add_audio_to_video(video_file, audio_file):
-    """FFmpeg를 사용해 오디오 추가"""
-    print("🎵 오디오 추가 중...")
-    
-    # FFmpeg 설치 확인
-    try:
-        subprocess.run(['ffmpeg', '-version'], capture_output=True, check=True)
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        print("❌ FFmpeg가 설치되지 않음 - 오디오 없이 영상만 생성됨")
-        return False
-    
-    # 임시 파일명
-    temp_file = video_file.replace('.mp4', '_temp.mp4')
-    
-    # FFmpeg 명령어로 오디오 추가
-    cmd = [
-        'ffmpeg', '-y',
-        '-i', video_file,
-        '-i', audio_file,
-        '-c:v', 'copy',
-        '-c:a', 'aac',
-        '-shortest',
-        temp_file
-    ]
-    
-    try:
-        subprocess.run(cmd, check=True, capture_output=True)
-        
-        # 원본 파일을 임시 파일로 교체
-        os.replace(temp_file, video_file)
-        print("✅ 오디오 추가 완료")
-        return True
-        
-    except subprocess.CalledProcessError as e:
-        print(f"❌ 오디오 추가 실패: {e}")
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
-        return False
-
 def create_simple_slideshow():
     """간단한 슬라이드쇼 영상 생성"""
     print("🎬 간단한 슬라이드쇼 영상 생성...")
@@ -169,12 +131,15 @@ def create_simple_slideshow():
         
         # 비디오 설정
         width, height = 1920, 1080
-        fps = 24
+        fps = PROFILE["fps"]
         
         # 비디오 라이터 생성
         output_file = "maro_sample_content/maro_slideshow.mp4"
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(output_file, fourcc, fps, (width, height))
+        audio_file = "maro_sample_content/narration.mp3"
+        # ffmpeg 한 프로세스로 H.264 인코딩 + 나레이션 먹싱
+        out = FFmpegFrameSink(output_file, width, height, fps,
+                              audio_path=audio_file if os.path.exists(audio_file) else None,
+                              profile=PROFILE, vfr=True)
         
         # 배경 색상
         bg_color = (240, 248, 255)  # BGR 형식
@@ -222,11 +187,6 @@ def create_simple_slideshow():
         
         print(f"✅ 슬라이드쇼 영상 생성 완료: {output_file}")
         
-        # 오디오 추가 시도
-        audio_file = "maro_sample_content/narration.mp3"
-        if os.path.exists(audio_file):
-            add_audio_to_video(output_file, audio_file)
-        
         return True
         
     except Exception as e:
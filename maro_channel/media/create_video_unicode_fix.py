@@ -12,7 +12,12 @@ import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 import subprocess
 import sys
+from frame_sink import FFmpegFrameSink
 import platform
+from encoding_profiles import get_profile, video_codec_args, audio_codec_args
+from config import ENCODING_PROFILE
+
+PROFILE = get_profile(ENCODING_PROFILE)
 
 def create_text_image_unicode_fix(text, width=1920, height=200, font_size=60, bg_color=(255, 248, 240), text_color=(44, 62, 80)):
     """유니코드 문제를 해결한 텍스트 이미지 생성"""
@@ -126,12 +131,15 @@ def create_video_with_image_overlay():
         
         # 비디오 설정
         width, height = 1920, 1080
-        fps = 24
+        fps = PROFILE["fps"]
         
         # 비디오 라이터 생성
         output_file = "maro_sample_content/maro_image_overlay.mp4"
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(output_file, fourcc, fps, (width, height))
+        audio_file = "maro_sample_content/narration.mp3"
+        # ffmpeg 한 프로세스로 H.264 인코딩 + 나레이션 먹싱
+        out = FFmpegFrameSink(output_file, width, height, fps,
+                              audio_path=audio_file if os.path.exists(audio_file) else None,
+                              profile=PROFILE, vfr=True)
         
         # 제목 프레임 (3초)
         print("📝 제목 프레임 생성...")
@@ -190,11 +198,6 @@ def create_video_with_image_overlay():
         
         print(f"✅ 이미지 오버레이 영상 생성 완료: {output_file}")
         
-        # 오디오 추가
-        audio_file = "maro_sample_content/narration.mp3"
-        if os.path.exists(audio_file):
-            add_audio_to_video(output_file, audio_file)
-        
         return True
         
     except Exception as e:
@@ -203,45 +206,6 @@ def create_video_with_image_overlay():
         traceback.print_exc()
         return False
 
-def add_audio_to_video(video_file, audio_file):
-    """FFmpeg로 오디오 추가"""
-    print("🎵 오디오 추가 중...")
-    
-    ffmpeg_path = "ffmpeg/ffmpeg-master-latest-win64-gpl/bin/ffmpeg.exe"
-    if not os.path.exists(ffmpeg_path):
-        print("❌ FFmpeg를 찾을 수 없음")
-        return False
-    
-    temp_file = video_file.replace('.mp4', '_with_audio.mp4')
-    
-    cmd = [
-        ffmpeg_path, '-y',
-        '-i', video_file,
-        '-i', audio_file,
-        '-c:v', 'copy',
-        '-c:a', 'aac',
-        '-b:a', '128k',
-        '-shortest',
-        temp_file
-    ]
-    
-    try:
-        subprocess.run(cmd, check=True, capture_output=True)
-        
-        if os.path.exists(temp_file):
-            os.replace(temp_file, video_file)
-            print("✅ 오디오 추가 완료")
-            return True
-        else:
-            print("❌ 임시 파일이 생성되지 않음")
-            return False
-        
-    except subprocess.CalledProcessError as e:
-        print(f"❌ 오디오 추가 실패: {e}")
-        if os.path.exists(temp_file):
-            os.remove(temp_file)
-        return False
-
 def create_video_with_subtitles():
     """자막 파일을 사용한 영상 생성"""
     print("🎬 자막 파일을 사용한 영상 생성...")
@@ -288,12 +252,11 @@ def create_video_with_subtitles():
         
         cmd = [
             ffmpeg_path, '-y',
-            '-f', 'lavfi', '-i', 'color=c=0xFFF8F0:size=1920x1080:duration=35',
+            '-f', 'lavfi', '-i', f'color=c=0xFFF8F0:size=1920x1080:rate={PROFILE["fps"]}:duration=35',
             '-i', audio_file,
             '-vf', f'subtitles={subtitle_file}:force_style=\'FontSize=40,PrimaryColour=&H000000FF,OutlineColour=&HFFFFFF00,Outline=2\'',
-            '-c:v', 'libx264',
-            '-c:a', 'aac',
-            '-b:a', '128k',
+            *video_codec_args(PROFILE),
+            *audio_codec_args(PROFILE),
             '-shortest',
             output_file
         ]
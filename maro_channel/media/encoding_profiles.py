@@ -0,0 +1,62 @@
+from typing import Dict, List, Optional, Tuple, Union
+
+# 인코딩 품질 단계 (모든 렌더 경로가 공통으로 사용)
+# short_side: 출력 해상도의 짧은 변 상한 (None이면 요청 해상도 그대로)
+# gop: 키프레임 간격 (프레임 수)
+ENCODING_PROFILES = {
+    "preview": {
+        "fps": 5, "preset": "ultrafast", "crf": 35, "tune": None,
+        "gop": 50, "audio_bitrate": "48k", "short_side": 360,
+    },
+    "draft": {
+        "fps": 10, "preset": "ultrafast", "crf": 32, "tune": None,
+        "gop": 100, "audio_bitrate": "64k", "short_side": 480,
+    },
+    "review": {
+        "fps": 24, "preset": "veryfast", "crf": 26, "tune": "stillimage",
+        "gop": 240, "audio_bitrate": "96k", "short_side": 720,
+    },
+    "publish": {
+        "fps": 30, "preset": "slow", "crf": 20, "tune": "stillimage",
+        "gop": 300, "audio_bitrate": "192k", "short_side": None,
+    },
+}
+
+DEFAULT_PROFILE = "publish"
+
+def get_profile(profile: Union[str, Dict, None] = None) -> Dict:
+    """프로파일 이름 또는 dict를 완전한 설정 dict로 변환 (dict는 기본값 위에 덮어씀)"""
+    if profile is None:
+        profile = DEFAULT_PROFILE
+    if isinstance(profile, str):
+        if profile not in ENCODING_PROFILES:
+            raise ValueError(f"지원하지 않는 인코딩 프로파일: {profile}")
+        return dict(ENCODING_PROFILES[profile], name=profile)
+    base = ENCODING_PROFILES[profile.get("name", DEFAULT_PROFILE)]
+    return dict(base, **profile)
+
+def output_resolution(W: int, H: int, profile: Dict) -> Tuple[int, int]:
+    """프로파일의 짧은 변 상한에 맞춘 출력 해상도 (비율 유지, 짝수)"""
+    short_side = profile.get("short_side")
+    if not short_side or min(W, H) <= short_side:
+        return W, H
+    scale = short_side / min(W, H)
+    return int(round(W * scale / 2)) * 2, int(round(H * scale / 2)) * 2
+
+def scale_filter(W: int, H: int, profile: Dict) -> Optional[str]:
+    """출력 해상도가 렌더 해상도와 다르면 scale 필터 문자열"""
+    w, h = output_resolution(W, H, profile)
+    if (w, h) == (W, H):
+        return None
+    return f"scale={w}:{h}:flags=area"
+
+def video_codec_args(profile: Dict) -> List[str]:
+    """libx264 인코더 옵션 (preset, CRF, tune, GOP)"""
+    args = ["-c:v", "libx264", "-preset", profile["preset"], "-crf", str(profile["crf"]),
+            "-g", str(profile["gop"]), "-pix_fmt", "yuv420p"]
+    if profile.get("tune"):
+        args += ["-tune", profile["tune"]]
+    return args
+
+def audio_codec_args(profile: Dict) -> List[str]:
+    return ["-c:a", "aac", "-b:a", profile["audio_bitrate"]]
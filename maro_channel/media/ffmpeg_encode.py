@@ -0,0 +1,208 @@
+import os
+import subprocess
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Tuple, Optional, Union
+import numpy as np
+from PIL import Image
+from encoding_profiles import get_profile, scale_filter, video_codec_args, audio_codec_args
+
+# MoviePy와 같은 환경변수를 사용해 ffmpeg 경로를 지정할 수 있다
+# 지정하지 않으면 기존 스크립트가 쓰던 동봉 ffmpeg(있을 때), 없으면 PATH의 ffmpeg
+BUNDLED_FFMPEG = "ffmpeg/ffmpeg-master-latest-win64-gpl/bin/ffmpeg.exe"
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY") or (BUNDLED_FFMPEG if os.path.exists(BUNDLED_FFMPEG) else "ffmpeg")
+
+def run_ffmpeg(args: List[str]):
+    """ffmpeg 실행 (실패 시 stderr를 포함한 RuntimeError)"""
+    cmd = [FFMPEG_BINARY, "-y", "-hide_banner", "-loglevel", "error"] + [str(a) for a in args]
+    proc = subprocess.run(cmd, capture_output=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg 실행 실패: {proc.stderr.decode('utf-8', 'replace').strip()}")
+    return proc
+
+@lru_cache(maxsize=1)
+def available_filters() -> frozenset:
+    """현재 ffmpeg 빌드에서 사용할 수 있는 필터 이름 (빌드마다 drawtext/ass 유무가 다름)"""
+    try:
+        proc = subprocess.run([FFMPEG_BINARY, "-hide_banner", "-filters"], capture_output=True, text=True)
+    except FileNotFoundError:
+        return frozenset()
+    names = set()
+    for line in proc.stdout.splitlines():
+        parts = line.split()
+        if len(parts) >= 3 and "->" in parts[2]:
+            names.add(parts[1])
+    return frozenset(names)
+
+def has_filter(name: str) -> bool:
+    return name in available_filters()
+
+# 이미지 입력의 타임스탬프 해상도 (기본 1/25초 단위로 반올림되는 것을 1ms로)
+IMAGE_FRAMERATE = 1000
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".bmp"}
+
+def write_concat_list(entries: List[Tuple[str, float]], list_path: str):
+    """concat demuxer용 ffconcat 파일 작성 (파일, 지속시간)"""
+    lines = ["ffconcat version 1.0"]
+
+    def add_file(file):
+        lines.append(f"file '{Path(file).resolve().as_posix()}'")
+        if Path(file).suffix.lower() in IMAGE_SUFFIXES:
+            lines.append(f"option framerate {IMAGE_FRAMERATE}")
+
+    for file, duration in entries:
+        add_file(file)
+        if duration is not None:
+            lines.append(f"duration {duration:.6f}")
+    if entries and entries[-1][1] is not None:
+        # 마지막 항목의 duration이 적용되도록 마지막 파일을 한 번 더 기록
+        add_file(entries[-1][0])
+    Path(list_path).write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+def save_still(frame: np.ndarray, path: str):
+    """프레임을 무손실 PNG로 저장 (압축보다 속도 우선)"""
+    Image.fromarray(frame).save(path, compress_level=1)
+
+def snap_durations(durations: List[float], fps: int) -> List[float]:
+    """구간 경계를 프레임 격자에 맞춰 누적 오차 없이 지속시간을 보정"""
+    snapped, elapsed, frame_pos = [], 0.0, 0
+    for duration in durations:
+        elapsed += duration
+        end_frame = max(int(round(elapsed * fps)), frame_pos + 1)
+        snapped.append((end_frame - frame_pos) / fps)
+        frame_pos = end_frame
+    return snapped
+
+def save_still_entries(stills: List[Tuple[np.ndarray, float]], work_dir: str, fps: int,
+                       prefix: str = "still") -> List[Tuple[str, float]]:
+    """정지 이미지를 PNG로 저장하고 프레임 격자에 맞춘 (파일, 지속시간) concat 항목 목록 반환"""
+    durations = snap_durations([d for _, d in stills], fps)
+    entries = []
+    for idx, ((frame, _), duration) in enumerate(zip(stills, durations)):
+        still_path = Path(work_dir) / f"{prefix}_{idx:04d}.png"
+        save_still(frame, still_path)
+        entries.append((str(still_path), duration))
+    return entries
+
+def stills_filter(W: int, H: int, profile: Dict, vfr: bool = False) -> str:
+    """concat 이미지 입력용 비디오 필터 (fps 리샘플 + 프로파일 해상도)
+
+    vfr이면 fps 리샘플 없이 이미지 한 장 = 프레임 하나로 두고 타임스탬프만 유지한다.
+    """
+    # 출력 -r 대신 fps 필터를 써야 concat 이미지 입력의 타임스탬프가 정확히 유지된다
+    filters = [None if vfr else f"fps={profile['fps']}", scale_filter(W, H, profile)]
+    return ",".join(f for f in filters if f) or "null"
+
+def mp4_timescale(fps: int) -> int:
+    """고정 fps 출력에 mp4 먹서가 기본으로 쓰는 트랙 타임스케일 (fps를 10000 이상이 될 때까지 2배)"""
+    timescale = max(int(fps), 1)
+    while timescale < 10000:
+        timescale *= 2
+    return timescale
+
+def _stills_video_args(profile: Dict, vf: str, duration: float, threads: Optional[int] = None,
+                       vfr: bool = False) -> List[str]:
+    # 마지막 이미지가 반복 기록되므로 -t로 총 길이를 프레임 단위까지 정확히 자른다
+    if vfr:
+        # 가변 프레임레이트에서는 반복된 마지막 이미지가 끝 시각을 표시하는 프레임이 되도록 한 프레임 더 남긴다
+        duration += 1.0 / profile["fps"]
+    args = ["-vf", vf] + video_codec_args(profile) + ["-t", f"{duration:.6f}"]
+    if vfr:
+        # 타임스케일을 고정 fps 출력(범퍼, 장면 캐시 클립)과 맞춰야 -c copy 연결 시 타임스탬프가 유지된다
+        args += ["-fps_mode", "vfr", "-video_track_timescale", mp4_timescale(profile["fps"])]
+    if threads:
+        args += ["-threads", threads]
+    return args
+
+def _encode_chunk(job: Tuple[List[Tuple[str, float]], str, Dict, str, int, bool]) -> str:
+    """ProcessPoolExecutor 작업 단위: 정지 이미지 묶음 하나를 비디오 전용 청크로 인코딩"""
+    entries, chunk_path, profile, vf, threads, vfr = job
+    list_path = str(chunk_path) + ".ffconcat"
+    write_concat_list(entries, list_path)
+    # 청크 첫 프레임은 항상 IDR이므로 concat -c copy 시 GOP 경계가 청크 경계와 일치
+    run_ffmpeg(["-f", "concat", "-safe", "0", "-i", list_path]
+               + _stills_video_args(profile, vf, sum(d for _, d in entries), threads, vfr) + ["-an", chunk_path])
+    return chunk_path
+
+def mux_concat(list_path: str, audio_path: Optional[str], out_path: str, profile: Dict, video_args: List[str]):
+    """concat 목록(비디오) + 나레이션을 한 번에 인코딩/먹싱"""
+    args = ["-f", "concat", "-safe", "0", "-i", list_path]
+    if audio_path:
+        args += ["-i", audio_path, "-map", "0:v", "-map", "1:a"]
+    args += video_args
+    if audio_path:
+        args += audio_codec_args(profile) + ["-shortest"]
+    args += ["-movflags", "+faststart", out_path]
+    run_ffmpeg(args)
+    return out_path
+
+def split_chunks(durations: List[float], n_chunks: int) -> List[Tuple[int, int]]:
+    """구간 경계에서 잘라 총 길이가 비슷한 연속 청크 (시작, 끝 인덱스) 목록으로 분할"""
+    n_chunks = max(1, min(n_chunks, len(durations)))
+    target = sum(durations) / n_chunks
+    chunks, begin, acc = [], 0, 0.0
+    for idx, duration in enumerate(durations):
+        acc += duration
+        remaining_items = len(durations) - idx - 1
+        remaining_chunks = n_chunks - len(chunks) - 1
+        if remaining_chunks > 0 and (acc >= target or remaining_items == remaining_chunks):
+            chunks.append((begin, idx + 1))
+            begin, acc = idx + 1, 0.0
+    chunks.append((begin, len(durations)))
+    return [c for c in chunks if c[1] > c[0]]
+
+def encode_stills(stills: List[Tuple[np.ndarray, float]], audio_path: Optional[str], out_path: str,
+                  profile: Union[str, Dict, None] = None, workers: int = 1,
+                  background_video: Optional[Tuple[List[str], Optional[str]]] = None, vfr: bool = False):
+    """(정지 이미지, 지속시간) 목록을 concat demuxer로 인코딩
+
+    각 정지 이미지는 한 번만 래스터화되고, 나레이션은 마지막 패스에서 먹싱된다.
+    workers > 1이면 구간 경계에서 타임라인을 나눠 청크를 ProcessPoolExecutor로
+    병렬 인코딩한 뒤 concat demuxer(-c copy)로 무손실 연결한다.
+    background_video=(입력 인자, 배경 필터)가 주어지면 stills는 RGBA 텍스트 오버레이로 간주하고
+    움직이는 배경(-stream_loop 루프 클립, zoompan 등) 위에 overlay 필터로 합성한다 (청크 분할 없음).
+    vfr이면 정지 구간마다 프레임 하나만 인코딩하는 가변 프레임레이트 출력을 만든다.
+    fps/코덱/해상도/오디오 비트레이트는 인코딩 프로파일을 따른다.
+    """
+    profile = get_profile(profile)
+    H, W = stills[0][0].shape[:2]
+    vf = stills_filter(W, H, profile, vfr)
+    with tempfile.TemporaryDirectory(prefix="maro_stills_") as work_dir:
+        entries = save_still_entries(stills, work_dir, profile["fps"])
+        durations = [d for _, d in entries]
+
+        if background_video:
+            background_args, background_filter = background_video
+            list_path = Path(work_dir) / "overlays.ffconcat"
+            write_concat_list(entries, list_path)
+            graph = (f"[0:v]{background_filter or 'null'}[bg];"
+                     f"[1:v]fps={profile['fps']},format=rgba[text];"
+                     f"[bg][text]overlay=shortest=1:format=auto,format=yuv420p"
+                     + "".join(f",{f}" for f in (scale_filter(W, H, profile),) if f) + "[v]")
+            args = list(background_args) + ["-f", "concat", "-safe", "0", "-i", list_path]
+            if audio_path:
+                args += ["-i", audio_path, "-map", "2:a"] + audio_codec_args(profile) + ["-shortest"]
+            args += ["-filter_complex", graph, "-map", "[v]"] + video_codec_args(profile)
+            args += ["-t", f"{sum(durations):.6f}", "-movflags", "+faststart", out_path]
+            run_ffmpeg(args)
+            return out_path
+
+        # VFR은 구간마다 프레임 하나뿐이라 병렬 청크 분할이 필요 없다
+        if workers > 1 and len(entries) > 1 and not vfr:
+            chunks = split_chunks(durations, workers)
+            threads = max(1, (os.cpu_count() or 1) // len(chunks))
+            jobs = [(entries[a:b], str(Path(work_dir) / f"chunk_{i:03d}.mp4"), profile, vf, threads, vfr)
+                    for i, (a, b) in enumerate(chunks)]
+            with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+                chunk_paths = list(pool.map(_encode_chunk, jobs))
+            list_path = Path(work_dir) / "chunks.ffconcat"
+            write_concat_list([(p, None) for p in chunk_paths], list_path)
+            video_args = ["-c:v", "copy"]
+        else:
+            list_path = Path(work_dir) / "stills.ffconcat"
+            write_concat_list(entries, list_path)
+            video_args = _stills_video_args(profile, vf, sum(durations), vfr=vfr)
+        mux_concat(list_path, audio_path, out_path, profile, video_args)
+    return out_path
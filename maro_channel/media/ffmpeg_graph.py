@@ -0,0 +1,148 @@
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+from PIL import ImageColor
+from ffmpeg_encode import run_ffmpeg, save_still
+from encoding_profiles import get_profile, scale_filter, video_codec_args, audio_codec_args
+from compositor import resolve_position
+from animated_bg import animation_for, render_background_loop
+from ken_burns import ken_burns_for
+from text_render import layout_text, find_korean_font
+from video_maker import parse_resolution, build_text_layout, healing_background_frame
+
+# ffmpeg 필터그래프 렌더 백엔드
+# 콘텐츠 dict를 하나의 ffmpeg 필터그래프(배경 + 문장별 drawtext + 페이드 + 오디오)로
+# 컴파일해 한 번의 ffmpeg 실행으로 렌더링한다. 파이썬에서 프레임 단위 작업은 없다.
+
+TEXT_FADE_SECONDS = 0.5
+VIDEO_FADE_SECONDS = 1.0
+
+def escape_filter_value(value: str) -> str:
+    """필터 옵션 값 이스케이프 (Windows 경로의 ':' 등)"""
+    return str(value).replace("\\", "/").replace(":", "\\:").replace("'", "\\'")
+
+def _hex_color(color: str) -> str:
+    r, g, b = ImageColor.getrgb(color)[:3]
+    return f"0x{r:02X}{g:02X}{b:02X}"
+
+def _fade_alpha(start: float, end: float) -> str:
+    """구간 시작/끝에서 부드럽게 나타나고 사라지는 drawtext alpha 식"""
+    fade = min(TEXT_FADE_SECONDS, (end - start) / 2)
+    if fade <= 0:
+        return "1"
+    return (f"if(lt(t,{start + fade:.3f}),(t-{start:.3f})/{fade:.3f},"
+            f"if(gt(t,{end - fade:.3f}),({end:.3f}-t)/{fade:.3f},1))")
+
+def drawtext_filters(layout: List[dict], W: int, H: int, font_path: str, work_dir: str) -> List[str]:
+    """레이아웃 항목을 줄 단위 drawtext 필터 목록으로 변환
+
+    줄바꿈/정렬은 Pillow 래스터라이저와 같은 layout_text 결과를 사용하므로
+    다른 렌더 경로와 배치가 일치한다. 텍스트는 이스케이프 문제를 피하려고 textfile로 전달한다.
+    """
+    filters = []
+    for idx, item in enumerate(layout):
+        start, end = item["start"], item["start"] + item["duration"]
+        if end <= start:
+            continue
+        lines, height = layout_text(item["text"], item["fontsize"], item["box_width"], item["align"], font_path)
+        bx, by = resolve_position(item["position"], item["box_width"], height, W, H)
+        for line_no, (line, x, y) in enumerate(lines):
+            if not line:
+                continue
+            text_file = Path(work_dir) / f"text_{idx:03d}_{line_no:02d}.txt"
+            text_file.write_text(line, encoding="utf-8")
+            filters.append(
+                "drawtext="
+                f"fontfile='{escape_filter_value(font_path)}':"
+                f"textfile='{escape_filter_value(text_file.resolve().as_posix())}':"
+                f"fontsize={item['fontsize']}:fontcolor={_hex_color(item['color'])}:"
+                f"x={int(bx + x)}:y={int(by + y)}:"
+                f"alpha='{_fade_alpha(start, end)}':"
+                f"enable='between(t,{start:.3f},{end:.3f})'"
+            )
+    return filters
+
+def build_filtergraph(content: Dict, W: int, H: int, mode: str, font_path: str, work_dir: str,
+                      total_duration: float, has_audio: bool, profile: Optional[Dict] = None,
+                      background_chain: Optional[List[str]] = None,
+                      text_filters: Optional[List[str]] = None) -> str:
+    """입력 0 = 배경 이미지, 입력 1 = 나레이션 기준의 filter_complex 문자열
+
+    background_chain이 주어지면 기본 scale/crop 대신 배경 필터(zoompan 등)로 사용한다.
+    text_filters가 주어지면 drawtext 대신 그 필터(ass 번인 등)로 텍스트를 그린다.
+    """
+    layout = build_text_layout(content, W, H, mode)
+    video_chain = background_chain or [f"scale={W}:{H}:force_original_aspect_ratio=increase", f"crop={W}:{H}"]
+    video_chain = video_chain + ["setsar=1"]
+    if text_filters is None:
+        text_filters = drawtext_filters(layout, W, H, font_path, work_dir)
+    video_chain += text_filters
+    fade_out = max(total_duration - VIDEO_FADE_SECONDS, 0)
+    video_chain += [f"fade=t=in:st=0:d={VIDEO_FADE_SECONDS}",
+                    f"fade=t=out:st={fade_out:.3f}:d={VIDEO_FADE_SECONDS}",
+                    "format=yuv420p"]
+    # 프로파일 해상도 축소는 레이아웃 합성 이후 마지막에 적용
+    video_chain += [f for f in (scale_filter(W, H, get_profile(profile)),) if f]
+    graph = "[0:v]" + ",".join(video_chain) + "[v]"
+    if has_audio:
+        graph += (f";[1:a]afade=t=in:st=0:d={TEXT_FADE_SECONDS},"
+                  f"afade=t=out:st={fade_out:.3f}:d={VIDEO_FADE_SECONDS}[a]")
+    return graph
+
+def render_with_filtergraph(audio_path: Optional[str], content: Dict, background_image: Optional[str], resolution: str,
+                            out_path: str, mode: str = "landscape", profile: Union[str, Dict, None] = None,
+                            text_renderer: str = "drawtext") -> str:
+    """콘텐츠 dict를 ffmpeg 필터그래프 한 번의 실행으로 렌더링
+
+    text_renderer="ass"이면 텍스트를 ASS 자막으로 만들어 libass(ass 필터)로 번인한다.
+    content["duration_seconds"]는 호출 측(make_healing_video)이 with_narration_duration으로 맞춘 길이를 그대로 쓴다.
+    """
+    profile = get_profile(profile)
+    fps = profile["fps"]
+    W, H = parse_resolution(resolution)
+    total_duration = content.get("duration_seconds", 180)
+    font_path = find_korean_font()
+    if not font_path and text_renderer == "drawtext":
+        raise RuntimeError("drawtext에 사용할 한글 폰트를 찾을 수 없음 (MARO_FONT_PATH 설정 필요)")
+    has_audio = bool(audio_path) and Path(audio_path).exists()
+
+    animation = animation_for(content)
+    ken_burns = None if animation else ken_burns_for(content, background_image, W, H, fps)
+    with tempfile.TemporaryDirectory(prefix="maro_graph_") as work_dir:
+        if ken_burns:
+            # 단일 이미지 입력에서 zoompan이 전체 길이의 프레임을 만든다
+            bg_input = ["-i", background_image]
+        elif animation:
+            # 캐시된 애니메이션 루프를 반복 재생 (배경 이미지는 루프에 이미 포함)
+            bg_input = ["-stream_loop", "-1", "-i", render_background_loop(W, H, animation, profile, background_image)]
+        else:
+            if background_image and Path(background_image).exists():
+                bg_path = background_image
+            else:
+                # 배경 이미지가 없으면 힐링 그라데이션을 한 장 저장해 사용
+                bg_path = str(Path(work_dir) / "background.png")
+                save_still(healing_background_frame(W, H, "calm"), bg_path)
+            bg_input = ["-loop", "1", "-framerate", fps, "-i", bg_path]
+
+        text_filters = None
+        if text_renderer == "ass":
+            from subtitles_ass import write_ass, ass_filter
+            ass_path = write_ass(content, W, H, str(Path(work_dir) / "text.ass"), mode, font_path)
+            text_filters = [ass_filter(ass_path, font_path)]
+
+        graph_path = Path(work_dir) / "graph.txt"
+        graph_path.write_text(build_filtergraph(content, W, H, mode, font_path, work_dir,
+                                                total_duration, has_audio, profile,
+                                                [ken_burns.zoompan_filter()] if ken_burns else None,
+                                                text_filters),
+                              encoding="utf-8")
+
+        args = ["-t", f"{total_duration:.3f}"] + bg_input
+        if has_audio:
+            args += ["-i", audio_path]
+        args += ["-filter_complex_script", graph_path, "-map", "[v]"]
+        if has_audio:
+            args += ["-map", "[a]"] + audio_codec_args(profile) + ["-shortest"]
+        args += video_codec_args(profile) + ["-r", fps, "-movflags", "+faststart", out_path]
+        run_ffmpeg(args)
+    return out_path
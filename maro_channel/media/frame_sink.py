@@ -0,0 +1,133 @@
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+import numpy as np
+from ffmpeg_encode import (FFMPEG_BINARY, save_still, write_concat_list, stills_filter, _stills_video_args,
+                           mux_concat)
+from encoding_profiles import get_profile, scale_filter, video_codec_args, audio_codec_args
+
+def card_frame_counts(seconds: List[float], fps: int, total_seconds: Optional[float] = None) -> List[int]:
+    """카드별 기본 길이(초)를 total_seconds(나레이션 길이)에 비례해 늘리거나 줄인 프레임 수
+
+    반올림 오차를 누적 보정해 합계가 round(total_seconds * fps)와 같다. total_seconds가 없으면 기본 길이 그대로.
+    """
+    scale = total_seconds / sum(seconds) if total_seconds else 1.0
+    counts, elapsed, written = [], 0.0, 0
+    for card_seconds in seconds:
+        elapsed += card_seconds * scale
+        end = int(round(elapsed * fps))
+        counts.append(end - written)
+        written = end
+    return counts
+
+class FFmpegFrameSink:
+    """원시 BGR 프레임을 하나의 ffmpeg 프로세스 stdin으로 스트리밍하는 프레임 싱크
+
+    cv2.VideoWriter(mp4v) + add_audio_to_video 2단계 대신, 한 번의 패스로
+    H.264 인코딩과 나레이션 먹싱을 끝낸다. cv2.VideoWriter와 같은
+    write()/release() 인터페이스를 제공한다. 코덱/해상도/오디오 설정은 인코딩
+    프로파일을 따르며, 프로파일 fps가 입력 fps보다 낮을 때만 프레임을 솎아낸다.
+
+    vfr=True이면 직전 프레임과 같은 프레임은 반복 횟수만 세고, 바뀐 프레임만 PNG로 남겨
+    close() 때 ffconcat 지속시간 목록으로 가변 프레임레이트 영상을 인코딩한다
+    (인코더는 화면이 바뀔 때마다 프레임 하나만 받는다).
+    """
+
+    def __init__(self, out_path: str, width: int, height: int, fps: int = 24,
+                 audio_path: Optional[str] = None, pix_fmt: str = "bgr24",
+                 profile: Union[str, Dict, None] = None, vfr: bool = False):
+        self.out_path = out_path
+        self.width, self.height = width, height
+        self.fps = fps
+        self.frames_written = 0
+        profile = get_profile(profile)
+        self.vfr = vfr
+        self._proc = None
+        if vfr:
+            if pix_fmt not in ("bgr24", "rgb24"):
+                raise ValueError(f"vfr 모드에서 지원하지 않는 픽셀 형식: {pix_fmt}")
+            self._audio_path, self._pix_fmt, self._profile = audio_path, pix_fmt, profile
+            self._work_dir = tempfile.mkdtemp(prefix="maro_vfr_")
+            self._last = None
+            self._entries = []  # [PNG 경로, 반복 프레임 수]
+            return
+        filters = [f"fps={profile['fps']}"] if profile["fps"] < fps else []
+        filters += [f for f in (scale_filter(width, height, profile),) if f]
+        cmd = [FFMPEG_BINARY, "-y", "-hide_banner", "-loglevel", "error",
+               "-f", "rawvideo", "-pix_fmt", pix_fmt, "-s", f"{width}x{height}", "-r", str(fps), "-i", "-"]
+        if audio_path:
+            cmd += ["-i", str(audio_path), "-map", "0:v", "-map", "1:a"] + audio_codec_args(profile) + ["-shortest"]
+        if filters:
+            cmd += ["-vf", ",".join(filters)]
+        cmd += video_codec_args(profile) + ["-movflags", "+faststart", str(out_path)]
+        self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+
+    def write(self, frame: np.ndarray):
+        if frame.shape[:2] != (self.height, self.width):
+            raise ValueError(f"프레임 크기 불일치: {frame.shape[1]}x{frame.shape[0]} != {self.width}x{self.height}")
+        if self.vfr:
+            self._write_unique(frame)
+        else:
+            self._proc.stdin.write(np.ascontiguousarray(frame, dtype=np.uint8).data)
+        self.frames_written += 1
+
+    def _write_unique(self, frame: np.ndarray):
+        if self._last is not None and np.array_equal(frame, self._last):
+            self._entries[-1][1] += 1
+            return
+        self._last = np.array(frame, dtype=np.uint8)
+        path = str(Path(self._work_dir) / f"frame_{len(self._entries):06d}.png")
+        save_still(self._last[..., ::-1] if self._pix_fmt == "bgr24" else self._last, path)
+        self._entries.append([path, 1])
+
+    def _close_vfr(self):
+        work_dir, self._work_dir = self._work_dir, None
+        try:
+            if not self._entries:
+                raise RuntimeError("ffmpeg 인코딩 실패: 기록된 프레임 없음")
+            entries = [(path, count / self.fps) for path, count in self._entries]
+            list_path = str(Path(work_dir) / "frames.ffconcat")
+            write_concat_list(entries, list_path)
+            vf = stills_filter(self.width, self.height, self._profile, vfr=True)
+            video_args = _stills_video_args(self._profile, vf, self.frames_written / self.fps, vfr=True)
+            mux_concat(list_path, self._audio_path, str(self.out_path), self._profile, video_args)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        return self.out_path
+
+    def close(self):
+        """입력을 닫고 인코딩 완료까지 대기 (실패 시 RuntimeError)"""
+        if self.vfr and self._work_dir is not None:
+            return self._close_vfr()
+        if self._proc is None:
+            return self.out_path
+        _, stderr = self._proc.communicate()
+        returncode, self._proc = self._proc.returncode, None
+        if returncode != 0:
+            raise RuntimeError(f"ffmpeg 인코딩 실패: {stderr.decode('utf-8', 'replace').strip()}")
+        return self.out_path
+
+    def abort(self):
+        """인코딩을 중단하고 만들다 만 출력 파일을 지움"""
+        if self.vfr and self._work_dir is not None:
+            shutil.rmtree(self._work_dir, ignore_errors=True)
+            self._work_dir = None
+        if self._proc is not None:
+            self._proc.kill()
+            self._proc.communicate()
+            self._proc = None
+        Path(self.out_path).unlink(missing_ok=True)
+
+    # cv2.VideoWriter 호환
+    release = close
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
@@ -0,0 +1,126 @@
+import os
+from functools import cached_property, lru_cache
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+import numpy as np
+from PIL import Image
+
+try:
+    import cv2
+except ImportError:  # OpenCV가 없으면 Pillow 아핀 변환 사용
+    cv2 = None
+
+# Ken Burns 배경 (사진 천천히 확대/이동)
+# 배경 사진은 한 번만 디코딩해 출력보다 큰 버퍼로 보관하고, 프레임별 크롭/스케일을
+# 아핀 행렬 배열로 미리 계산한다. 프레임은 행렬 하나로 warpAffine 한 번에 만든다.
+# ffmpeg 필터그래프 백엔드에는 같은 경로의 zoompan 필터 문자열을 제공한다 (이때는 사진을 디코딩하지 않음).
+
+# 시작/끝 확대 비율
+KEN_BURNS_ZOOM = (1.0, 1.12)
+# 원본 버퍼를 출력보다 크게 디코딩하는 배율 (확대 시 화질 유지)
+OVERSAMPLE = 1.25
+# zoompan 입력을 원본 버퍼의 몇 배로 키울지 (정수 크롭 떨림 감소용 품질 설정, 클수록 느림)
+ZOOMPAN_OVERSAMPLE = int(os.getenv("MARO_ZOOMPAN_OVERSAMPLE", "1"))
+
+def oversized_size(W: int, H: int) -> Tuple[int, int]:
+    """원본 버퍼 크기 (SW, SH)"""
+    return int(round(W * OVERSAMPLE)), int(round(H * OVERSAMPLE))
+
+@lru_cache(maxsize=4)
+def load_oversized(image_path: str, W: int, H: int, mtime: float = 0.0) -> np.ndarray:
+    """출력 비율로 중앙 크롭 후 (W, H) * OVERSAMPLE 크기로 한 번만 디코딩한 RGB 버퍼"""
+    SW, SH = oversized_size(W, H)
+    with Image.open(image_path) as img:
+        img = img.convert("RGB")
+        scale = max(SW / img.width, SH / img.height)
+        img = img.resize((max(SW, int(round(img.width * scale))), max(SH, int(round(img.height * scale)))),
+                         Image.LANCZOS)
+        left, top = (img.width - SW) // 2, (img.height - SH) // 2
+        buffer = np.asarray(img.crop((left, top, left + SW, top + SH)), dtype=np.uint8)
+    buffer.setflags(write=False)
+    return buffer
+
+def _ease(u: np.ndarray) -> np.ndarray:
+    """시작과 끝이 부드러운 코사인 이징"""
+    return 0.5 - 0.5 * np.cos(np.pi * u)
+
+class KenBurns:
+    """미리 계산한 아핀 경로로 배경 사진을 확대/이동하는 프레임 생성기
+
+    TimelineCompositor의 배경 함수로 사용할 수 있다 (bg(t) -> RGB 프레임).
+    pan은 확대로 생긴 여유 폭 대비 이동 비율 (-1.0 ~ 1.0, 끝 시점 기준).
+    사진은 첫 프레임을 만들 때 디코딩한다 (zoompan_filter만 쓰면 디코딩하지 않음).
+    """
+
+    def __init__(self, image_path: str, W: int, H: int, duration: float, fps: int,
+                 zoom: Tuple[float, float] = KEN_BURNS_ZOOM, pan: Tuple[float, float] = (0.0, 0.0)):
+        self.W, self.H, self.fps = W, H, fps
+        self.duration = duration
+        self.zoom, self.pan = zoom, pan
+        self.image_path = str(image_path)
+        self.SW, self.SH = oversized_size(W, H)
+        self.n_frames = max(1, int(round(duration * fps)))
+        self.matrices = self._affine_path()
+
+    @cached_property
+    def source(self) -> np.ndarray:
+        """(SH, SW, 3) 원본 RGB 버퍼"""
+        return load_oversized(self.image_path, self.W, self.H, Path(self.image_path).stat().st_mtime)
+
+    def _affine_path(self) -> np.ndarray:
+        """프레임별 출력→원본 좌표 아핀 행렬 (n, 2, 3)"""
+        SW, SH = self.SW, self.SH
+        u = _ease(np.linspace(0.0, 1.0, self.n_frames))
+        z = self.zoom[0] + (self.zoom[1] - self.zoom[0]) * u
+        # 확대 z에서 보이는 원본 영역 (z=1이면 버퍼 전체)
+        rw, rh = SW / z, SH / z
+        cx = SW / 2 + self.pan[0] * (SW - rw) / 2 * u
+        cy = SH / 2 + self.pan[1] * (SH - rh) / 2 * u
+        sx, sy = rw / self.W, rh / self.H
+        m = np.zeros((self.n_frames, 2, 3), dtype=np.float64)
+        m[:, 0, 0], m[:, 0, 2] = sx, cx - rw / 2 + 0.5 * sx - 0.5
+        m[:, 1, 1], m[:, 1, 2] = sy, cy - rh / 2 + 0.5 * sy - 0.5
+        return m
+
+    def frame(self, index: int) -> np.ndarray:
+        m = self.matrices[min(max(index, 0), self.n_frames - 1)]
+        if cv2 is not None:
+            return cv2.warpAffine(self.source, m, (self.W, self.H),
+                                  flags=cv2.INTER_LINEAR | cv2.WARP_INVERSE_MAP, borderMode=cv2.BORDER_REFLECT)
+        img = Image.fromarray(self.source).transform((self.W, self.H), Image.AFFINE, data=tuple(m.ravel()),
+                                                     resample=Image.BILINEAR)
+        return np.asarray(img)
+
+    def __call__(self, t: float) -> np.ndarray:
+        return self.frame(int(round(t * self.fps)))
+
+    def frames(self, batch_size: int = 32) -> Iterator[np.ndarray]:
+        """전체 경로를 (batch, H, W, 3) 묶음으로 생성 (버퍼 재사용)"""
+        batch = np.empty((batch_size, self.H, self.W, 3), dtype=np.uint8)
+        for start in range(0, self.n_frames, batch_size):
+            count = min(batch_size, self.n_frames - start)
+            for k in range(count):
+                batch[k] = self.frame(start + k)
+            yield batch[:count]
+
+    def zoompan_filter(self, oversample: int = ZOOMPAN_OVERSAMPLE) -> str:
+        """같은 경로의 ffmpeg zoompan 필터 (단일 이미지 입력 → n_frames 프레임)
+
+        oversample > 1이면 zoompan의 정수 크롭 떨림을 줄이려고 입력을 버퍼 크기의 그 배수로 키운다
+        (1080p에서 4배면 약 9600x5400이라 느리고 메모리를 많이 쓴다).
+        """
+        SW, SH = self.SW * oversample, self.SH * oversample
+        n = max(self.n_frames - 1, 1)
+        z0, z1 = self.zoom
+        ease = f"(0.5-0.5*cos(PI*on/{n}))"
+        return (f"scale={SW}:{SH}:force_original_aspect_ratio=increase,crop={SW}:{SH},"
+                f"zoompan=z='{z0}+({z1}-{z0})*{ease}':"
+                f"x='iw/2-iw/zoom/2+{self.pan[0]}*(iw-iw/zoom)/2*{ease}':"
+                f"y='ih/2-ih/zoom/2+{self.pan[1]}*(ih-ih/zoom)/2*{ease}':"
+                f"d={self.n_frames}:s={self.W}x{self.H}:fps={self.fps}")
+
+def ken_burns_for(content: dict, background_image: Optional[str], W: int, H: int, fps: int) -> Optional[KenBurns]:
+    """content["background_motion"]이 kenburns이고 배경 사진이 있으면 KenBurns 생성"""
+    if content.get("background_motion") != "kenburns" or not background_image or not Path(background_image).exists():
+        return None
+    return KenBurns(background_image, W, H, content.get("duration_seconds", 180), fps)
@@ -0,0 +1,247 @@
+import json
+import os
+import re
+import subprocess
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from ffmpeg_encode import FFMPEG_BINARY
+
+# 미디어 길이 조회
+# 렌더 계획은 나레이션 실제 길이를 한 번만 조회해 모든 구간 길이를 맞춘다.
+
+FFPROBE_BINARY = os.getenv("FFPROBE_BINARY", "ffprobe")
+
+@lru_cache(maxsize=128)
+def _probe_duration(path: str, mtime: float, size: int) -> float:
+    try:
+        proc = subprocess.run([FFPROBE_BINARY, "-v", "error", "-show_entries", "format=duration",
+                               "-of", "default=noprint_wrappers=1:nokey=1", path],
+                              capture_output=True, text=True)
+        if proc.returncode == 0 and proc.stdout.strip():
+            return float(proc.stdout.strip())
+    except (FileNotFoundError, ValueError):
+        pass
+    # ffprobe가 없으면 ffmpeg 배너의 Duration 줄에서 읽는다
+    proc = subprocess.run([FFMPEG_BINARY, "-hide_banner", "-i", path], capture_output=True, text=True)
+    m = re.search(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)", proc.stderr)
+    if not m:
+        raise RuntimeError(f"미디어 길이를 읽을 수 없음: {path}")
+    h, mi, sec = m.groups()
+    return int(h) * 3600 + int(mi) * 60 + float(sec)
+
+def probe_duration(path: str) -> float:
+    """미디어 파일 길이(초). 같은 파일(경로, 수정시각, 크기)은 한 번만 조회한다."""
+    st = os.stat(path)
+    return _probe_duration(str(path), st.st_mtime, st.st_size)
+
+CHANNEL_LAYOUTS = {"mono": 1, "stereo": 2, "2.1": 3, "quad": 4, "5.0": 5, "5.1": 6, "7.1": 8}
+
+@lru_cache(maxsize=128)
+def _probe_audio_format(path: str, mtime: float, size: int) -> Optional[Tuple[int, int]]:
+    try:
+        proc = subprocess.run([FFPROBE_BINARY, "-v", "error", "-select_streams", "a:0",
+                               "-show_entries", "stream=sample_rate,channels",
+                               "-of", "default=noprint_wrappers=1:nokey=1", path],
+                              capture_output=True, text=True)
+        values = proc.stdout.split()
+        if proc.returncode == 0 and len(values) == 2:
+            return int(values[0]), int(values[1])
+        if proc.returncode == 0:
+            return None
+    except (FileNotFoundError, ValueError):
+        pass
+    proc = subprocess.run([FFMPEG_BINARY, "-hide_banner", "-i", path], capture_output=True, text=True)
+    m = re.search(r"Audio:.*?(\d+) Hz, ([^,]+)", proc.stderr)
+    if not m:
+        return None
+    layout = m.group(2).strip()
+    channels = CHANNEL_LAYOUTS.get(layout.split("(")[0])
+    if channels is None:
+        n = re.match(r"(\d+) channels", layout)
+        channels = int(n.group(1)) if n else 2
+    return int(m.group(1)), channels
+
+def probe_audio_format(path: str) -> Optional[Tuple[int, int]]:
+    """첫 오디오 스트림의 (샘플레이트, 채널 수). 오디오가 없으면 None."""
+    st = os.stat(path)
+    return _probe_audio_format(str(path), st.st_mtime, st.st_size)
+
+def _timescale(value: str) -> Optional[int]:
+    """ffprobe time_base("1/10240") 또는 배너 tbn("10240", "16k")을 정수 타임스케일로"""
+    value = value.strip()
+    if "/" in value:
+        return int(value.split("/")[1])
+    if value.endswith("k"):
+        return int(float(value[:-1]) * 1000)
+    return int(float(value))
+
+@lru_cache(maxsize=128)
+def _probe_video_format(path: str, mtime: float, size: int) -> Optional[Dict]:
+    try:
+        proc = subprocess.run([FFPROBE_BINARY, "-v", "error", "-select_streams", "v:0",
+                               "-show_entries", "stream=codec_name,profile,level,pix_fmt,width,height,time_base",
+                               "-of", "json", path], capture_output=True, text=True)
+        if proc.returncode == 0:
+            streams = json.loads(proc.stdout).get("streams") or []
+            if not streams:
+                return None
+            s = streams[0]
+            return {"codec": s.get("codec_name"), "profile": s.get("profile"), "level": s.get("level"),
+                    "pix_fmt": s.get("pix_fmt"), "size": (s.get("width"), s.get("height")),
+                    "timescale": _timescale(s["time_base"]) if s.get("time_base") else None}
+    except (FileNotFoundError, ValueError):
+        pass
+    # ffprobe가 없으면 ffmpeg 배너의 Video 줄에서 읽는다 (level은 알 수 없음)
+    proc = subprocess.run([FFMPEG_BINARY, "-hide_banner", "-i", path], capture_output=True, text=True)
+    m = re.search(r"Video: (\w+)(?: \(([^)]*)\))?.*?, (\w+)(?:\([^)]*\))?, (\d+)x(\d+).*?([\d.]+k?) tbn",
+                  proc.stderr)
+    if not m:
+        return None
+    profile = m.group(2) if m.group(2) and "/" not in m.group(2) else None
+    return {"codec": m.group(1), "profile": profile, "level": None, "pix_fmt": m.group(3),
+            "size": (int(m.group(4)), int(m.group(5))), "timescale": _timescale(m.group(6))}
+
+def probe_video_format(path: str) -> Optional[Dict]:
+    """첫 비디오 스트림의 코덱/프로파일/레벨/픽셀 형식/크기/타임스케일. 비디오가 없으면 None.
+
+    -c copy로 이어 붙일 수 있는지 비교하는 데 쓴다.
+    """
+    st = os.stat(path)
+    return _probe_video_format(str(path), st.st_mtime, st.st_size)
+
+# MP3 헤더 기반 길이 조회
+# TTS 구간마다 전체 디코딩(pydub) 대신 첫 프레임 헤더와 Xing/Info(LAME 갭리스 정보 포함)/VBRI
+# 태그, 또는 CBR 파일 크기로 샘플 단위 정확한 길이를 계산한다. 서브프로세스/PCM 할당 없음.
+
+# (MPEG-1 여부, 레이어) → 비트레이트 표 (kbps)
+_MP3_BITRATES = {
+    (True, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (True, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (True, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (False, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (False, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (False, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# 버전 비트 → 샘플레이트 표 (3: MPEG-1, 2: MPEG-2, 0: MPEG-2.5)
+_MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+# 첫 프레임과 태그를 찾기 위해 읽는 최대 바이트 (ID3v2 태그 이후부터)
+_MP3_SCAN_BYTES = 64 * 1024
+# 태그 없는 파일을 CBR로 판단하기 전에 비트레이트를 확인하는 프레임 수
+_CBR_CHECK_FRAMES = 32
+
+def parse_mp3_frame_header(data: bytes, offset: int = 0) -> Optional[Dict]:
+    """MPEG 오디오 프레임 헤더 4바이트 해석 (유효하지 않으면 None)"""
+    if offset + 4 > len(data):
+        return None
+    h = int.from_bytes(data[offset:offset + 4], "big")
+    version, layer_bits = (h >> 19) & 3, (h >> 17) & 3
+    bitrate_idx, rate_idx = (h >> 12) & 15, (h >> 10) & 3
+    if h >> 21 != 0x7FF or version == 1 or layer_bits == 0 or bitrate_idx in (0, 15) or rate_idx == 3:
+        return None
+    layer, mpeg1 = 4 - layer_bits, version == 3
+    bitrate = _MP3_BITRATES[(mpeg1, layer)][bitrate_idx] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][rate_idx]
+    padding = (h >> 9) & 1
+    samples = 384 if layer == 1 else (1152 if layer == 2 or mpeg1 else 576)
+    if layer == 1:
+        length = (12 * bitrate // sample_rate + padding) * 4
+    else:
+        length = samples // 8 * bitrate // sample_rate + padding
+    return {"mpeg1": mpeg1, "layer": layer, "bitrate": bitrate, "sample_rate": sample_rate,
+            "channels": 1 if (h >> 6) & 3 == 3 else 2, "samples": samples, "length": length}
+
+def _find_first_frame(data: bytes) -> Optional[Tuple[int, Dict]]:
+    """다음 프레임 헤더까지 확인해 잘못된 동기 패턴을 거른 첫 프레임 (오프셋, 헤더)"""
+    pos = data.find(b"\xff")
+    while 0 <= pos < len(data) - 4:
+        header = parse_mp3_frame_header(data, pos)
+        if header:
+            following = parse_mp3_frame_header(data, pos + header["length"])
+            if following or pos + header["length"] >= len(data):
+                return pos, header
+        pos = data.find(b"\xff", pos + 1)
+    return None
+
+def _id3v2_size(head: bytes) -> int:
+    if len(head) < 10 or head[:3] != b"ID3":
+        return 0
+    size = (head[6] & 0x7F) << 21 | (head[7] & 0x7F) << 14 | (head[8] & 0x7F) << 7 | (head[9] & 0x7F)
+    return 10 + size + (10 if head[5] & 0x10 else 0)
+
+def mp3_info_tag(data: bytes, pos: int, header: Dict) -> Optional[Tuple[int, int, int]]:
+    """pos의 프레임이 Xing/Info 태그 프레임이면 (프레임 수, 인코더 지연, 끝 패딩)
+
+    지연/패딩은 LAME 태그(ffmpeg는 Lavc/Lavf)가 있을 때만 읽고, 없으면 0이다.
+    프레임 수에는 태그 프레임 자신이 포함되지 않는다.
+    """
+    # Xing/Info 태그는 첫 프레임의 사이드 정보 바로 뒤에 있다
+    side_info = (32 if header["channels"] == 2 else 17) if header["mpeg1"] else (17 if header["channels"] == 2 else 9)
+    xing = pos + 4 + side_info
+    if data[xing:xing + 4] not in (b"Xing", b"Info"):
+        return None
+    flags = int.from_bytes(data[xing + 4:xing + 8], "big")
+    if not flags & 1:
+        return None
+    frames = int.from_bytes(data[xing + 8:xing + 12], "big")
+    p = xing + 12 + (4 if flags & 2 else 0) + (100 if flags & 4 else 0) + (4 if flags & 8 else 0)
+    delay = padding = 0
+    if data[p:p + 4] in (b"LAME", b"Lavc", b"Lavf"):
+        # LAME 태그의 인코더 지연/끝 패딩 (각 12비트) - 디코더가 잘라내는 샘플
+        gapless = int.from_bytes(data[p + 21:p + 24], "big")
+        delay, padding = gapless >> 12, gapless & 0xFFF
+    return frames, delay, padding
+
+def mp3_duration_us(path: str) -> Optional[int]:
+    """MP3 길이(마이크로초)를 헤더만 읽어 계산 (MP3가 아니거나 해석할 수 없으면 None)
+
+    Xing/Info 태그의 프레임 수(LAME 태그가 있으면 인코더 지연/패딩 제외), VBRI 태그의
+    프레임 수, 둘 다 없으면 CBR로 보고 오디오 바이트 수에서 프레임 수를 구한다.
+    태그 없는 VBR 파일은 None (probe_duration으로 조회).
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        start = _id3v2_size(f.read(10))
+        f.seek(start)
+        data = f.read(_MP3_SCAN_BYTES)
+        f.seek(max(size - 128, 0))
+        has_id3v1 = f.read(3) == b"TAG"
+    found = _find_first_frame(data)
+    if not found:
+        return None
+    pos, header = found
+    sample_rate, spf = header["sample_rate"], header["samples"]
+
+    info = mp3_info_tag(data, pos, header)
+    if info:
+        frames, delay, padding = info
+        samples = frames * spf - delay - padding
+        return int(round(max(samples, 0) * 1_000_000 / sample_rate))
+
+    vbri = pos + 36
+    if data[vbri:vbri + 4] == b"VBRI":
+        frames = int.from_bytes(data[vbri + 14:vbri + 18], "big")
+        return int(round(frames * spf * 1_000_000 / sample_rate))
+
+    # 태그 없는 VBR은 헤더만으로 알 수 없으므로 앞쪽 프레임의 비트레이트가 모두 같을 때만 CBR로 계산
+    frame = pos
+    for _ in range(_CBR_CHECK_FRAMES):
+        following = parse_mp3_frame_header(data, frame)
+        if following is None:
+            break
+        if following["bitrate"] != header["bitrate"]:
+            return None
+        frame += following["length"]
+
+    # CBR: 프레임 길이가 패딩 비트만 다르므로 평균 프레임 길이로 프레임 수 계산
+    audio_bytes = size - start - pos - (128 if has_id3v1 else 0)
+    frames = round(audio_bytes * 8 * sample_rate / (header["bitrate"] * spf))
+    return int(round(frames * spf * 1_000_000 / sample_rate))
+
+def audio_duration(path: str) -> float:
+    """오디오 파일 길이(초). MP3는 헤더만 읽고, 그 외 또는 해석 실패 시 probe_duration"""
+    if Path(path).suffix.lower() == ".mp3":
+        us = mp3_duration_us(str(path))
+        if us is not None:
+            return us / 1_000_000
+    return probe_duration(path)
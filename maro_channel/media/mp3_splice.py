@@ -0,0 +1,116 @@
+import os
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Tuple
+from ffmpeg_encode import run_ffmpeg
+from media_info import parse_mp3_frame_header, mp3_info_tag, _id3v2_size
+
+# MP3 프레임 이어 붙이기 (재인코딩 없음)
+# TTS 구간 MP3의 오디오 프레임과, 같은 형식(샘플레이트/채널/비트레이트)으로 미리 인코딩한
+# 무음 프레임을 바이트 단위로 연결한다. 무음은 비트 저장소 없이(-reservoir 0) 인코딩해
+# 앞 프레임 데이터를 참조하지 않으므로 어느 경계에 넣어도 깨지지 않는다.
+# 무음은 프레임 단위(24kHz에서 24ms)라 구간 시작 시각은 누적 오차를 보정하며 반 프레임 이내로 맞춘다.
+# 맨 앞에는 전체 프레임 수를 담은 Xing/Info 태그 프레임을 새로 써서 VBR 구간이 섞여도
+# 헤더만으로 길이를 알 수 있게 한다 (구간 파일의 태그 프레임은 버린다).
+
+# 디코더 합성 필터뱅크 지연 (LAME 갭리스 정보의 인코더 지연과 별개로 항상 생김)
+DECODER_DELAY = 529
+
+def read_mp3_frames(path: str) -> Tuple[Dict, List[bytes], int, int]:
+    """MP3 파일의 (첫 프레임 헤더, 오디오 프레임 목록, 인코더 지연, 끝 패딩)
+
+    ID3 태그와 Xing/Info 태그 프레임은 제외한다. 형식이 섞여 있거나 해석할 수 없으면 ValueError.
+    """
+    data = Path(path).read_bytes()
+    pos = _id3v2_size(data[:10])
+    end = len(data) - (128 if data[-128:-125] == b"TAG" else 0)
+    first = parse_mp3_frame_header(data, pos)
+    if first is None:
+        raise ValueError(f"MP3 프레임을 찾을 수 없음: {path}")
+    delay = padding = 0
+    info = mp3_info_tag(data, pos, first)
+    if info:
+        _, delay, padding = info
+        pos += first["length"]
+    frames = []
+    while pos < end:
+        header = parse_mp3_frame_header(data, pos)
+        if header is None:
+            raise ValueError(f"MP3 프레임 헤더 오류 ({path}, {pos}바이트)")
+        if (header["sample_rate"], header["channels"], header["layer"]) != \
+                (first["sample_rate"], first["channels"], first["layer"]):
+            raise ValueError(f"MP3 형식이 섞여 있음: {path}")
+        frames.append(data[pos:pos + header["length"]])
+        pos += header["length"]
+    if not frames:
+        raise ValueError(f"MP3 오디오 프레임 없음: {path}")
+    return first, frames, delay, padding
+
+@lru_cache(maxsize=8)
+def silence_frame(sample_rate: int, channels: int, bitrate: int) -> bytes:
+    """같은 형식의 자기 완결 무음 프레임 하나 (형식별로 한 번만 인코딩)"""
+    with tempfile.TemporaryDirectory(prefix="maro_silence_") as work_dir:
+        path = os.path.join(work_dir, "silence.mp3")
+        run_ffmpeg(["-f", "lavfi", "-i", f"anullsrc=r={sample_rate}:cl={'mono' if channels == 1 else 'stereo'}",
+                    "-t", "1", "-c:a", "libmp3lame", "-b:a", str(bitrate), "-reservoir", "0",
+                    "-write_xing", "0", path])
+        header, frames, _, _ = read_mp3_frames(path)
+    if header["bitrate"] != bitrate:
+        raise ValueError(f"무음 프레임 비트레이트 불일치: {header['bitrate']} != {bitrate}")
+    # 인코더 시작/끝 과도 구간을 피해 중간 프레임 사용
+    return frames[len(frames) // 2]
+
+def xing_frame(template: bytes, header: Dict, n_frames: int, n_bytes: int, vbr: bool) -> bytes:
+    """template 프레임과 같은 헤더의 Xing(VBR)/Info(CBR) 태그 프레임 (프레임 수/바이트 수 기록)
+
+    사이드 정보가 모두 0이라 디코더는 태그로 인식해 건너뛰고, 모르는 디코더도 무음으로 재생한다.
+    """
+    side_info = (32 if header["channels"] == 2 else 17) if header["mpeg1"] else (17 if header["channels"] == 2 else 9)
+    tag = (b"Xing" if vbr else b"Info") + (3).to_bytes(4, "big") + n_frames.to_bytes(4, "big") + n_bytes.to_bytes(4, "big")
+    if 4 + side_info + len(tag) > len(template):
+        raise ValueError(f"태그를 넣기에 프레임이 너무 짧음 ({len(template)}바이트)")
+    frame = template[:4] + bytes(side_info) + tag
+    return frame + bytes(len(template) - len(frame))
+
+def splice_mp3(parts: List[Dict], outfile: str, lead_in: float, gap: float) -> float:
+    """구간 MP3(parts[i]["file"], ["duration"])를 무음 프레임과 함께 이어 붙여 저장하고 길이(초) 반환
+
+    구간 i는 lead_in + sum(이전 구간 길이 + gap) 시각에 들리도록 무음 프레임 수를 정한다
+    (오차는 반 프레임 이내). 프레임 단위로 맞춘 실제 시작 시각은 parts[i]["start"](초)에 기록해
+    tts_openai.segment_timeline이 자막 시각으로 쓴다.
+    """
+    decoded = [read_mp3_frames(p["file"]) for p in parts]
+    first = decoded[0][0]
+    formats = {(h["sample_rate"], h["channels"], h["layer"], h["mpeg1"]) for h, _, _, _ in decoded}
+    if len(formats) != 1 or first["layer"] != 3:
+        raise ValueError("구간 MP3 형식(샘플레이트/채널/레이어)이 서로 다름")
+    sample_rate, spf = first["sample_rate"], first["samples"]
+    silence = silence_frame(sample_rate, first["channels"], first["bitrate"])
+
+    out, starts, cursor, target = [], [], 0, lead_in
+    for part, (_, frames, delay, _) in zip(parts, decoded):
+        # 구간의 실제 소리 시작(프레임 시작 + 인코더/디코더 지연)이 목표 시각에 오도록 무음 삽입
+        offset = delay + DECODER_DELAY if delay else 0
+        n_silence = max(0, round((target * sample_rate - offset - cursor) / spf))
+        starts.append(round((cursor + n_silence * spf + offset) / sample_rate, 4))
+        out += [silence] * n_silence + frames
+        cursor += (n_silence + len(frames)) * spf
+        target += part["duration"] + gap
+    n_silence = max(0, round((target * sample_rate - cursor) / spf))
+    out += [silence] * n_silence
+    cursor += n_silence * spf
+
+    # 프레임 헤더 3번째 바이트 상위 4비트가 비트레이트 인덱스
+    vbr = len({frame[2] >> 4 for frame in out}) > 1
+    audio = b"".join(out)
+    tag = xing_frame(silence, first, len(out), len(audio) + len(silence), vbr)
+
+    tmp_path = f"{outfile}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(tag + audio)
+    os.replace(tmp_path, outfile)
+    # 연결에 성공했을 때만 기록 (실패해 pydub으로 대체되면 공식 시각을 그대로 씀)
+    for part, start in zip(parts, starts):
+        part["start"] = start
+    return cursor / sample_rate
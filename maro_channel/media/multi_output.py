@@ -0,0 +1,75 @@
+import tempfile
+from pathlib import Path
+from typing import Dict, Optional, Union
+from ffmpeg_encode import run_ffmpeg, write_concat_list, save_still_entries
+from encoding_profiles import get_profile, output_resolution, video_codec_args, audio_codec_args
+from video_maker import parse_resolution, build_compositor, plan_still_segments, with_narration_duration
+
+# 다중 출력 렌더
+# 가로 영상, 쇼츠(세로, 텍스트 재배치), 720p를 ffmpeg 한 번의 실행으로 함께 만든다.
+# 같은 화면 비율의 출력은 가장 큰 해상도의 레이아웃을 한 번만 래스터화해 split + scale로 나누고,
+# 나레이션은 AAC로 한 번만 인코딩해 모든 출력에 스트림 복사한다.
+
+OUTPUT_TARGETS = {
+    "landscape": {"resolution": "1920x1080", "mode": "landscape"},
+    "shorts": {"resolution": "1080x1920", "mode": "shorts"},
+    "landscape_720p": {"resolution": "1280x720", "mode": "landscape"},
+}
+
+def render_multi(audio_path: Optional[str], content: Dict, background_image: Optional[str],
+                 out_paths: Dict[str, str], profile: Union[str, Dict, None] = None,
+                 targets: Optional[Dict[str, Dict]] = None) -> Dict[str, str]:
+    """out_paths({타깃 이름: 출력 경로})의 모든 타깃을 한 번의 렌더로 생성
+
+    타깃은 OUTPUT_TARGETS(또는 targets)의 {"resolution", "mode"} 설정을 따른다.
+    정지 배경 기준이며, 프로파일 해상도 상한은 타깃마다 적용된다.
+    """
+    profile = get_profile(profile)
+    targets = targets or OUTPUT_TARGETS
+    unknown = [name for name in out_paths if name not in targets]
+    if unknown:
+        raise ValueError(f"알 수 없는 출력 타깃: {', '.join(unknown)}")
+    content = with_narration_duration(content, audio_path)
+    total_duration = content["duration_seconds"]
+    fps = profile["fps"]
+    has_audio = bool(audio_path) and Path(audio_path).exists()
+
+    # 레이아웃 모드별로 묶어 가장 큰 해상도에서 한 번만 래스터화
+    groups: Dict[str, list] = {}
+    for name in out_paths:
+        groups.setdefault(targets[name]["mode"], []).append(name)
+
+    with tempfile.TemporaryDirectory(prefix="maro_multi_") as work_dir:
+        args, graph, branches = [], [], {}
+        for input_idx, (mode, names) in enumerate(groups.items()):
+            W, H = max((parse_resolution(targets[n]["resolution"]) for n in names), key=lambda r: r[0] * r[1])
+            compositor, layout = build_compositor(content, background_image, W, H, mode)
+            stills = [(compositor.frame_at(start), end - start)
+                      for start, end in plan_still_segments(layout, total_duration)]
+            list_path = Path(work_dir) / f"{mode}.ffconcat"
+            write_concat_list(save_still_entries(stills, work_dir, fps, prefix=mode), list_path)
+            args += ["-f", "concat", "-safe", "0", "-i", list_path]
+
+            labels = [f"{mode}_{k}" for k in range(len(names))]
+            graph.append(f"[{input_idx}:v]fps={fps},split={len(names)}" + "".join(f"[{l}]" for l in labels))
+            for name, label in zip(names, labels):
+                w, h = output_resolution(*parse_resolution(targets[name]["resolution"]), profile)
+                graph.append(f"[{label}]scale={w}:{h}:flags=area,setsar=1[out_{name}]")
+                branches[name] = f"[out_{name}]"
+
+        if has_audio:
+            # 나레이션은 한 번만 인코딩해 모든 출력에 복사
+            narration = str(Path(work_dir) / "narration.m4a")
+            run_ffmpeg(["-i", audio_path, "-vn"] + audio_codec_args(profile) + [narration])
+            audio_idx = len(groups)
+            args += ["-i", narration]
+
+        args += ["-filter_complex", ";".join(graph)]
+        for name, out_path in out_paths.items():
+            args += ["-map", branches[name]]
+            if has_audio:
+                args += ["-map", f"{audio_idx}:a", "-c:a", "copy"]
+            args += video_codec_args(profile) + ["-t", f"{total_duration:.6f}", "-movflags", "+faststart", out_path]
+        run_ffmpeg(args)
+    print(f"✅ 다중 출력 렌더 완료: {', '.join(out_paths)}")
+    return dict(out_paths)
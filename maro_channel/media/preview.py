@@ -0,0 +1,62 @@
+from typing import Dict, List, Optional
+import numpy as np
+from PIL import Image, ImageDraw
+from video_maker import (parse_resolution, build_compositor, plan_still_segments, make_healing_video,
+                         with_narration_duration)
+
+# 업로드 전 QA용 미리보기
+# 실제 렌더와 같은 레이아웃/합성 코드를 사용하므로 미리보기에서 보이는 배치가 그대로 출력된다.
+
+def find_overflow(compositor, W: int, H: int) -> List[int]:
+    """화면 밖으로 벗어나는 텍스트 레이어 인덱스 목록"""
+    overflow = []
+    for idx, layer in enumerate(compositor.layers):
+        h, w = layer.rgb.shape[:2]
+        if layer.x < 0 or layer.y < 0 or layer.x + w > W or layer.y + h > H:
+            overflow.append(idx)
+    return overflow
+
+def render_preview(audio_path: str, content: Dict, background_image: str, resolution: str, out_path: str,
+                   mode: str = "landscape") -> str:
+    """360p 저프레임 미리보기 영상 (정지 구간 인코더 + preview 프로파일)"""
+    return make_healing_video(audio_path, content, background_image, resolution, out_path, mode,
+                              render_mode="stills", profile="preview")
+
+def render_contact_sheet(content: Dict, background_image: str, resolution: str, out_path: str,
+                         mode: str = "landscape", columns: int = 4, thumb_width: int = 480,
+                         audio_path: Optional[str] = None) -> str:
+    """구간마다 한 프레임씩 모은 콘택트 시트 이미지
+
+    화면 밖으로 넘치는 텍스트는 빨간 테두리로 표시하고 목록을 출력한다.
+    """
+    W, H = parse_resolution(resolution)
+    content = with_narration_duration(content, audio_path)
+    compositor, layout = build_compositor(content, background_image, W, H, mode)
+    overflow = set(find_overflow(compositor, W, H))
+    for idx in sorted(overflow):
+        print(f"⚠️ 화면 밖으로 넘치는 텍스트 ({layout[idx]['start']:.1f}s): {layout[idx]['text'][:30]}...")
+
+    segments = plan_still_segments(layout, content["duration_seconds"])
+    scale = thumb_width / W
+    thumb_height = int(round(H * scale))
+    rows = (len(segments) + columns - 1) // columns
+    label_height = 24
+    sheet = Image.new("RGB", (columns * thumb_width, rows * (thumb_height + label_height)), (0, 0, 0))
+    draw = ImageDraw.Draw(sheet)
+
+    for i, (start, end) in enumerate(segments):
+        ox, oy = (i % columns) * thumb_width, (i // columns) * (thumb_height + label_height)
+        frame = compositor.frame_at(start)
+        thumb = Image.fromarray(np.asarray(frame)).resize((thumb_width, thumb_height), Image.BILINEAR)
+        sheet.paste(thumb, (ox, oy))
+        for idx in compositor.active_at(start):
+            if idx in overflow:
+                layer = compositor.layers[idx]
+                h, w = layer.rgb.shape[:2]
+                draw.rectangle([ox + layer.x * scale, oy + layer.y * scale,
+                                ox + (layer.x + w) * scale, oy + (layer.y + h) * scale], outline=(255, 0, 0), width=2)
+        draw.text((ox + 6, oy + thumb_height + 4), f"{start:.1f}s - {end:.1f}s", fill=(255, 255, 255))
+
+    sheet.save(out_path)
+    print(f"✅ 콘택트 시트 생성 완료: {out_path} ({len(segments)}개 구간)")
+    return out_path
@@ -0,0 +1,179 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+from ffmpeg_encode import FFMPEG_BINARY, run_ffmpeg, has_filter
+from encoding_profiles import get_profile
+from text_render import find_korean_font
+from video_maker import make_healing_video
+
+# 통합 렌더러
+# 콘텐츠 dict + 나레이션 → 영상 하나의 API(render)와 교체 가능한 렌더 백엔드 등록부.
+# 호스트마다 짧은 샘플로 백엔드별 속도를 측정(calibrate)해 두고 가장 빠른 백엔드를 고른다.
+# 측정은 수 분이 걸릴 수 있어 scheduling/main.py calibrate로만 실행하고, 측정 결과가 없으면 우선순위 순으로 고른다.
+
+# 백엔드 이름 → {"render": 렌더 함수, "available": 사용 가능 여부 함수}
+# 렌더 함수 인자: (audio_path, content, background_image, resolution, out_path, mode, profile)
+BACKENDS: Dict[str, Dict[str, Callable]] = {}
+
+# 측정 결과가 없을 때의 선택 순서
+BACKEND_PRIORITY = ["scenes", "vfr", "stills", "ffmpeg", "ass", "pipe", "moviepy"]
+
+CALIBRATION_FILE = os.getenv("MARO_RENDER_CALIBRATION",
+                             str(Path.home() / ".cache" / "maro" / "render_calibration.json"))
+
+def register_backend(name: str, render_fn: Callable, available: Optional[Callable[[], bool]] = None):
+    """렌더 백엔드 등록 (같은 이름이면 교체)"""
+    BACKENDS[name] = {"render": render_fn, "available": available or (lambda: True)}
+
+def available_backends() -> List[str]:
+    """현재 호스트에서 사용할 수 있는 백엔드 이름 목록"""
+    names = []
+    for name, backend in BACKENDS.items():
+        try:
+            if backend["available"]():
+                names.append(name)
+        except Exception:
+            pass
+    return names
+
+def _ffmpeg_available() -> bool:
+    return shutil.which(FFMPEG_BINARY) is not None or Path(FFMPEG_BINARY).exists()
+
+def _render_mode(render_mode: str, **kwargs) -> Callable:
+    def render_fn(audio_path, content, background_image, resolution, out_path, mode, profile):
+        return make_healing_video(audio_path, content, background_image, resolution, out_path, mode,
+                                  render_mode=render_mode, profile=profile, **kwargs)
+    return render_fn
+
+def _render_scenes(audio_path, content, background_image, resolution, out_path, mode, profile, scene_cache=None):
+    # 캐시 디렉토리(MARO_SCENE_CACHE_DIR)는 렌더와 에피소드 사이에 공유된다
+    from scene_cache import SceneCache
+    return make_healing_video(audio_path, content, background_image, resolution, out_path, mode,
+                              render_mode="stills", workers=os.cpu_count() or 1, profile=profile,
+                              scene_cache=scene_cache or SceneCache())
+
+register_backend("moviepy", _render_mode("moviepy"))
+register_backend("stills", _render_mode("stills", workers=os.cpu_count() or 1), _ffmpeg_available)
+register_backend("ffmpeg", _render_mode("ffmpeg"),
+                 lambda: _ffmpeg_available() and has_filter("drawtext") and bool(find_korean_font()))
+register_backend("ass", _render_mode("ass"), lambda: _ffmpeg_available() and has_filter("ass"))
+register_backend("pipe", _render_mode("pipe"), _ffmpeg_available)
+register_backend("scenes", _render_scenes, _ffmpeg_available)
+# 구간마다 프레임 하나만 인코딩하는 가변 프레임레이트 출력
+register_backend("vfr", _render_mode("stills", vfr=True), _ffmpeg_available)
+
+CALIBRATION_PARAGRAPHS = [
+    "괜찮아요. 오늘 하루도 충분히 잘 해냈어요.",
+    "천천히 숨을 쉬어 보세요. 지금 이 순간만 생각해도 괜찮아요.",
+    "작은 걸음도 걸음이에요. 당신은 생각보다 단단한 사람이에요.",
+    "힘든 마음은 잠시 내려놓고, 따뜻한 차 한 잔과 함께 쉬어 가요.",
+]
+
+def _calibration_key(resolution: str, profile: Dict) -> str:
+    return f"{resolution}/{profile['name']}"
+
+def load_calibration() -> Dict:
+    try:
+        return json.loads(Path(CALIBRATION_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+def calibrate(resolution: str = "1920x1080", profile: Union[str, Dict, None] = None,
+              duration: float = 60.0, backends: Optional[List[str]] = None) -> Dict[str, float]:
+    """샘플 콘텐츠로 백엔드별 렌더 시간(초)을 측정해 저장
+
+    샘플은 실제 에피소드처럼 여러 문단(약 8초에 한 문단)으로 구성해 카드 전환 비용까지 측정한다.
+
+    실패한 백엔드는 결과에서 제외된다. 결과는 해상도/프로파일별로 CALIBRATION_FILE에 기록된다.
+    scenes 백엔드는 공유 캐시 적중으로 빨라 보이지 않도록 빈 임시 캐시로 측정한다.
+    """
+    from scene_cache import SceneCache
+    profile = get_profile(profile)
+    content = {
+        "type": "daily_comfort",
+        "title": "오늘의 위로",
+        "content": "\n\n".join(CALIBRATION_PARAGRAPHS[i % len(CALIBRATION_PARAGRAPHS)]
+                               for i in range(max(1, int(duration // 8)))),
+        "duration_seconds": duration,
+    }
+    timings = {}
+    with tempfile.TemporaryDirectory(prefix="maro_calibrate_") as work_dir:
+        audio_path = str(Path(work_dir) / "silence.m4a")
+        run_ffmpeg(["-f", "lavfi", "-i", "anullsrc=r=24000:cl=mono", "-t", f"{duration:.3f}",
+                    "-c:a", "aac", audio_path])
+        for name in backends or available_backends():
+            out_path = str(Path(work_dir) / f"{name}.mp4")
+            args = (audio_path, content, None, resolution, out_path, "landscape", profile)
+            started = time.perf_counter()
+            try:
+                if BACKENDS[name]["render"] is _render_scenes:
+                    _render_scenes(*args, scene_cache=SceneCache(str(Path(work_dir) / "scenes")))
+                else:
+                    BACKENDS[name]["render"](*args)
+            except Exception as e:
+                print(f"⚠️ 백엔드 측정 실패 ({name}): {e}")
+                continue
+            timings[name] = round(time.perf_counter() - started, 3)
+            print(f"⏱️ {name}: {timings[name]:.2f}초")
+
+    calibration = load_calibration()
+    calibration[_calibration_key(resolution, profile)] = timings
+    Path(CALIBRATION_FILE).parent.mkdir(parents=True, exist_ok=True)
+    Path(CALIBRATION_FILE).write_text(json.dumps(calibration, indent=2, ensure_ascii=False), encoding="utf-8")
+    return timings
+
+def select_backend(resolution: str, profile: Union[str, Dict, None] = None) -> str:
+    """측정 결과 중 가장 빠른 사용 가능 백엔드
+
+    해상도/프로파일의 측정 결과가 없거나 모두 실패했으면 BACKEND_PRIORITY 순으로 고른다.
+    (렌더 도중 측정하지 않는다 - scheduling/main.py calibrate로 미리 측정)
+    """
+    profile = get_profile(profile)
+    available = available_backends()
+    if not available:
+        raise RuntimeError("사용 가능한 렌더 백엔드가 없음")
+    key = _calibration_key(resolution, profile)
+    timings = load_calibration().get(key)
+    if timings is None:
+        print(f"ℹ️ 렌더 백엔드 측정 결과 없음 ({key}) - 우선순위로 선택 (측정: python main.py calibrate)")
+    timings = timings or {}
+    measured = [name for name in available if name in timings]
+    if measured:
+        return min(measured, key=timings.get)
+    ranked = [name for name in BACKEND_PRIORITY if name in available]
+    return (ranked or available)[0]
+
+def render(content: Dict, audio_path: Optional[str], profile: Union[str, Dict, None] = None,
+           out_path: Optional[str] = None, background_image: Optional[str] = None,
+           resolution: str = "1920x1080", mode: str = "landscape", backend: str = "auto",
+           bumpers: Optional[Dict] = None) -> str:
+    """콘텐츠 dict와 나레이션으로 영상을 렌더링하고 출력 경로를 반환
+
+    backend="auto"이면 calibrate() 측정 결과 기준 가장 빠른 백엔드를 사용한다.
+    out_path를 생략하면 나레이션 파일 옆에 <콘텐츠 타입>.mp4로 저장한다.
+    bumpers(채널 정보 dict: name, slogan, outro_lines)가 주어지면 미리 인코딩된
+    인트로/아웃트로를 스트림 복사로 앞뒤에 붙인다.
+    """
+    profile = get_profile(profile)
+    if backend == "auto":
+        backend = select_backend(resolution, profile)
+    if backend not in BACKENDS:
+        raise ValueError(f"지원하지 않는 렌더 백엔드: {backend} (사용 가능: {', '.join(BACKENDS)})")
+    if out_path is None:
+        base_dir = Path(audio_path).parent if audio_path else Path(".")
+        out_path = str(base_dir / f"{content.get('type', 'video')}.mp4")
+    print(f"🎬 렌더 백엔드: {backend} ({profile['name']})")
+    if not bumpers:
+        return BACKENDS[backend]["render"](audio_path, content, background_image, resolution, out_path, mode, profile)
+
+    from bumpers import add_bumpers
+    body_path = str(Path(out_path).with_suffix(".body.mp4"))
+    BACKENDS[backend]["render"](audio_path, content, background_image, resolution, body_path, mode, profile)
+    try:
+        return add_bumpers(body_path, out_path, bumpers, resolution, profile, background_image)
+    finally:
+        Path(body_path).unlink(missing_ok=True)
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+import numpy as np
+from ffmpeg_encode import (run_ffmpeg, save_still, snap_durations, stills_filter, write_concat_list,
+                           audio_codec_args, _encode_chunk)
+from encoding_profiles import get_profile
+
+# 콘텐츠 주소 기반 장면 캐시
+# 정지 구간 하나(배경 + 활성 텍스트)를 입력 해시로 식별되는 작은 인코딩 클립으로 저장한다.
+# 아웃트로/타이틀 카드처럼 에피소드마다 반복되는 구간은 캐시 클립을 스트림 복사로 이어 붙이고
+# 새 본문 구간만 인코딩한다.
+
+SCENE_CACHE_DIR = os.getenv("MARO_SCENE_CACHE_DIR", str(Path.home() / ".cache" / "maro" / "scenes"))
+# 렌더가 끝날 때마다 이 크기를 넘는 만큼 오래 사용되지 않은 클립부터 지운다 (0이면 정리 안 함)
+SCENE_CACHE_MAX_MB = int(os.getenv("MARO_SCENE_CACHE_MAX_MB", "2000"))
+
+# 합성/인코딩 방식이 바뀌면 올려서 기존 캐시를 무효화
+SCENE_CACHE_VERSION = 1
+
+def scene_key(scene: Dict) -> str:
+    """장면 입력(텍스트, 폰트, 해상도, 배경, 프레임 수, 프로파일) dict의 sha256"""
+    payload = json.dumps(dict(scene, version=SCENE_CACHE_VERSION), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class SceneCache:
+    """장면 키 → 인코딩된 비디오 전용 클립 (.mp4) 디렉토리 캐시
+
+    max_bytes를 주면 prune() 시 가장 오래 사용되지 않은 클립부터 지운다.
+    """
+
+    def __init__(self, cache_dir: str = SCENE_CACHE_DIR,
+                 max_bytes: Optional[int] = SCENE_CACHE_MAX_MB * 1024 * 1024 or None):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.mp4"
+
+    def get(self, key: str) -> Optional[str]:
+        path = self.path_for(key)
+        if path.exists():
+            os.utime(path)  # prune()가 최근 사용 순으로 정리하도록 갱신
+            self.hits += 1
+            return str(path)
+        self.misses += 1
+        return None
+
+    def put(self, key: str, clip_path: str) -> str:
+        """클립을 캐시로 이동 (임시 파일 후 rename으로 동시 렌더에도 안전)"""
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        shutil.move(str(clip_path), tmp_path)
+        os.replace(tmp_path, path)
+        return str(path)
+
+    def prune(self, max_bytes: Optional[int] = None):
+        """전체 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 클립부터 삭제"""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        if max_bytes is None:
+            return
+        clips = sorted(self.cache_dir.glob("*/*.mp4"), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in clips)
+        for path in clips:
+            if total <= max_bytes:
+                break
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
+
+def encode_scenes(scenes: List[Dict], durations: List[float], render_frame: Callable[[int], np.ndarray],
+                  audio_path: Optional[str], out_path: str, cache: SceneCache,
+                  profile: Union[str, Dict, None] = None, workers: int = 1) -> str:
+    """장면 목록을 캐시 클립 연결로 인코딩
+
+    scenes[i]는 i번째 구간의 입력 dict, render_frame(i)는 캐시 미스일 때만 호출되어
+    해당 구간의 RGB 프레임을 반환한다. 미스 구간만 인코딩(workers > 1이면 병렬)한 뒤
+    전체 클립을 concat demuxer(-c copy)로 이어 붙이고 나레이션을 먹싱한 뒤 캐시 크기를 정리한다.
+    """
+    profile = get_profile(profile)
+    fps = profile["fps"]
+    durations = snap_durations(durations, fps)
+    with tempfile.TemporaryDirectory(prefix="maro_scenes_") as work_dir:
+        clip_paths, jobs, miss_keys = [], [], []
+        for idx, (scene, duration) in enumerate(zip(scenes, durations)):
+            # 프레임 격자 보정 후의 프레임 수까지 키에 포함
+            key = scene_key(dict(scene, frames=int(round(duration * fps)), profile=profile))
+            if key in miss_keys:
+                # 같은 렌더 안의 중복 장면은 한 번만 인코딩
+                clip_paths.append(str(cache.path_for(key)))
+                continue
+            cached = cache.get(key)
+            if cached is None:
+                frame = render_frame(idx)
+                H, W = frame.shape[:2]
+                still_path = Path(work_dir) / f"scene_{idx:04d}.png"
+                save_still(frame, still_path)
+                jobs.append(([(str(still_path), duration)], str(Path(work_dir) / f"scene_{idx:04d}.mp4"),
+                             profile, stills_filter(W, H, profile), None, False))
+                miss_keys.append(key)
+                cached = str(cache.path_for(key))
+            clip_paths.append(cached)
+
+        if workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+                encoded = list(pool.map(_encode_chunk, jobs))
+        else:
+            encoded = [_encode_chunk(job) for job in jobs]
+        for key, clip in zip(miss_keys, encoded):
+            cache.put(key, clip)
+        print(f"🗂️ 장면 캐시: {len(scenes) - len(jobs)}개 재사용, {len(jobs)}개 인코딩")
+
+        list_path = Path(work_dir) / "scenes.ffconcat"
+        write_concat_list([(p, None) for p in clip_paths], list_path)
+        args = ["-f", "concat", "-safe", "0", "-i", list_path]
+        if audio_path:
+            args += ["-i", audio_path, "-map", "0:v", "-map", "1:a"]
+        args += ["-c:v", "copy"]
+        if audio_path:
+            args += audio_codec_args(profile) + ["-shortest"]
+        args += ["-movflags", "+faststart", out_path]
+        run_ffmpeg(args)
+    # 연결이 끝난 뒤 정리 (이번 렌더의 클립은 방금 사용되어 가장 나중에 지워진다)
+    cache.prune()
+    return out_path
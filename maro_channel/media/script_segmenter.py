@@ -0,0 +1,55 @@
+import re
+from typing import List
+
+# TTS용 대본 분할
+# 생성된 대본을 문단(\n\n)과 문장 끝(., !, ?, … 및 뒤따르는 닫는 따옴표/괄호)에서 나눠
+# 문장 하나 = TTS 요청 하나로 만든다. 요청이 짧을수록 동시 합성/캐시 재사용/자막 타이밍이 정확해진다.
+
+# TTS 요청 하나의 최대 글자 수 (OpenAI speech API 입력 한도는 4096자)
+DEFAULT_MAX_CHARS = 300
+
+_SENTENCE_END = re.compile(r"(?<=[.!?…])\s+|(?<=[.!?…][\"'”’)\]])\s+|\n+")
+# 긴 문장을 나눌 때 우선하는 위치 (쉼표/연결 어미 뒤 공백)
+_SOFT_BREAK = re.compile(r"[,，;:]\s+|\s+")
+
+def split_paragraphs(text: str) -> List[str]:
+    return [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+
+def split_sentences(paragraph: str) -> List[str]:
+    """문단을 문장 목록으로 분할 (문장부호가 없는 줄바꿈도 문장 경계로 본다)"""
+    return [s.strip() for s in _SENTENCE_END.split(paragraph) if s.strip()]
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    """max_chars보다 긴 문장을 나눔
+
+    한도 안 뒤쪽 절반에 쉼표가 있으면 마지막 쉼표 뒤, 없으면 마지막 공백, 둘 다 없으면 글자 단위로 자른다.
+    """
+    pieces = []
+    while len(sentence) > max_chars:
+        comma = space = 0
+        for m in _SOFT_BREAK.finditer(sentence, 0, max_chars + 1):
+            if m.start() == 0:
+                continue
+            if sentence[m.start()] in " \t\n":
+                space = m.start()
+            else:
+                comma = m.end()
+        cut = comma if comma > max_chars // 2 else (space or comma)
+        if cut <= 0:
+            cut = max_chars
+        pieces.append(sentence[:cut].strip())
+        sentence = sentence[cut:].strip()
+    if sentence:
+        pieces.append(sentence)
+    return pieces
+
+def segment_script(text: str, max_chars: int = DEFAULT_MAX_CHARS) -> List[dict]:
+    """대본을 TTS 구간 [{"text", "paragraph"}] 목록으로 분할
+
+    paragraph는 구간이 속한 문단 번호(0부터)로, 문단 단위로 배치하는 레이아웃에서 쓴다.
+    """
+    segments = []
+    for p_idx, paragraph in enumerate(split_paragraphs(text)):
+        for sentence in split_sentences(paragraph):
+            segments += [{"text": piece, "paragraph": p_idx} for piece in _split_long(sentence, max_chars)]
+    return segments
@@ -0,0 +1,149 @@
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional
+from PIL import ImageColor
+from ffmpeg_encode import run_ffmpeg
+from compositor import resolve_position
+from text_render import layout_text, load_font, find_korean_font
+from video_maker import build_text_layout
+
+# ASS 자막 생성
+# 텍스트 레이아웃(build_text_layout)을 스타일/색/페이드/위치 태그가 들어간 ASS로 변환한다.
+# 렌더 시에는 ffmpeg ass 필터(libass)로 번인하거나 소프트 자막 트랙으로 붙인다.
+# 줄바꿈은 다른 렌더 경로와 같은 layout_text 결과를 쓰고 libass 자동 줄바꿈은 끈다(\q2).
+
+TEXT_FADE_MS = 500
+# 폰트를 찾지 못했을 때 libass(fontconfig)에 요청할 글꼴 이름
+FALLBACK_FONT_NAME = "Noto Sans CJK KR"
+
+# 콘텐츠 타입별 자막 스타일 (외곽선/그림자 두께, 굵게)
+CONTENT_STYLES = {
+    "title": {"outline": 2, "shadow": 1, "bold": True},
+    "daily_comfort": {"outline": 2, "shadow": 1, "bold": False},
+    "healing_sound": {"outline": 1, "shadow": 0, "bold": False},
+    "overcome_story": {"outline": 2, "shadow": 1, "bold": False},
+    "custom_comfort": {"outline": 2, "shadow": 1, "bold": False},
+}
+
+def ass_color(color: str, alpha: Optional[int] = None) -> str:
+    """색 이름/hex를 ASS 색으로 변환 (태그용 &HBBGGRR&, alpha를 주면 스타일용 &HAABBGGRR)"""
+    r, g, b = ImageColor.getrgb(color)[:3]
+    if alpha is None:
+        return f"&H{b:02X}{g:02X}{r:02X}&"
+    return f"&H{alpha:02X}{b:02X}{g:02X}{r:02X}"
+
+def ass_time(seconds: float) -> str:
+    """초를 ASS 시각(H:MM:SS.cc)으로 변환"""
+    cs = int(round(max(seconds, 0.0) * 100))
+    return f"{cs // 360000}:{cs // 6000 % 60:02d}:{cs // 100 % 60:02d}.{cs % 100:02d}"
+
+def escape_ass_text(text: str) -> str:
+    """대사 본문에서 태그로 해석되는 문자 이스케이프"""
+    return text.replace("\\", "\\\\").replace("{", "\\{").replace("}", "\\}")
+
+def font_name(font_path: Optional[str]) -> str:
+    """폰트 파일의 패밀리 이름 (libass는 파일 경로가 아니라 이름으로 찾는다)"""
+    if font_path:
+        try:
+            return load_font(font_path, 32).getname()[0]
+        except (OSError, AttributeError):
+            pass
+    return FALLBACK_FONT_NAME
+
+@lru_cache(maxsize=16)
+def _height_per_em(font_path: str) -> float:
+    """글꼴의 (ascent + descent) / em 비율"""
+    ascent, descent = load_font(font_path, 1000).getmetrics()
+    return (ascent + descent) / 1000
+
+def ass_font_size(fontsize: int, font_path: Optional[str]) -> float:
+    """Pillow 글꼴 크기(em)를 libass \\fs 값으로 변환
+
+    libass는 \\fs를 em이 아니라 ascent + descent 높이로 해석하므로, 그대로 쓰면 글자가 작아지고
+    줄 상단 기준 \\pos가 아래로 밀린다. 같은 em 크기가 되도록 그 비율만큼 키운다.
+    """
+    if not font_path:
+        return fontsize
+    return round(fontsize * _height_per_em(font_path), 2)
+
+def _style_line(name: str, fontname: str, style: Dict) -> str:
+    return (f"Style: {name},{fontname},32,&H00FFFFFF,&H00FFFFFF,&H80000000,&H80000000,"
+            f"{-1 if style['bold'] else 0},0,0,0,100,100,0,0,1,{style['outline']},{style['shadow']},7,0,0,0,1")
+
+def build_ass(layout: List[dict], W: int, H: int, content_type: str = "daily_comfort",
+              font_path: Optional[str] = None) -> str:
+    """레이아웃 항목을 ASS 문서 문자열로 변환
+
+    첫 항목(제목)은 title 스타일, 나머지는 콘텐츠 타입 스타일을 쓴다.
+    항목마다 줄 단위 대사로 나누고 \\pos/\\an으로 다른 렌더 경로와 같은 좌표에 배치한다.
+    """
+    font_path = font_path or find_korean_font()
+    fontname = font_name(font_path)
+    body_style = content_type if content_type in CONTENT_STYLES else "custom_comfort"
+    lines = [
+        "[Script Info]",
+        "ScriptType: v4.00+",
+        f"PlayResX: {W}",
+        f"PlayResY: {H}",
+        "WrapStyle: 2",
+        "ScaledBorderAndShadow: yes",
+        "",
+        "[V4+ Styles]",
+        "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, "
+        "Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, "
+        "Alignment, MarginL, MarginR, MarginV, Encoding",
+        _style_line("title", fontname, CONTENT_STYLES["title"]),
+        _style_line(body_style, fontname, CONTENT_STYLES[body_style]),
+        "",
+        "[Events]",
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text",
+    ]
+    for idx, item in enumerate(layout):
+        start, end = item["start"], item["start"] + item["duration"]
+        if end <= start:
+            continue
+        fade = int(min(TEXT_FADE_MS, (end - start) * 500))
+        placed, height = layout_text(item["text"], item["fontsize"], item["box_width"], item["align"], font_path)
+        bx, by = resolve_position(item["position"], item["box_width"], height, W, H)
+        if item["align"] in ("center", "Center"):
+            an, ax = 8, bx + item["box_width"] // 2
+        elif item["align"] in ("right", "East"):
+            an, ax = 9, bx + item["box_width"]
+        else:
+            an, ax = 7, bx
+        tags = (f"\\an{an}\\q2\\fs{ass_font_size(item['fontsize'], font_path):g}\\1c{ass_color(item['color'])}"
+                f"\\fad({fade},{fade})")
+        for line, x, y in placed:
+            if not line:
+                continue
+            px = int(bx + x) if an == 7 else int(ax)
+            lines.append(f"Dialogue: 0,{ass_time(start)},{ass_time(end)},{'title' if idx == 0 else body_style},,"
+                         f"0,0,0,,{{{tags}\\pos({px},{int(by + y)})}}{escape_ass_text(line)}")
+    return "\n".join(lines) + "\n"
+
+def write_ass(content: Dict, W: int, H: int, ass_path: str, mode: str = "landscape",
+              font_path: Optional[str] = None) -> str:
+    """콘텐츠 dict의 텍스트 레이아웃을 ASS 파일로 저장"""
+    layout = build_text_layout(content, W, H, mode)
+    Path(ass_path).write_text(build_ass(layout, W, H, content.get("type", "daily_comfort"), font_path),
+                              encoding="utf-8")
+    return ass_path
+
+def ass_filter(ass_path: str, font_path: Optional[str] = None) -> str:
+    """ASS 번인 필터 문자열 (폰트 파일이 있는 디렉토리를 libass 검색 경로에 추가)"""
+    from ffmpeg_graph import escape_filter_value
+    font_path = font_path or find_korean_font()
+    value = f"ass=filename='{escape_filter_value(Path(ass_path).resolve().as_posix())}'"
+    if font_path:
+        value += f":fontsdir='{escape_filter_value(Path(font_path).resolve().parent.as_posix())}'"
+    return value
+
+def attach_subtitles(video_path: str, ass_path: str, out_path: str) -> str:
+    """영상/오디오를 재인코딩하지 않고 자막을 소프트 트랙으로 추가
+
+    MKV는 ASS 스타일을 그대로 유지하고, MP4는 mov_text로 변환된다 (스타일/위치 정보 손실).
+    """
+    codec = "ass" if Path(out_path).suffix.lower() == ".mkv" else "mov_text"
+    run_ffmpeg(["-i", video_path, "-i", ass_path, "-map", "0", "-map", "1:s", "-c", "copy",
+                "-c:s", codec, "-metadata:s:s:0", "language=kor", out_path])
+    return out_path
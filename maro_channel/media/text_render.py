@@ -0,0 +1,126 @@
+import os
+import platform
+from functools import lru_cache
+from typing import List, Optional, Tuple
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont, ImageColor
+
+# Pillow 기반 텍스트 래스터라이저
+# TextClip(method="caption")은 문장마다 ImageMagick 프로세스를 띄우고 한글을
+# 자주 깨뜨린다. 여기서는 Pillow로 직접 그려 RGBA 배열을 반환하고,
+# 같은 파라미터의 결과는 LRU 캐시로 재사용한다.
+
+FONT_CANDIDATES = {
+    "Windows": [
+        "C:/Windows/Fonts/malgun.ttf",      # 맑은 고딕
+        "C:/Windows/Fonts/gulim.ttc",       # 굴림
+        "C:/Windows/Fonts/batang.ttc",      # 바탕
+    ],
+    "Darwin": [
+        "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+        "/Library/Fonts/NanumGothic.ttf",
+    ],
+    "Linux": [
+        "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+        "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+        "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+    ],
+}
+
+def has_hangul(font_path: str) -> bool:
+    """폰트에 한글 글리프가 있는지 ("가"가 글리프 없음(.notdef) 모양과 다르게 그려지는지)"""
+    try:
+        font = ImageFont.truetype(font_path, 32)
+    except OSError:
+        return False
+    # U+0378은 미할당 코드포인트라 어느 폰트에서나 .notdef로 그려진다
+    hangul, missing = font.getmask("가"), font.getmask("\u0378")
+    return hangul.getbbox() is not None and (hangul.size != missing.size or bytes(hangul) != bytes(missing))
+
+@lru_cache(maxsize=1)
+def find_korean_font() -> Optional[str]:
+    """사용 가능한 한글 폰트 경로 (MARO_FONT_PATH 환경변수 우선, 한글 글리프가 없는 폰트는 제외)"""
+    env_font = os.getenv("MARO_FONT_PATH")
+    candidates = ([env_font] if env_font else []) + FONT_CANDIDATES.get(platform.system(), FONT_CANDIDATES["Linux"])
+    for font_path in candidates:
+        if os.path.exists(font_path) and has_hangul(font_path):
+            return font_path
+        if font_path == env_font:
+            print(f"⚠️ MARO_FONT_PATH 폰트를 쓸 수 없거나 한글 글리프가 없음: {env_font}")
+    return None
+
+@lru_cache(maxsize=32)
+def load_font(font_path: Optional[str], fontsize: int):
+    if font_path:
+        try:
+            return ImageFont.truetype(font_path, fontsize)
+        except OSError:
+            print(f"⚠️ 폰트 로드 실패, 기본 폰트 사용: {font_path}")
+    try:
+        return ImageFont.load_default(size=fontsize)
+    except TypeError:  # Pillow < 10.1
+        return ImageFont.load_default()
+
+def wrap_text(text: str, font, max_width: int) -> List[str]:
+    """단어 단위 줄바꿈 (한 단어가 너무 길면 글자 단위로 분할)"""
+    lines = []
+    for paragraph in text.split("\n"):
+        current = ""
+        for word in paragraph.split():
+            candidate = f"{current} {word}" if current else word
+            if font.getlength(candidate) <= max_width:
+                current = candidate
+                continue
+            if current:
+                lines.append(current)
+            current = ""
+            for ch in word:
+                if current and font.getlength(current + ch) > max_width:
+                    lines.append(current)
+                    current = ""
+                current += ch
+        lines.append(current)
+    return lines
+
+@lru_cache(maxsize=256)
+def layout_text(text: str, fontsize: int, box_width: int, align: str = "center",
+                font_path: Optional[str] = None, line_spacing: float = 1.25) -> Tuple[Tuple[Tuple[str, float, int], ...], int]:
+    """줄바꿈과 정렬 결과 ((줄, x, y), ...)와 전체 높이 계산
+
+    Pillow 래스터라이저와 ffmpeg drawtext 백엔드가 같은 배치를 쓰도록 공유한다.
+    """
+    font = load_font(font_path or find_korean_font(), fontsize)
+    lines = wrap_text(text, font, box_width)
+    ascent, descent = font.getmetrics()
+    line_height = int((ascent + descent) * line_spacing)
+    placed = []
+    for i, line in enumerate(lines):
+        line_width = font.getlength(line)
+        if align in ("center", "Center"):
+            x = (box_width - line_width) / 2
+        elif align in ("right", "East"):
+            x = box_width - line_width
+        else:  # left, West
+            x = 0
+        placed.append((line, x, i * line_height))
+    return tuple(placed), max(line_height * len(lines), 1)
+
+@lru_cache(maxsize=256)
+def render_text(text: str, fontsize: int, box_width: int, align: str = "center", color: str = "white",
+                font_path: Optional[str] = None, line_spacing: float = 1.25) -> np.ndarray:
+    """텍스트를 box_width 폭으로 줄바꿈해 RGBA (h, box_width, 4) uint8 배열로 반환
+
+    결과는 캐시되어 공유되므로 읽기 전용이다.
+    """
+    font = load_font(font_path or find_korean_font(), fontsize)
+    lines, height = layout_text(text, fontsize, box_width, align, font_path, line_spacing)
+
+    img = Image.new("RGBA", (box_width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    fill = ImageColor.getrgb(color)
+    for line, x, y in lines:
+        draw.text((x, y), line, font=font, fill=fill)
+
+    arr = np.asarray(img)
+    arr.setflags(write=False)
+    return arr
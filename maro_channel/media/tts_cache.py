@@ -0,0 +1,89 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, Optional
+
+# 콘텐츠 주소 기반 TTS 캐시
+# (모델, 목소리, 속도, 정규화한 문장)의 해시를 키로 인코딩된 MP3와 측정한 길이를 저장한다.
+# 캐시 적중 시에는 API 호출도 디코딩도 없이 파일 복사와 JSON 읽기만 한다.
+
+TTS_CACHE_VERSION = 1
+
+def normalize_text(text: str) -> str:
+    """공백/유니코드 정규화 (줄바꿈이나 공백 차이만 있는 문장은 같은 키)"""
+    return unicodedata.normalize("NFC", " ".join(text.split()))
+
+def tts_key(model: str, voice: str, speed: float, text: str) -> str:
+    payload = json.dumps({"model": model, "voice": voice, "speed": float(speed), "text": normalize_text(text),
+                          "version": TTS_CACHE_VERSION}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class TTSCache:
+    """TTS 키 → MP3 + 메타데이터(JSON: duration, text) 디렉토리 캐시
+
+    max_bytes를 주면 prune() 시 가장 오래 사용되지 않은 항목부터 지운다.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: Optional[int] = None):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()  # 동시 합성 시 적중/미스 집계용
+
+    def _count(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def path_for(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.mp3"
+
+    def get(self, key: str) -> Optional[Dict]:
+        """적중하면 {"file": 캐시 MP3 경로, "duration": 초} (디코딩 없음)"""
+        path = self.path_for(key)
+        try:
+            meta = json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._count(False)
+            return None
+        if not path.exists():
+            self._count(False)
+            return None
+        os.utime(path)  # prune()가 최근 사용 순으로 정리하도록 갱신
+        self._count(True)
+        return {"file": str(path), "duration": meta["duration"]}
+
+    def put(self, key: str, audio_path: str, duration: float, text: str = "") -> str:
+        """오디오를 캐시에 복사하고 메타데이터 기록 (임시 파일 후 rename)"""
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        shutil.copyfile(audio_path, tmp_path)
+        os.replace(tmp_path, path)
+        meta_tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.json.tmp")
+        meta_tmp.write_text(json.dumps({"duration": duration, "text": text}, ensure_ascii=False), encoding="utf-8")
+        # 메타데이터를 마지막에 기록해 get()이 완성된 항목만 보게 한다
+        os.replace(meta_tmp, path.with_suffix(".json"))
+        return str(path)
+
+    def prune(self, max_bytes: Optional[int] = None):
+        """전체 크기가 max_bytes를 넘으면 가장 오래 사용되지 않은 항목부터 삭제"""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        if max_bytes is None:
+            return
+        entries = sorted(self.cache_dir.glob("*/*.mp3"), key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in entries)
+        for path in entries:
+            if total <= max_bytes:
+                break
+            total -= path.stat().st_size
+            path.with_suffix(".json").unlink(missing_ok=True)
+            path.unlink(missing_ok=True)
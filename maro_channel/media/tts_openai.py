@@ -1,53 +1,158 @@
 import io
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 from pydub import AudioSegment
 from openai import OpenAI
-from config import OPENAI_API_KEY, OPENAI_TTS_MODEL, OPENAI_TTS_VOICE
+from config import (OPENAI_API_KEY, OPENAI_TTS_MODEL, OPENAI_TTS_VOICE, OPENAI_TTS_SPEED,
+                    TTS_CACHE_DIR, TTS_CACHE_MAX_MB, TTS_CONCURRENCY, TTS_REQUESTS_PER_MINUTE)
+from tts_cache import TTSCache, tts_key
+from media_info import audio_duration
+from mp3_splice import splice_mp3
 
 client = OpenAI(api_key=OPENAI_API_KEY)
 
-def synthesize_segments(segments: List[str], out_dir: str) -> List[dict]:
-    """Given list of text segments, synthesize each to MP3 and return timing info."""
-    Path(out_dir).mkdir(parents=True, exist_ok=True)
-    results = []
-    for idx, text in enumerate(segments, start=1):
-        filename = Path(out_dir) / f"seg_{idx:02d}.mp3"
-        success = False
+_default_cache = None
+
+def default_tts_cache() -> Optional[TTSCache]:
+    """설정(TTS_CACHE_DIR, TTS_CACHE_MAX_MB) 기반 공유 캐시 (TTS_CACHE_DIR가 비어 있으면 None)"""
+    global _default_cache
+    if _default_cache is None and TTS_CACHE_DIR:
+        _default_cache = TTSCache(TTS_CACHE_DIR, TTS_CACHE_MAX_MB * 1024 * 1024)
+    return _default_cache
+
+class TokenBucket:
+    """분당 요청 수 제한용 토큰 버킷 (스레드 안전)
+
+    capacity개까지 한 번에 보낼 수 있고, 이후에는 rate_per_minute 속도로 토큰이 찬다.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: int = 1):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 대기"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+# 같은 프로세스의 모든 TTS 호출(오전 업로드, 15시 백업 재실행 등)이 공유하는 API 요청 제한
+rate_limiter = TokenBucket(TTS_REQUESTS_PER_MINUTE, capacity=TTS_CONCURRENCY)
+
+# concat_audio가 넣는 무음 길이 (ms): 나레이션 앞 여백, 구간 사이 간격
+LEAD_IN_MS = 500
+SEGMENT_GAP_MS = 250
+
+def _synthesize(text: str, filename: Path):
+    """OpenAI speech API로 문장 하나를 MP3 파일로 합성"""
+    success = False
+    try:
+        # Streaming (if supported)
+        with client.audio.speech.with_streaming_response.create(
+            model=OPENAI_TTS_MODEL,
+            voice=OPENAI_TTS_VOICE,
+            speed=OPENAI_TTS_SPEED,
+            input=text
+        ) as resp:
+            resp.stream_to_file(filename)
+            success = True
+    except Exception:
+        pass
+    if not success:
+        # Fallback
+        audio = client.audio.speech.create(
+            model=OPENAI_TTS_MODEL,
+            voice=OPENAI_TTS_VOICE,
+            speed=OPENAI_TTS_SPEED,
+            input=text,
+            format="mp3",
+        )
+        # Try to_file, else read bytes
         try:
-            # Streaming (if supported)
-            with client.audio.speech.with_streaming_response.create(
-                model=OPENAI_TTS_MODEL,
-                voice=OPENAI_TTS_VOICE,
-                input=text
-            ) as resp:
-                resp.stream_to_file(filename)
-                success = True
+            audio.to_file(filename)
         except Exception:
-            pass
-        if not success:
-            # Fallback
-            audio = client.audio.speech.create(
-                model=OPENAI_TTS_MODEL,
-                voice=OPENAI_TTS_VOICE,
-                input=text,
-                format="mp3",
-            )
-            # Try to_file, else read bytes
-            try:
-                audio.to_file(filename)
-            except Exception:
-                b = audio.read() if hasattr(audio, "read") else audio
-                with open(filename, "wb") as f:
-                    f.write(b if isinstance(b, (bytes, bytearray)) else bytes(b))
-        seg = AudioSegment.from_file(filename)
-        results.append({"file": str(filename), "duration": seg.duration_seconds, "text": text})
+            b = audio.read() if hasattr(audio, "read") else audio
+            with open(filename, "wb") as f:
+                f.write(b if isinstance(b, (bytes, bytearray)) else bytes(b))
+
+def synthesize_segments(segments: List[str], out_dir: str, cache: Optional[TTSCache] = None,
+                        concurrency: Optional[int] = None) -> List[dict]:
+    """Given list of text segments, synthesize each to MP3 and return timing info.
+
+    같은 (모델, 목소리, 속도, 문장)은 TTS 캐시에서 API 호출/디코딩 없이 가져온다.
+    cache를 생략하면 설정 기반 공유 캐시를 사용한다.
+    캐시에 없는 구간은 최대 concurrency개(기본 TTS_CONCURRENCY)를 동시에 요청하고
+    분당 요청 수는 rate_limiter로 제한한다. 결과는 입력 순서를 유지한다.
+    """
+    Path(out_dir).mkdir(parents=True, exist_ok=True)
+    cache = cache or default_tts_cache()
+
+    def synthesize_one(idx: int, text: str) -> dict:
+        filename = Path(out_dir) / f"seg_{idx:02d}.mp3"
+        key = tts_key(OPENAI_TTS_MODEL, OPENAI_TTS_VOICE, OPENAI_TTS_SPEED, text)
+        cached = cache.get(key) if cache else None
+        if cached:
+            shutil.copyfile(cached["file"], filename)
+            return {"file": str(filename), "duration": cached["duration"], "text": text}
+        rate_limiter.acquire()
+        _synthesize(text, filename)
+        # 전체 디코딩 없이 MP3 헤더에서 길이 계산
+        duration = audio_duration(str(filename))
+        if cache:
+            cache.put(key, filename, duration, text)
+        return {"file": str(filename), "duration": duration, "text": text}
+
+    workers = max(1, min(concurrency or TTS_CONCURRENCY, len(segments)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(synthesize_one, range(1, len(segments) + 1), segments))
+    if cache:
+        cache.prune()
+        print(f"🗂️ TTS 캐시: 적중 {cache.hits} / 미스 {cache.misses}")
     return results
 
+def segment_timeline(parts: List[dict]) -> List[dict]:
+    """concat_audio 결과 나레이션 기준 구간별 시작/끝 시각 [{text, start, end}] (초)
+
+    MP3 프레임 연결이 기록한 실제 시작 시각(parts[i]["start"])이 있으면 그 시각을 쓴다.
+    """
+    timeline, t = [], LEAD_IN_MS / 1000.0
+    for p in parts:
+        start = p.get("start", t)
+        timeline.append({"text": p["text"], "start": round(start, 3), "end": round(start + p["duration"], 3)})
+        t += p["duration"] + SEGMENT_GAP_MS / 1000.0
+    return timeline
+
 def concat_audio(parts: List[dict], outfile: str) -> float:
-    audio = AudioSegment.silent(duration=500)  # lead-in
+    """구간 MP3를 앞 여백/구간 간격 무음과 함께 하나의 나레이션으로 연결하고 길이(초) 반환
+
+    MP3 프레임을 재인코딩 없이 이어 붙이고, 구간 형식이 서로 다르거나 해석할 수 없으면
+    pydub 디코딩/재인코딩으로 대체한다.
+    """
+    if parts and all(str(p["file"]).lower().endswith(".mp3") for p in parts):
+        try:
+            return splice_mp3(parts, str(outfile), LEAD_IN_MS / 1000.0, SEGMENT_GAP_MS / 1000.0)
+        except (ValueError, RuntimeError, OSError) as e:
+            print(f"⚠️ MP3 프레임 연결 실패, 재인코딩으로 연결: {e}")
+    return _concat_audio_pydub(parts, outfile)
+
+def _concat_audio_pydub(parts: List[dict], outfile: str) -> float:
+    audio = AudioSegment.silent(duration=LEAD_IN_MS)
     for p in parts:
         audio += AudioSegment.from_file(p["file"])
-        audio += AudioSegment.silent(duration=250)
+        audio += AudioSegment.silent(duration=SEGMENT_GAP_MS)
     audio.export(outfile, format="mp3")
     return len(audio) / 1000.0
@@ -1,47 +1,62 @@
-from moviepy.editor import (AudioFileClip, ImageClip, TextClip, CompositeVideoClip, ColorClip)
+from moviepy.editor import AudioFileClip, ImageClip
 from typing import List, Dict, Tuple
 from pathlib import Path
+from functools import lru_cache
 import srt, datetime
 import PIL
 import numpy as np
+from ffmpeg_encode import encode_stills
+from frame_sink import FFmpegFrameSink
+from encoding_profiles import get_profile, scale_filter
+from media_info import probe_duration
+from compositor import TimelineCompositor, Layer, resolve_position
+from text_render import render_text, find_korean_font
+from animated_bg import animation_for
+from ken_burns import ken_burns_for
 
 def parse_resolution(res: str) -> Tuple[int,int]:
     w,h = res.split("x")
     return int(w), int(h)
 
-def create_healing_background(W: int, H: int, duration: float, style: str = "calm"):
-    """힐링 스타일의 배경 생성"""
-    
+# 스타일별 배경 색상 (기본색, 강조색, 최대 강도)
+BACKGROUND_STYLES = {
+    "calm": {"base": (25, 35, 45), "accent": (100, 120, 140), "strength": 0.35},
+    "nature": {"base": (30, 50, 40), "accent": (60, 80, 60), "strength": 0.3},
+    "default": {"base": (40, 50, 60), "accent": (40, 50, 60), "strength": 0.0},
+}
+
+@lru_cache(maxsize=8)
+def healing_background_frame(W: int, H: int, style: str = "calm") -> np.ndarray:
+    """힐링 배경을 한 번에 계산한 RGB 프레임 (H, W, 3) uint8 배열
+
+    레이어를 겹쳐 합성하는 대신 방사형/선형 감쇠를 NumPy 브로드캐스팅으로
+    한 번에 계산한다. 결과는 캐시되어 공유되므로 수정하지 말 것.
+    """
+    spec = BACKGROUND_STYLES.get(style, BACKGROUND_STYLES["default"])
+    base = np.array(spec["base"], dtype=np.float32)
+    accent = np.array(spec["accent"], dtype=np.float32)
+
     if style == "calm":
-        # 차분한 그라데이션 배경
-        bg_base = ColorClip(size=(W, H), color=(25, 35, 45)).set_duration(duration)
-        
-        # 부드러운 원형 그라데이션 효과
-        center_x, center_y = W // 2, H // 2
-        radius = min(W, H) // 3
-        
-        # 중앙에서 밝아지는 효과
-        for i in range(0, radius, 10):
-            alpha = int(255 * (1 - i / radius) * 0.1)
-            circle = ColorClip(size=(i*2, i*2), color=(100, 120, 140, alpha)).set_duration(duration)
-            circle = circle.set_position((center_x - i, center_y - i))
-            bg_base = CompositeVideoClip([bg_base, circle])
-            
+        # 중앙에서 밝아지는 방사형 감쇠
+        radius = max(min(W, H) // 3, 1)
+        ys = (np.arange(H, dtype=np.float32) - H // 2)[:, None]
+        xs = (np.arange(W, dtype=np.float32) - W // 2)[None, :]
+        dist = np.sqrt(xs * xs + ys * ys)
+        weight = np.clip(1.0 - dist / radius, 0.0, 1.0) ** 2 * spec["strength"]
     elif style == "nature":
-        # 자연스러운 그라데이션
-        bg_base = ColorClip(size=(W, H), color=(30, 50, 40)).set_duration(duration)
-        
-        # 하단에서 위로 올라가는 그라데이션
-        for y in range(0, H, 20):
-            alpha = int(255 * (y / H) * 0.3)
-            line = ColorClip(size=(W, 20), color=(60, 80, 60, alpha)).set_duration(duration)
-            line = line.set_position((0, y))
-            bg_base = CompositeVideoClip([bg_base, line])
-            
-    else:  # default
-        bg_base = ColorClip(size=(W, H), color=(40, 50, 60)).set_duration(duration)
-    
-    return bg_base
+        # 하단으로 갈수록 짙어지는 선형 감쇠
+        weight = np.broadcast_to((np.arange(H, dtype=np.float32) / H)[:, None] * spec["strength"], (H, W))
+    else:
+        weight = np.zeros((H, W), dtype=np.float32)
+
+    frame = base + (accent - base) * weight[..., None]
+    frame = np.clip(frame + 0.5, 0, 255).astype(np.uint8)
+    frame.setflags(write=False)
+    return frame
+
+def create_healing_background(W: int, H: int, duration: float, style: str = "calm"):
+    """힐링 스타일의 배경 생성 (정적 ImageClip 한 장)"""
+    return ImageClip(healing_background_frame(W, H, style)).set_duration(duration)
 
 def build_srt(segments: List[dict], srt_path: str):
     subs = []
@@ -52,101 +67,260 @@ def build_srt(segments: List[dict], srt_path: str):
     with open(srt_path, "w", encoding="utf-8") as f:
         f.write(srt.compose(subs))
 
-def make_healing_video(audio_path: str, content: Dict, background_image: str, resolution: str, out_path: str, mode: str="landscape"):
-    """힐링 콘텐츠용 비디오 생성"""
-    W, H = parse_resolution(resolution)
-    
-    # 배경 이미지 사용 시도
-    if background_image and Path(background_image).exists():
+def with_narration_duration(content: Dict, audio_path: str) -> Dict:
+    """나레이션 실제 길이를 duration_seconds로 설정한 콘텐츠 사본
+
+    오디오가 없을 때만 기존 duration_seconds(기본 180초)를 사용한다.
+    """
+    if audio_path and Path(audio_path).exists():
         try:
-            bg = ImageClip(background_image).resize(newsize=(W,H)).set_duration(content.get("duration_seconds", 180))
-            print(f"✅ 배경 이미지 사용: {background_image}")
-        except Exception as e:
-            print(f"⚠️ 배경 이미지 로드 실패, 힐링 스타일 배경 사용: {e}")
-            bg = create_healing_background(W, H, content.get("duration_seconds", 180), "calm")
-    else:
-        print("🎨 힐링 스타일 배경 생성 중...")
-        bg = create_healing_background(W, H, content.get("duration_seconds", 180), "calm")
+            return dict(content, duration_seconds=probe_duration(audio_path))
+        except RuntimeError as e:
+            print(f"⚠️ 나레이션 길이 조회 실패, 기본 길이 사용: {e}")
+    return dict(content, duration_seconds=content.get("duration_seconds", 180))
+
+def body_text_style(content_type: str, index: int, W: int, H: int, mode: str = "landscape") -> Dict:
+    """콘텐츠 타입별 본문 텍스트 스타일 (fontsize, color, align, box_width, position)"""
+    shorts = mode == "shorts"
+    if content_type == "daily_comfort":
+        # 짧은 위로 - 큰 글씨로 중앙 배치
+        return {"fontsize": 48 if shorts else 36, "color": "white", "align": "center",
+                "box_width": W-160, "position": ("center", H//2)}
+    if content_type == "healing_sound":
+        return {"fontsize": 40 if shorts else 32, "color": "lightblue", "align": "center",
+                "box_width": W-160, "position": ("center", H//2)}
+    if content_type == "overcome_story":
+        # 극복 스토리 - 단계별로 아래로 쌓이는 왼쪽 정렬 문단
+        position = (80, 200 + index * 100) if mode=="landscape" else (80, 250 + index * 80)
+        return {"fontsize": 36 if shorts else 28, "color": "white", "align": "West",
+                "box_width": W-160, "position": position}
+    # custom_comfort - 깔끔한 텍스트 배치
+    return {"fontsize": 44 if shorts else 32, "color": "white", "align": "center",
+            "box_width": W-160, "position": ("center", H//2)}
+
+def build_text_layout(content: Dict, W: int, H: int, mode: str = "landscape") -> List[dict]:
+    """콘텐츠 타입별 텍스트 배치와 타이밍 계산
+
+    각 항목은 text, fontsize, color, align, box_width, position, start, duration을 가진다.
+    모든 렌더 경로가 이 레이아웃을 공유한다.
+    content["segments"]([{text, start, end, paragraph}], tts_openai.segment_timeline 결과)가 있으면
+    본문은 추정 길이 대신 실제 나레이션 구간 시각으로 배치한다 (문단 위치는 paragraph 기준).
+    """
+    total_duration = content.get("duration_seconds", 180)
 
     # 제목 (상단 중앙)
     title = content.get("title", "maro")
-    title_clip = TextClip(txt=title, fontsize=64 if mode=="shorts" else 54, color="white", 
-                         method="caption", size=(W-120, None), align="center")
     title_pos = ("center", 80) if mode=="landscape" else ("center", 80)
-    title_clip = title_clip.set_position(title_pos).set_start(0).set_duration(3.0)
+    layout = [{"text": title, "fontsize": 64 if mode=="shorts" else 54, "color": "white",
+               "align": "center", "box_width": W-120, "position": title_pos, "start": 0, "duration": 3.0}]
 
     # 콘텐츠 타입별 스타일링
     content_type = content.get("type", "daily_comfort")
-    
-    if content_type == "daily_comfort":
-        # 짧은 위로 - 큰 글씨로 중앙 배치
-        content_text = content.get("content", "")
-        content_clip = TextClip(txt=content_text, fontsize=48 if mode=="shorts" else 36, color="white", 
-                               method="caption", size=(W-160, None), align="center")
-        content_pos = ("center", H//2)
-        content_clip = content_clip.set_position(content_pos).set_start(3.0).set_duration(content.get("duration_seconds", 180) - 3.0)
-        
-        clips = [bg, title_clip, content_clip]
-        
+    content_text = content.get("content", "")
+    segments = content.get("segments")
+
+    if segments:
+        # 구간 텍스트는 낭독 시작부터 다음 구간 시작(마지막은 영상 끝)까지 표시
+        for i, seg in enumerate(segments):
+            end = segments[i + 1]["start"] if i + 1 < len(segments) else total_duration
+            style = body_text_style(content_type, seg.get("paragraph", i), W, H, mode)
+            layout.append(dict(text=seg["text"].strip(), **style,
+                               start=seg["start"], duration=max(end - seg["start"], 0.0)))
+
     elif content_type == "healing_sound":
-        # 힐링 사운드 - 부드러운 텍스트 애니메이션
-        content_text = content.get("content", "")
-        # 텍스트를 문장 단위로 분할
+        # 힐링 사운드 - 텍스트를 문장 단위로 분할
         sentences = content_text.split('.')
-        
-        clips = [bg, title_clip]
         current_time = 3.0
-        
+
         for i, sentence in enumerate(sentences):
             if sentence.strip():
-                sentence_clip = TextClip(txt=sentence.strip() + ".", fontsize=40 if mode=="shorts" else 32, 
-                                       color="lightblue", method="caption", size=(W-160, None), align="center")
-                sentence_pos = ("center", H//2)
                 duration = min(8.0, max(3.0, len(sentence) * 0.5))  # 문장 길이에 따른 지속시간
-                
-                sentence_clip = sentence_clip.set_position(sentence_pos).set_start(current_time).set_duration(duration)
-                clips.append(sentence_clip)
+                layout.append(dict(text=sentence.strip() + ".", **body_text_style(content_type, i, W, H, mode),
+                                   start=current_time, duration=duration))
                 current_time += duration + 1.0  # 1초 간격
-                
+
     elif content_type == "overcome_story":
         # 극복 스토리 - 단계별 텍스트 표시
-        content_text = content.get("content", "")
         paragraphs = content_text.split('\n\n')
-        
-        clips = [bg, title_clip]
         current_time = 3.0
-        
+
         for i, paragraph in enumerate(paragraphs):
             if paragraph.strip():
-                para_clip = TextClip(txt=paragraph.strip(), fontsize=36 if mode=="shorts" else 28, 
-                                   color="white", method="caption", size=(W-160, None), align="West")
-                para_pos = (80, 200 + i * 100) if mode=="landscape" else (80, 250 + i * 80)
                 duration = min(10.0, max(4.0, len(paragraph) * 0.3))
-                
-                para_clip = para_clip.set_position(para_pos).set_start(current_time).set_duration(duration)
-                clips.append(para_clip)
+                layout.append(dict(text=paragraph.strip(), **body_text_style(content_type, i, W, H, mode),
+                                   start=current_time, duration=duration))
                 current_time += duration + 0.5
-                
-    else:  # custom_comfort
-        # 맞춤형 위로 - 깔끔한 텍스트 배치
-        content_text = content.get("content", "")
-        content_clip = TextClip(txt=content_text, fontsize=44 if mode=="shorts" else 32, color="white", 
-                               method="caption", size=(W-160, None), align="center")
-        content_pos = ("center", H//2)
-        content_clip = content_clip.set_position(content_pos).set_start(3.0).set_duration(content.get("duration_seconds", 180) - 3.0)
-        
-        clips = [bg, title_clip, content_clip]
+
+    else:  # daily_comfort, custom_comfort
+        layout.append(dict(text=content_text, **body_text_style(content_type, 0, W, H, mode),
+                           start=3.0, duration=total_duration - 3.0))
+
+    # 나레이션 길이를 넘는 구간은 렌더링하지 않음
+    clamped = []
+    for item in layout:
+        if item["start"] < total_duration:
+            clamped.append(dict(item, duration=min(item["duration"], total_duration - item["start"])))
+    return clamped
+
+def text_layer(item: dict, W: int, H: int) -> Layer:
+    """레이아웃 항목을 Pillow로 래스터화해 위치/타이밍이 지정된 Layer로 변환"""
+    rgba = render_text(item["text"], item["fontsize"], item["box_width"], item["align"], item["color"])
+    h, w = rgba.shape[:2]
+    x, y = resolve_position(item["position"], w, h, W, H)
+    return Layer(rgba[..., :3], rgba[..., 3] / 255.0, x, y, item["start"], item["start"] + item["duration"])
+
+def plan_still_segments(layout: List[dict], total_duration: float) -> List[Tuple[float, float]]:
+    """화면 구성이 바뀌는 시점으로 타임라인을 (시작, 끝) 구간 목록으로 분할"""
+    bounds = {0.0, float(total_duration)}
+    for item in layout:
+        for t in (item["start"], item["start"] + item["duration"]):
+            if 0.0 < t < total_duration:
+                bounds.add(float(t))
+    bounds = sorted(bounds)
+    return [(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+
+def background_signature(background_image: str) -> Dict:
+    """배경 식별 정보 (이미지면 경로/수정시각/크기, 없으면 생성 배경 스타일)"""
+    if background_image and Path(background_image).exists():
+        st = Path(background_image).stat()
+        return {"image": str(Path(background_image).resolve()), "mtime": st.st_mtime, "size": st.st_size}
+    return {"style": "calm"}
+
+def describe_scene(layout: List[dict], active: Tuple[int, ...], background: Dict, W: int, H: int) -> Dict:
+    """정지 구간 하나의 화면 구성 입력 (장면 캐시 키용, 타이밍 제외)"""
+    texts = [{k: layout[i][k] for k in ("text", "fontsize", "color", "align", "box_width", "position")}
+             for i in active]
+    return {"resolution": [W, H], "background": background, "font": find_korean_font(), "texts": texts}
+
+def background_frame(background_image: str, W: int, H: int) -> np.ndarray:
+    """배경 이미지를 (W, H)로 맞춘 RGB 프레임 (없거나 실패하면 힐링 그라데이션)"""
+    # 배경 이미지 사용 시도
+    if background_image and Path(background_image).exists():
+        try:
+            bg = ImageClip(background_image).resize(newsize=(W,H))
+            print(f"✅ 배경 이미지 사용: {background_image}")
+            return np.asarray(bg.get_frame(0), dtype=np.uint8)
+        except Exception as e:
+            print(f"⚠️ 배경 이미지 로드 실패, 힐링 스타일 배경 사용: {e}")
+    else:
+        print("🎨 힐링 스타일 배경 생성 중...")
+    return healing_background_frame(W, H, "calm")
+
+def build_compositor(content: Dict, background_image: str, W: int, H: int, mode: str = "landscape",
+                     motion_fps: int = None, overlay_only: bool = False):
+    """배경과 텍스트 레이어를 한 번씩 래스터화한 합성기와 레이아웃 반환
+
+    비디오 렌더와 미리보기가 같은 코드를 사용하므로 미리보기 결과가 실제 출력과 일치한다.
+    motion_fps가 주어지고 Ken Burns 배경이 설정되어 있으면 배경이 프레임마다 움직인다.
+    overlay_only이면 배경 이미지를 디코딩하지 않는다 (배경을 ffmpeg가 만들고 overlay_at만 쓸 때).
+    """
+    # 텍스트는 한 번만 래스터화하고 구간 색인 합성기로 활성 레이어만 합성
+    layout = build_text_layout(content, W, H, mode)
+    layers = [text_layer(item, W, H) for item in layout]
+    if overlay_only:
+        return TimelineCompositor(np.zeros((H, W, 3), dtype=np.uint8), layers), layout
+    background = ken_burns_for(content, background_image, W, H, motion_fps) if motion_fps else None
+    if background is None:
+        background = background_frame(background_image, W, H)
+    return TimelineCompositor(background, layers), layout
+
+def make_healing_video(audio_path: str, content: Dict, background_image: str, resolution: str, out_path: str, mode: str="landscape",
+                       render_mode: str = "moviepy", workers: int = 1, profile=None, scene_cache=None,
+                       vfr: bool = False):
+    """힐링 콘텐츠용 비디오 생성
+
+    render_mode="stills"이면 구간별 정지 이미지를 한 번씩만 래스터화하고
+    ffmpeg concat demuxer(-tune stillimage)로 인코딩한다. workers > 1이면
+    구간 경계에서 나눈 청크를 병렬 인코딩한 뒤 스트림 복사로 연결한다.
+    render_mode="ffmpeg"이면 콘텐츠 전체를 ffmpeg 필터그래프 하나로 렌더링한다.
+    render_mode="ass"이면 같은 필터그래프에서 텍스트를 ASS 자막(libass)으로 번인한다.
+    render_mode="pipe"이면 합성 프레임을 ffmpeg stdin으로 바로 스트리밍한다.
+    profile은 인코딩 품질 단계 이름(draft/review/publish) 또는 설정 dict이다.
+    scene_cache(SceneCache)가 주어지면 stills 모드에서 반복 구간을 캐시 클립으로 재사용한다.
+    vfr이면 stills/pipe 모드에서 화면이 바뀔 때만 프레임을 넣는 가변 프레임레이트로 인코딩한다.
+    """
+    profile = get_profile(profile)
+    content = with_narration_duration(content, audio_path)
+    if render_mode in ("ffmpeg", "ass"):
+        from ffmpeg_graph import render_with_filtergraph
+        return render_with_filtergraph(audio_path, content, background_image, resolution, out_path, mode, profile,
+                                       text_renderer="ass" if render_mode == "ass" else "drawtext")
+
+    W, H = parse_resolution(resolution)
+    total_duration = content.get("duration_seconds", 180)
+    # 프레임 단위 렌더(pipe/moviepy)만 배경 움직임을 파이썬에서 생성
+    motion_fps = profile["fps"] if render_mode in ("pipe", "moviepy") else None
+    # stills 모드의 움직이는 배경(애니메이션/Ken Burns)은 ffmpeg가 만들고 합성기는 텍스트 오버레이만 만든다
+    animation = animation_for(content) if render_mode == "stills" else None
+    ken_burns = (ken_burns_for(content, background_image, W, H, profile["fps"])
+                 if render_mode == "stills" and not animation else None)
+    compositor, layout = build_compositor(content, background_image, W, H, mode, motion_fps,
+                                          overlay_only=bool(animation or ken_burns))
+
+    if render_mode == "stills":
+        # 구간마다 한 장씩만 합성하고 ffmpeg로 인코딩
+        segments = plan_still_segments(layout, total_duration)
+        audio = audio_path if audio_path and Path(audio_path).exists() else None
+        if audio is None:
+            print(f"⚠️ 오디오 파일 없음, 무음 비디오 생성: {audio_path}")
+        if animation or ken_burns:
+            # 배경이 매 프레임 바뀌므로 한 번의 ffmpeg overlay로 인코딩 (장면 캐시/청크 병렬/VFR 불가)
+            ignored = [name for name, used in (("scene_cache", scene_cache is not None), ("workers", workers > 1),
+                                               ("vfr", vfr)) if used]
+            if ignored:
+                print(f"⚠️ 움직이는 배경은 단일 ffmpeg overlay로 인코딩, 무시한 옵션: {', '.join(ignored)}")
+        if animation:
+            # 움직이는 배경은 루프 클립으로 한 번만 렌더링하고 텍스트만 구간별 RGBA로 올림
+            from animated_bg import render_background_loop
+            loop = render_background_loop(W, H, animation, profile, background_image)
+            overlays = [(compositor.overlay_at(start), end - start) for start, end in segments]
+            return encode_stills(overlays, audio, out_path, profile=profile,
+                                 background_video=(["-stream_loop", "-1", "-i", loop], None))
+        if ken_burns:
+            # 사진 확대/이동은 ffmpeg zoompan이 만들고 텍스트만 구간별 RGBA로 올림
+            overlays = [(compositor.overlay_at(start), end - start) for start, end in segments]
+            return encode_stills(overlays, audio, out_path, profile=profile,
+                                 background_video=(["-i", background_image], ken_burns.zoompan_filter()))
+        if scene_cache is not None:
+            from scene_cache import encode_scenes
+            background = background_signature(background_image)
+            scenes = [describe_scene(layout, compositor.active_at(start), background, W, H) for start, _ in segments]
+            return encode_scenes(scenes, [end - start for start, end in segments],
+                                 lambda idx: compositor.frame_at(segments[idx][0]),
+                                 audio, out_path, scene_cache, profile=profile, workers=workers)
+        stills = [(compositor.frame_at(start), end - start) for start, end in segments]
+        return encode_stills(stills, audio, out_path, profile=profile, workers=workers, vfr=vfr)
+
+    if animation_for(content):
+        print(f"⚠️ 배경 애니메이션은 stills/ffmpeg 렌더에서만 지원, 정지 배경 사용: {render_mode}")
+
+    if render_mode == "pipe":
+        # 프레임마다 합성해 원시 RGB로 ffmpeg 한 프로세스에 전달 (인코딩 + 먹싱 한 번)
+        fps = profile["fps"]
+        audio = audio_path if audio_path and Path(audio_path).exists() else None
+        with FFmpegFrameSink(out_path, W, H, fps=fps, audio_path=audio, pix_fmt="rgb24", profile=profile,
+                             vfr=vfr) as sink:
+            for i in range(int(round(total_duration * fps))):
+                sink.write(compositor.next_frame(i / fps))
+        return out_path
 
     # 오디오 추가
+    final_clip = compositor.to_clip(total_duration)
     try:
         audio = AudioFileClip(audio_path)
-        final_clip = CompositeVideoClip(clips).set_audio(audio)
+        final_clip = final_clip.set_audio(audio)
     except Exception as e:
         print(f"⚠️ 오디오 로드 실패: {e}")
-        final_clip = CompositeVideoClip(clips)
 
     # 비디오 생성
-    final_clip.write_videofile(out_path, fps=30, codec="libx264", audio_codec="aac", preset="medium")
+    ffmpeg_params = ["-crf", str(profile["crf"]), "-g", str(profile["gop"]), "-pix_fmt", "yuv420p"]
+    if profile.get("tune"):
+        ffmpeg_params += ["-tune", profile["tune"]]
+    if scale_filter(W, H, profile):
+        ffmpeg_params += ["-vf", scale_filter(W, H, profile)]
+    final_clip.write_videofile(out_path, fps=profile["fps"], codec="libx264", audio_codec="aac",
+                               audio_bitrate=profile["audio_bitrate"], preset=profile["preset"],
+                               ffmpeg_params=ffmpeg_params)
     return out_path
 
 def make_video(audio_path: str, timeline: List[dict], background_image: str, resolution: str, title: str, out_path: str, mode: str="landscape"):
@@ -1,15 +1,33 @@
 import os, datetime
 from pathlib import Path
-from config import (CHANNEL_NAME, CHANNEL_SLOGAN, CHANNEL_TITLE_PREFIX,
-                    OUTPUT_DIR, BACKGROUND_IMAGE, VIDEO_RESOLUTION,
+from config import (CHANNEL_NAME, CHANNEL_SLOGAN, CHANNEL_TITLE_PREFIX, TTS_MAX_CHARS,
+                    OUTPUT_DIR, BACKGROUND_IMAGE, VIDEO_RESOLUTION, ENCODING_PROFILE, RENDER_BACKEND, USE_BUMPERS,
+                    BACKGROUND_ANIMATION, BACKGROUND_MOTION,
                     YOUTUBE_CLIENT_SECRETS_FILE, CONTENT_TYPES)
 from comfort_generator import ComfortContentGenerator
-from tts_openai import synthesize_segments, concat_audio
-from video_maker import make_healing_video
+from tts_openai import synthesize_segments, concat_audio, segment_timeline
+from script_segmenter import segment_script
+from renderer import render, calibrate
 from thumbnail_gen import generate_healing_thumbnail
 from uploader_youtube import get_service, upload_video, get_or_create_playlist, add_video_to_playlist
 from utils import ensure_dir
 
+# 인트로/아웃트로 범퍼에 들어가는 채널 정보
+CHANNEL_BUMPERS = {"name": CHANNEL_NAME, "slogan": CHANNEL_SLOGAN} if USE_BUMPERS else None
+
+def narrate(content, out_dir):
+    """대본을 문장 단위로 나눠 TTS 합성 후 narration.mp3로 연결하고 경로 반환
+
+    구간별 실제 시작/끝 시각은 자막 배치용으로 content["segments"]에 기록한다.
+    """
+    script = segment_script(content["content"], TTS_MAX_CHARS)
+    parts = synthesize_segments([seg["text"] for seg in script], out_dir / "audio")
+    narration = out_dir / "narration.mp3"
+    concat_audio(parts, narration)
+    content["segments"] = [dict(timing, paragraph=seg["paragraph"])
+                           for timing, seg in zip(segment_timeline(parts), script)]
+    return narration
+
 def create_daily_comfort():
     """오늘의 위로 콘텐츠 생성 (매일)"""
     print("🌅 오늘의 위로 콘텐츠 생성 중...")
@@ -22,20 +40,21 @@ def create_daily_comfort():
     ensure_dir(out_dir)
     
     # TTS 생성
-    segments = [content["content"]]
-    parts = synthesize_segments(segments, out_dir / "audio")
-    concat_audio(parts, out_dir / "narration.mp3")
+    narrate(content, out_dir)
     
-    # 콘텐츠에 지속시간 정보 추가
-    content["duration_seconds"] = parts[0]["duration"] + 3.0  # 3초 제목 시간 추가
+    # 영상 길이는 렌더러가 narration.mp3 실제 길이로 맞춘다
     
     # 썸네일 생성
     thumb_path = str(out_dir / "thumbnail.jpg")
     generate_healing_thumbnail(thumb_path, content["title"], content["type"], content["tags"])
     
     # 비디오 생성
+    content.setdefault("background_animation", BACKGROUND_ANIMATION)
+    content.setdefault("background_motion", BACKGROUND_MOTION)
     video_path = str(out_dir / "daily_comfort.mp4")
-    make_healing_video(str(out_dir / "narration.mp3"), content, BACKGROUND_IMAGE, VIDEO_RESOLUTION, video_path)
+    render(content, str(out_dir / "narration.mp3"), ENCODING_PROFILE, out_path=video_path,
+           background_image=BACKGROUND_IMAGE, resolution=VIDEO_RESOLUTION, backend=RENDER_BACKEND,
+           bumpers=CHANNEL_BUMPERS)
     
     return content, video_path, thumb_path
 
@@ -51,20 +70,21 @@ def create_healing_sound():
     ensure_dir(out_dir)
     
     # TTS 생성
-    segments = [content["content"]]
-    parts = synthesize_segments(segments, out_dir / "audio")
-    concat_audio(parts, out_dir / "narration.mp3")
+    narrate(content, out_dir)
     
-    # 콘텐츠에 지속시간 정보 추가
-    content["duration_seconds"] = parts[0]["duration"] + 3.0
+    # 영상 길이는 렌더러가 narration.mp3 실제 길이로 맞춘다
     
     # 썸네일 생성
     thumb_path = str(out_dir / "thumbnail.jpg")
     generate_healing_thumbnail(thumb_path, content["title"], content["type"], content["tags"])
     
     # 비디오 생성
+    content.setdefault("background_animation", BACKGROUND_ANIMATION)
+    content.setdefault("background_motion", BACKGROUND_MOTION)
     video_path = str(out_dir / "healing_sound.mp4")
-    make_healing_video(str(out_dir / "narration.mp3"), content, BACKGROUND_IMAGE, VIDEO_RESOLUTION, video_path)
+    render(content, str(out_dir / "narration.mp3"), ENCODING_PROFILE, out_path=video_path,
+           background_image=BACKGROUND_IMAGE, resolution=VIDEO_RESOLUTION, backend=RENDER_BACKEND,
+           bumpers=CHANNEL_BUMPERS)
     
     return content, video_path, thumb_path
 
@@ -80,20 +100,21 @@ def create_overcome_story():
     ensure_dir(out_dir)
     
     # TTS 생성
-    segments = [content["content"]]
-    parts = synthesize_segments(segments, out_dir / "audio")
-    concat_audio(parts, out_dir / "narration.mp3")
+    narrate(content, out_dir)
     
-    # 콘텐츠에 지속시간 정보 추가
-    content["duration_seconds"] = parts[0]["duration"] + 3.0
+    # 영상 길이는 렌더러가 narration.mp3 실제 길이로 맞춘다
     
     # 썸네일 생성
     thumb_path = str(out_dir / "thumbnail.jpg")
     generate_healing_thumbnail(thumb_path, content["title"], content["type"], content["tags"])
     
     # 비디오 생성
+    content.setdefault("background_animation", BACKGROUND_ANIMATION)
+    content.setdefault("background_motion", BACKGROUND_MOTION)
     video_path = str(out_dir / "overcome_story.mp4")
-    make_healing_video(str(out_dir / "narration.mp3"), content, BACKGROUND_IMAGE, VIDEO_RESOLUTION, video_path)
+    render(content, str(out_dir / "narration.mp3"), ENCODING_PROFILE, out_path=video_path,
+           background_image=BACKGROUND_IMAGE, resolution=VIDEO_RESOLUTION, backend=RENDER_BACKEND,
+           bumpers=CHANNEL_BUMPERS)
     
     return content, video_path, thumb_path
 
@@ -109,20 +130,21 @@ def create_custom_comfort():
     ensure_dir(out_dir)
     
     # TTS 생성
-    segments = [content["content"]]
-    parts = synthesize_segments(segments, out_dir / "audio")
-    concat_audio(parts, out_dir / "narration.mp3")
+    narrate(content, out_dir)
     
-    # 콘텐츠에 지속시간 정보 추가
-    content["duration_seconds"] = parts[0]["duration"] + 3.0
+    # 영상 길이는 렌더러가 narration.mp3 실제 길이로 맞춘다
     
     # 썸네일 생성
     thumb_path = str(out_dir / "thumbnail.jpg")
     generate_healing_thumbnail(thumb_path, content["title"], content["type"], content["tags"])
     
     # 비디오 생성
+    content.setdefault("background_animation", BACKGROUND_ANIMATION)
+    content.setdefault("background_motion", BACKGROUND_MOTION)
     video_path = str(out_dir / "custom_comfort.mp4")
-    make_healing_video(str(out_dir / "narration.mp3"), content, BACKGROUND_IMAGE, VIDEO_RESOLUTION, video_path)
+    render(content, str(out_dir / "narration.mp3"), ENCODING_PROFILE, out_path=video_path,
+           background_image=BACKGROUND_IMAGE, resolution=VIDEO_RESOLUTION, backend=RENDER_BACKEND,
+           bumpers=CHANNEL_BUMPERS)
     
     return content, video_path, thumb_path
 
@@ -212,5 +234,8 @@ if __name__ == "__main__":
     
     if len(sys.argv) > 1 and sys.argv[1] == "test":
         run_once()
+    elif len(sys.argv) > 1 and sys.argv[1] == "calibrate":
+        # 이 호스트의 렌더 백엔드 속도 측정 (RENDER_BACKEND=auto 선택에 사용)
+        calibrate(VIDEO_RESOLUTION, ENCODING_PROFILE)
     else:
         run_weekly_schedule()
@@ -0,0 +1,17 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "media"))
+sys.path.insert(0, str(ROOT / "config"))
+
+@pytest.fixture
+def tts_openai(monkeypatch):
+    # 모듈 임포트 시 OpenAI 클라이언트를 만들므로 키만 채워 둔다 (요청은 보내지 않음)
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    import config
+    monkeypatch.setattr(config, "OPENAI_API_KEY", config.OPENAI_API_KEY or "test")
+    import tts_openai
+    return tts_openai
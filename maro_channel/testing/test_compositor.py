@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+타임라인 합성기(compositor) 테스트
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "media"))
+sys.path.insert(0, str(ROOT / "config"))
+
+def random_layer(rng, W, H):
+    from compositor import Layer
+    w, h = rng.randint(4, W // 2), rng.randint(4, H // 2)
+    rgb = np.array(np.random.default_rng(rng.randint(0, 1 << 30)).integers(0, 256, (h, w, 3)), dtype=np.uint8)
+    alpha = None if rng.random() < 0.3 else np.random.default_rng(rng.randint(0, 1 << 30)).random((h, w))
+    start = round(rng.uniform(0, 8), 2)
+    return Layer(rgb, alpha, rng.randint(-w // 2, W - w // 2), rng.randint(-h // 2, H - h // 2),
+                 start, start + round(rng.uniform(0.1, 4), 2))
+
+@pytest.mark.parametrize("seed", range(5))
+def test_next_frame_matches_frame_at(seed):
+    """증분 합성(next_frame)이 매 시각 전체 합성(frame_at)과 같은 프레임을 내야 함"""
+    from compositor import TimelineCompositor
+    rng = random.Random(seed)
+    W, H = 64, 48
+    background = np.array(np.random.default_rng(seed).integers(0, 256, (H, W, 3)), dtype=np.uint8)
+    compositor = TimelineCompositor(background, [random_layer(rng, W, H) for _ in range(rng.randint(1, 12))])
+    reference = TimelineCompositor(background, compositor.layers)
+    t = 0.0
+    while t < 12.0:
+        assert np.array_equal(compositor.next_frame(t), reference.frame_at(t)), t
+        t += rng.choice([0.04, 0.1, 0.5, 1.3])
+
+def test_next_frame_reuses_buffer_until_layers_change():
+    """화면 구성이 그대로면 같은 버퍼를 돌려주고, 바뀐 레이어 영역 밖은 다시 쓰지 않아야 함"""
+    from compositor import Layer, TimelineCompositor
+    background = np.zeros((20, 40, 3), dtype=np.uint8)
+    layers = [Layer(np.full((5, 5, 3), 200, dtype=np.uint8), None, 2, 2, 0.0, 1.0),
+              Layer(np.full((5, 5, 3), 100, dtype=np.uint8), None, 30, 10, 0.5, 2.0)]
+    compositor = TimelineCompositor(background, layers)
+    first = compositor.next_frame(0.0)
+    assert compositor.next_frame(0.2) is first
+    first[0, 20] = 7  # 더티 사각형 밖 표식
+    frame = compositor.next_frame(0.6)
+    assert frame[0, 20, 0] == 7 and frame[12, 32, 0] == 100
+    frame = compositor.next_frame(1.5)
+    assert frame[3, 3, 0] == 0 and frame[12, 32, 0] == 100
+
+def test_active_at_uses_half_open_intervals():
+    from compositor import Layer, TimelineCompositor
+    rgb = np.zeros((2, 2, 3), dtype=np.uint8)
+    compositor = TimelineCompositor(np.zeros((4, 4, 3), dtype=np.uint8),
+                                    [Layer(rgb, None, 0, 0, 1.0, 2.0), Layer(rgb, None, 0, 0, 2.0, 3.0)])
+    assert [compositor.active_at(t) for t in (0.5, 1.0, 1.99, 2.0, 3.0)] == [(), (0,), (0,), (1,), ()]
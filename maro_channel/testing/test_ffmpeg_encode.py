@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+정지 구간 인코딩(ffmpeg_encode) 테스트
+"""
+
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "media"))
+sys.path.insert(0, str(ROOT / "config"))
+
+needs_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg 없음")
+
+def frame_colors(path):
+    """디코딩한 프레임별 평균 밝기 (0~255)"""
+    proc = subprocess.run(["ffmpeg", "-hide_banner", "-i", str(path), "-vf", "signalstats,metadata=print",
+                           "-f", "null", "-"], capture_output=True, text=True)
+    return [float(v) for v in re.findall(r"lavfi.signalstats.YAVG=([0-9.]+)", proc.stderr)]
+
+def still(value, W=64, H=48):
+    return np.full((H, W, 3), value, dtype=np.uint8)
+
+@needs_ffmpeg
+def test_encode_stills_holds_each_still_for_its_duration(tmp_path):
+    """정지 이미지마다 지속시간만큼의 프레임이 순서대로 나와야 함"""
+    from ffmpeg_encode import encode_stills
+    out = tmp_path / "stills.mp4"
+    encode_stills([(still(0), 1.0), (still(255), 0.5), (still(0), 1.5)], None, str(out), profile="draft")
+    colors = frame_colors(out)
+    assert len(colors) == 30  # draft 10fps x 3초
+    bright = [i for i, c in enumerate(colors) if c > 128]
+    assert bright == list(range(10, 15))
+
+def test_snap_durations_keeps_boundaries_on_the_frame_grid():
+    from ffmpeg_encode import snap_durations
+    durations = [0.33, 0.33, 0.34, 1.01, 2.2]
+    snapped = snap_durations(durations, 24)
+    # 각 구간은 정수 프레임이고, 누적 경계는 원래 경계와 반 프레임 이내 (오차가 쌓이지 않음)
+    assert all(abs(d * 24 - round(d * 24)) < 1e-9 for d in snapped)
+    assert all(abs(a - b) <= 0.5 / 24 + 1e-9 for a, b in zip(np.cumsum(snapped), np.cumsum(durations)))
+    # 한 프레임보다 짧은 구간도 최소 한 프레임을 받고, 다음 구간이 그만큼 줄어든다
+    assert snap_durations([1.0, 0.004, 1.0], 24) == [1.0, 1 / 24, 23 / 24]
+
+@pytest.mark.parametrize("n_chunks", [1, 2, 3, 8])
+def test_split_chunks_balances_contiguous_ranges(n_chunks):
+    from ffmpeg_encode import split_chunks
+    durations = [3.0, 1.0, 1.0, 4.0, 2.0, 1.0]
+    chunks = split_chunks(durations, n_chunks)
+    assert chunks[0][0] == 0 and chunks[-1][1] == len(durations)
+    assert all(a[1] == b[0] for a, b in zip(chunks, chunks[1:]))
+    assert len(chunks) == min(n_chunks, len(durations))
+    if n_chunks == 2:
+        assert chunks == [(0, 4), (4, 6)]
+
+@needs_ffmpeg
+def test_parallel_chunks_match_single_pass(tmp_path):
+    """청크 병렬 인코딩 후 스트림 복사 연결 결과가 한 번에 인코딩한 결과와 같은 프레임이어야 함"""
+    from ffmpeg_encode import encode_stills
+    stills = [(still(v), d) for v, d in [(0, 0.7), (255, 1.2), (60, 0.4), (200, 0.9), (120, 1.3)]]
+    single, chunked = tmp_path / "single.mp4", tmp_path / "chunked.mp4"
+    encode_stills(stills, None, str(single), profile="draft")
+    encode_stills(stills, None, str(chunked), profile="draft", workers=3)
+    a, b = frame_colors(single), frame_colors(chunked)
+    assert len(a) == len(b) == 45
+    assert max(abs(x - y) for x, y in zip(a, b)) < 2
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+ffmpeg 필터그래프 백엔드(ffmpeg_graph) 문자열 생성 테스트
+"""
+
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "media"))
+sys.path.insert(0, str(ROOT / "config"))
+
+DEJAVU = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+CONTENT = {"type": "daily_comfort", "title": "Today's comfort", "content": "You did well.\n\nTake a slow breath.",
+           "duration_seconds": 12.0}
+
+@pytest.fixture
+def graph_parts(tmp_path):
+    pytest.importorskip("moviepy")
+    from ffmpeg_graph import build_filtergraph
+    def build(**kwargs):
+        args = dict(content=CONTENT, W=640, H=360, mode="landscape", font_path=DEJAVU, work_dir=str(tmp_path),
+                    total_duration=12.0, has_audio=True, profile="publish")
+        args.update(kwargs)
+        graph = build_filtergraph(**args)
+        video, _, audio = graph.partition(";")
+        assert video.startswith("[0:v]") and video.endswith("[v]")
+        return re.split(r",(?=[a-z]+=|format=|setsar=)", video[len("[0:v]"):-len("[v]")]), audio
+    return build
+
+def test_filtergraph_chain_order(graph_parts, tmp_path):
+    filters, audio = graph_parts()
+    names = [f.split("=", 1)[0] for f in filters]
+    assert names[:3] == ["scale", "crop", "setsar"]
+    assert names[-3:] == ["fade", "fade", "format"]
+    assert filters[-2] == "fade=t=out:st=11.000:d=1.0"
+    drawtexts = [f for f in filters if f.startswith("drawtext=")]
+    assert drawtexts and names[3:3 + len(drawtexts)] == ["drawtext"] * len(drawtexts)
+    # 줄마다 textfile 하나, 내용은 원문 줄 그대로
+    files = [Path(re.search(r"textfile='([^']+)'", f).group(1)) for f in drawtexts]
+    texts = [p.read_text(encoding="utf-8") for p in files]
+    assert "You did well." in " ".join(texts) and all(p.parent == tmp_path.resolve() for p in files)
+    assert all("enable='between(t," in f and "alpha='if(lt(t," in f for f in drawtexts)
+    assert audio == "[1:a]afade=t=in:st=0:d=0.5,afade=t=out:st=11.000:d=1.0[a]"
+
+def test_filtergraph_options(graph_parts):
+    filters, audio = graph_parts(W=1280, H=720, has_audio=False, profile="preview", background_chain=["zoompan=z=1:d=300"],
+                                 text_filters=["ass=subs.ass"])
+    assert filters[0] == "zoompan=z=1:d=300" and "ass=subs.ass" in filters
+    assert not any(f.startswith("drawtext=") for f in filters)
+    assert filters[-1] == "scale=640:360:flags=area" and audio == ""
+
+def test_escape_filter_value():
+    from ffmpeg_graph import escape_filter_value
+    assert escape_filter_value("C:\\fonts\\맑은 고딕.ttf") == "C\\:/fonts/맑은 고딕.ttf"
+    assert escape_filter_value("it's") == "it\\'s"
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+frame_sink 테스트 (ffmpeg 필요)
+"""
+
+import shutil
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "media"))
+sys.path.insert(0, str(ROOT / "config"))
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg 없음")
+
+FRAME = np.full((48, 64, 3), 128, dtype=np.uint8)
+
+@pytest.mark.parametrize("vfr", [False, True])
+def test_sink_encodes_on_clean_exit(tmp_path, vfr):
+    from frame_sink import FFmpegFrameSink
+    out = tmp_path / "out.mp4"
+    with FFmpegFrameSink(str(out), 64, 48, fps=10, profile="preview", vfr=vfr) as sink:
+        for _ in range(10):
+            sink.write(FRAME)
+    assert out.stat().st_size > 0
+
+@pytest.mark.parametrize("vfr", [False, True])
+def test_sink_aborts_on_exception(tmp_path, vfr):
+    """with 블록에서 예외가 나면 인코딩을 마무리하지 않고 프로세스/임시 파일/출력을 정리해야 함"""
+    from frame_sink import FFmpegFrameSink
+    out = tmp_path / "out.mp4"
+    with pytest.raises(KeyError):
+        with FFmpegFrameSink(str(out), 64, 48, fps=10, profile="preview", vfr=vfr) as sink:
+            for _ in range(10):
+                sink.write(FRAME)
+            proc, work_dir = sink._proc, getattr(sink, "_work_dir", None)
+            raise KeyError("렌더 실패")
+    assert not out.exists()
+    assert proc is None or proc.returncode is not None
+    assert work_dir is None or not Path(work_dir).exists()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Ken Burns 배경 테스트
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "media"))
+sys.path.insert(0, str(ROOT / "config"))
+
+@pytest.fixture
+def photo(tmp_path):
+    path = tmp_path / "photo.png"
+    Image.fromarray(np.random.default_rng(0).integers(0, 255, (90, 160, 3), dtype=np.uint8)).save(path)
+    return str(path)
+
+def test_ken_burns_zoompan_does_not_decode(photo):
+    """zoompan_filter만 쓰는 경로(stills/ffmpeg)는 배경 사진을 디코딩하지 않아야 함"""
+    import ken_burns
+    ken_burns.load_oversized.cache_clear()
+    kb = ken_burns.KenBurns(photo, 64, 36, duration=2.0, fps=10)
+    assert "zoompan=" in kb.zoompan_filter() and "d=20:s=64x36" in kb.zoompan_filter()
+    assert ken_burns.load_oversized.cache_info().currsize == 0
+    assert kb.frame(5).shape == (36, 64, 3)
+    assert ken_burns.load_oversized.cache_info().currsize == 1
+
+def test_zoompan_oversample_is_a_knob(photo):
+    """zoompan 입력 확대 배율은 기본 1배(원본 버퍼 크기)이고 oversample로 늘릴 수 있어야 함"""
+    import ken_burns
+    kb = ken_burns.KenBurns(photo, 64, 36, duration=2.0, fps=10)
+    assert kb.zoompan_filter(oversample=1).startswith(f"scale={kb.SW}:{kb.SH}:")
+    assert kb.zoompan_filter(oversample=4).startswith(f"scale={kb.SW * 4}:{kb.SH * 4}:")
+
+def test_frames_batches_match_frame(photo):
+    import ken_burns
+    kb = ken_burns.KenBurns(photo, 64, 36, duration=2.5, fps=10)
+    batches = list(kb.frames(batch_size=8))
+    assert [len(b) for b in batches] == [8, 8, 8, 1]
+    last = batches[-1][0].copy()
+    assert np.array_equal(last, kb.frame(24))
+
+def test_overlay_only_compositor_skips_background(photo, monkeypatch):
+    """stills + Ken Burns/애니메이션 경로는 정지 배경 이미지를 디코딩하지 않아야 함"""
+    pytest.importorskip("moviepy")
+    import video_maker
+    monkeypatch.setattr(video_maker, "background_frame", lambda *a: pytest.fail("배경을 디코딩함"))
+    content = {"type": "daily_comfort", "title": "오늘의 위로", "content": "괜찮아요.", "duration_seconds": 6}
+    compositor, layout = video_maker.build_compositor(content, photo, 640, 360, overlay_only=True)
+    assert layout and compositor.overlay_at(1.0).shape == (360, 640, 4)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+MP3 프레임 헤더 길이 계산(media_info) 테스트 (ffmpeg가 필요한 테스트는 없으면 건너뜀)
+"""
+
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "media"))
+sys.path.insert(0, str(ROOT / "config"))
+
+needs_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg 없음")
+
+def encode_tone(path, seconds, rate, codec_args, freq=440):
+    subprocess.run(["ffmpeg", "-y", "-loglevel", "error", "-f", "lavfi", "-i", f"sine=f={freq}:r={rate}:d={seconds}",
+                    "-ac", "1", "-c:a", "libmp3lame", *codec_args, str(path)], check=True)
+    return str(path)
+
+def decoded_samples(path):
+    pcm = subprocess.run(["ffmpeg", "-loglevel", "error", "-i", str(path), "-f", "s16le", "-ac", "1", "-"],
+                         capture_output=True, check=True).stdout
+    return np.frombuffer(pcm, dtype=np.int16)
+
+def test_parse_mp3_frame_header():
+    from media_info import parse_mp3_frame_header
+    # MPEG-1 Layer III, 128kbps, 44.1kHz, 조인트 스테레오
+    h = parse_mp3_frame_header(bytes([0xFF, 0xFB, 0x90, 0x44]), 0)
+    assert (h["mpeg1"], h["layer"], h["bitrate"], h["sample_rate"], h["channels"]) == (True, 3, 128000, 44100, 2)
+    assert (h["samples"], h["length"]) == (1152, 417)
+    # MPEG-2 Layer III, 64kbps, 24kHz, 모노, 패딩 비트
+    h = parse_mp3_frame_header(bytes([0xFF, 0xF3, 0x86, 0xC4]), 0)
+    assert (h["mpeg1"], h["bitrate"], h["sample_rate"], h["channels"]) == (False, 64000, 24000, 1)
+    assert (h["samples"], h["length"]) == (576, 193)
+    # 동기 비트 없음 / 예약된 비트레이트 인덱스
+    assert parse_mp3_frame_header(bytes([0x00, 0xFB, 0x90, 0x44]), 0) is None
+    assert parse_mp3_frame_header(bytes([0xFF, 0xFB, 0xF0, 0x44]), 0) is None
+
+@needs_ffmpeg
+@pytest.mark.parametrize("rate", [22050, 24000, 44100])
+@pytest.mark.parametrize("codec_args", [("-b:a", "64k"), ("-q:a", "4"), ("-b:a", "64k", "-write_xing", "0")],
+                         ids=["cbr", "vbr", "cbr-no-xing"])
+def test_mp3_duration_matches_decoded_length(tmp_path, rate, codec_args):
+    """헤더로 계산한 길이가 실제 디코딩 샘플 수와 같아야 함 (CBR/VBR, 여러 샘플레이트)"""
+    from media_info import mp3_duration_us
+    path = encode_tone(tmp_path / "tone.mp3", 2.345, rate, codec_args)
+    expected_us = len(decoded_samples(path)) * 1_000_000 / rate
+    assert abs(mp3_duration_us(path) - expected_us) < 100
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+미디어 렌더 경로 회귀 테스트 (ffmpeg 필요)
+렌더 결과 파일의 프레임 타임스탬프/길이를 직접 확인한다.
+"""
+
+import os
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "media"))
+sys.path.insert(0, str(ROOT / "config"))
+
+pytestmark = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg 없음")
+
+def frame_times(path):
+    """디코딩 순서의 비디오 프레임 표시 시각 목록 (초)"""
+    proc = subprocess.run(["ffmpeg", "-hide_banner", "-i", str(path), "-vf", "showinfo", "-f", "null", "-"],
+                          capture_output=True, text=True)
+    return [float(t) for t in re.findall(r"pts_time:([0-9.]+)", proc.stderr)]
+
+def make_tone(path, seconds, codec_args=("-c:a", "libmp3lame", "-b:a", "64k"), freq=440, rate=24000):
+    subprocess.run(["ffmpeg", "-y", "-loglevel", "error", "-f", "lavfi",
+                    "-i", f"sine=f={freq}:r={rate}:d={seconds}", *codec_args, str(path)], check=True)
+    return str(path)
+
+def test_vfr_body_with_bumpers(tmp_path, monkeypatch):
+    """VFR 본편 + 범퍼 연결 시 본편 프레임이 제 시각에 있고 아웃트로 길이가 유지되어야 함"""
+    import bumpers
+    import renderer
+    monkeypatch.setattr(bumpers, "BUMPER_CACHE_DIR", str(tmp_path / "bumpers"))
+    audio = make_tone(tmp_path / "narration.mp3", 12)
+    content = {"type": "healing_sound", "title": "T", "content": "x",
+               "segments": [{"text": "One.", "start": 0.5, "end": 2.5}, {"text": "Two.", "start": 3.0, "end": 6.0}]}
+    out = tmp_path / "video.mp4"
+    renderer.render(content, audio, "draft", out_path=str(out), resolution="640x360", backend="vfr",
+                    bumpers={"name": "maro", "slogan": "s"})
+
+    times = frame_times(out)
+    assert times == sorted(times)
+    intro, body_end = bumpers.INTRO_SECONDS, bumpers.INTRO_SECONDS + 12
+    body = [t - intro for t in times if intro - 0.1 < t < body_end - 0.1]
+    # 구간 경계(3.0초)의 프레임이 본편 안에서 같은 시각에 있어야 함 (범퍼 시작 오프셋 허용)
+    assert any(abs(t - 3.0) < 0.1 for t in body), body
+    outro = [t for t in times if t >= body_end - 0.1]
+    assert outro[-1] - outro[0] > bumpers.OUTRO_SECONDS - 0.5
+
+def test_bumpers_reencode_on_format_mismatch(tmp_path, monkeypatch):
+    """본편과 범퍼의 해상도/타임스케일이 다르면 재인코딩으로 연결해 길이와 프레임 순서가 유지되어야 함"""
+    import bumpers
+    from media_info import probe_duration, probe_video_format
+    monkeypatch.setattr(bumpers, "BUMPER_CACHE_DIR", str(tmp_path / "bumpers"))
+    main = tmp_path / "main.mp4"
+    subprocess.run(["ffmpeg", "-y", "-loglevel", "error", "-f", "lavfi", "-i", "testsrc=s=320x240:r=24:d=4",
+                    "-f", "lavfi", "-i", "sine=r=44100:d=4", "-c:v", "libx264", "-pix_fmt", "yuv420p",
+                    "-c:a", "aac", "-shortest", str(main)], check=True)
+    intro = bumpers.render_bumper("intro", {"name": "maro"}, "640x360", "draft", (44100, 1), duration=2.0)
+    assert probe_video_format(intro) != probe_video_format(str(main))
+
+    out = tmp_path / "out.mp4"
+    bumpers.splice_bumpers(str(main), str(out), intro=intro, profile="draft")
+    assert probe_video_format(str(out))["size"] == (320, 240)
+    assert abs(probe_duration(str(out)) - 6.0) < 0.2
+    times = frame_times(out)
+    assert times == sorted(times) and times[-1] > 5.5
+
+def decoded_seconds(path, rate=24000):
+    pcm = subprocess.run(["ffmpeg", "-loglevel", "error", "-i", str(path), "-f", "s16le", "-ac", "1", "-"],
+                         capture_output=True, check=True).stdout
+    return len(pcm) / 2 / rate
+
+def test_splice_vbr_parts_duration(tmp_path):
+    """VBR 구간을 이어 붙인 파일의 헤더 길이가 실제 디코딩 길이와 같아야 함 (Xing 태그 기록)"""
+    from media_info import mp3_duration_us
+    from mp3_splice import splice_mp3
+    parts = []
+    for i in range(6):
+        path = make_tone(tmp_path / f"part{i}.mp3", 1.0 + 0.37 * i, ("-ac", "1", "-c:a", "libmp3lame", "-q:a", "4"),
+                         freq=220 * (i + 1))
+        parts.append({"file": path, "duration": mp3_duration_us(path) / 1e6})
+    out = tmp_path / "spliced.mp3"
+    # 앞 무음(1초)이 CBR 판정 프레임 수보다 길어 태그 없이는 CBR로 잘못 계산된다
+    total = splice_mp3(parts, str(out), lead_in=1.0, gap=0.25)
+    assert abs(mp3_duration_us(str(out)) / 1e6 - decoded_seconds(out)) < 0.001
+    assert abs(total - decoded_seconds(out)) < 0.001
+
+def test_select_backend_without_calibration_uses_priority(tmp_path, monkeypatch):
+    """측정 결과가 없으면 렌더 도중 측정하지 않고 우선순위 순으로 골라야 함"""
+    import renderer
+    monkeypatch.setattr(renderer, "CALIBRATION_FILE", str(tmp_path / "calibration.json"))
+    monkeypatch.setattr(renderer, "available_backends", lambda: ["moviepy", "vfr"])
+    monkeypatch.setattr(renderer, "calibrate", lambda *a, **k: pytest.fail("select_backend가 측정을 실행함"))
+    assert renderer.select_backend("320x240", "preview") == "vfr"
+    assert not (tmp_path / "calibration.json").exists()
+
+def test_calibrate_does_not_touch_scene_cache(tmp_path, monkeypatch):
+    """명시적 측정 후 선택은 측정 결과를 따르고, scenes 측정은 공유 장면 캐시를 쓰지 않아야 함"""
+    import renderer
+    import scene_cache
+    monkeypatch.setattr(renderer, "CALIBRATION_FILE", str(tmp_path / "calibration.json"))
+    monkeypatch.setattr(renderer, "available_backends", lambda: ["scenes", "vfr"])
+    shared = Path(scene_cache.SCENE_CACHE_DIR)
+    before = sorted(shared.glob("*/*.mp4")) if shared.exists() else []
+
+    timings = renderer.calibrate("320x240", "preview", duration=16.0)
+    assert set(timings) == {"scenes", "vfr"}
+    assert renderer.select_backend("320x240", "preview") == min(timings, key=timings.get)
+    assert (sorted(shared.glob("*/*.mp4")) if shared.exists() else []) == before
+
+def test_encode_scenes_prunes_cache(tmp_path):
+    """encode_scenes가 끝나면 max_bytes를 넘는 만큼 오래된 클립부터 정리되어야 함"""
+    import numpy as np
+    from scene_cache import SceneCache, encode_scenes
+    frames = [np.full((120, 160, 3), 60 * i, dtype=np.uint8) for i in range(3)]
+    old = SceneCache(str(tmp_path / "scenes"), max_bytes=None)
+    encode_scenes([{"scene": i} for i in range(3)], [1.0] * 3, frames.__getitem__, None,
+                  str(tmp_path / "old.mp4"), old, "preview")
+    old_clips = set(old.cache_dir.glob("*/*.mp4"))
+    assert len(old_clips) == 3
+
+    # 클립 하나 반 크기로 제한하면 이번 렌더의 클립만 남는다
+    limit = max(p.stat().st_size for p in old_clips) * 3 // 2
+    cache = SceneCache(str(tmp_path / "scenes"), max_bytes=limit)
+    encode_scenes([{"scene": "new"}], [1.0], lambda i: frames[0], None, str(tmp_path / "new.mp4"), cache, "preview")
+    clips = set(cache.cache_dir.glob("*/*.mp4"))
+    assert len(clips) == 1 and not clips & old_clips
+
+def test_moving_background_warns_about_ignored_options(tmp_path, capsys):
+    """stills + Ken Burns 경로는 적용하지 못하는 scene_cache/workers/vfr를 알려야 함"""
+    import numpy as np
+    from PIL import Image
+    from video_maker import make_healing_video
+    photo = tmp_path / "photo.png"
+    Image.fromarray(np.full((180, 320, 3), 90, dtype=np.uint8)).save(photo)
+    content = {"type": "daily_comfort", "title": "오늘의 위로", "content": "괜찮아요.\n\n쉬어 가요.",
+               "duration_seconds": 3, "background_motion": "kenburns"}
+    out = tmp_path / "kb.mp4"
+    make_healing_video(None, content, str(photo), "320x180", str(out), render_mode="stills",
+                       workers=4, vfr=True, profile="preview")
+    assert out.stat().st_size > 0
+    assert "무시한 옵션: workers, vfr" in capsys.readouterr().out
+
+def test_filtergraph_probes_narration_once(tmp_path, monkeypatch):
+    """ffmpeg/ass 백엔드는 make_healing_video가 조회한 나레이션 길이를 다시 조회하지 않아야 함"""
+    import video_maker
+    from ffmpeg_encode import has_filter
+    if not has_filter("ass"):
+        pytest.skip("ass 필터 없음")
+    calls = []
+    probe = video_maker.probe_duration
+    monkeypatch.setattr(video_maker, "probe_duration", lambda path: calls.append(path) or probe(path))
+    audio = make_tone(tmp_path / "narration.mp3", 2.0)
+    content = {"type": "daily_comfort", "title": "오늘의 위로", "content": "괜찮아요."}
+    out = tmp_path / "ass.mp4"
+    video_maker.make_healing_video(audio, content, None, "320x180", str(out), render_mode="ass", profile="preview")
+    assert calls == [audio]
+    assert abs(frame_times(out)[-1] - 2.0) < 0.5
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+MP3 프레임 이어 붙이기(mp3_splice)와 Xing/Info 태그 테스트
+"""
+
+import random
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "media"))
+sys.path.insert(0, str(ROOT / "config"))
+
+needs_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg 없음")
+
+def encode_tone(path, seconds, rate, codec_args, freq=440):
+    subprocess.run(["ffmpeg", "-y", "-loglevel", "error", "-f", "lavfi", "-i", f"sine=f={freq}:r={rate}:d={seconds}",
+                    "-ac", "1", "-c:a", "libmp3lame", *codec_args, str(path)], check=True)
+    return str(path)
+
+def decoded_samples(path):
+    pcm = subprocess.run(["ffmpeg", "-loglevel", "error", "-i", str(path), "-f", "s16le", "-ac", "1", "-"],
+                         capture_output=True, check=True).stdout
+    return np.frombuffer(pcm, dtype=np.int16)
+
+@needs_ffmpeg
+def test_mp3_info_tag(tmp_path):
+    """Xing/Info 태그의 프레임 수와 지연/패딩으로 디코딩 샘플 수를 정확히 알 수 있어야 함"""
+    from media_info import mp3_info_tag, parse_mp3_frame_header, _id3v2_size
+    tagged = Path(encode_tone(tmp_path / "vbr.mp3", 1.5, 24000, ("-q:a", "4"))).read_bytes()
+    pos = _id3v2_size(tagged[:10])
+    header = parse_mp3_frame_header(tagged, pos)
+    frames, delay, padding = mp3_info_tag(tagged, pos, header)
+    assert delay > 0
+    assert frames * header["samples"] - delay - padding == len(decoded_samples(tmp_path / "vbr.mp3"))
+
+    untagged = Path(encode_tone(tmp_path / "plain.mp3", 1.5, 24000, ("-b:a", "64k", "-write_xing", "0"))).read_bytes()
+    pos = _id3v2_size(untagged[:10])
+    assert mp3_info_tag(untagged, pos, parse_mp3_frame_header(untagged, pos)) is None
+
+def onsets(samples, rate, threshold=3000, min_silence=0.1):
+    """무음(min_silence초 이상) 뒤 처음 threshold를 넘는 샘플 시각 목록"""
+    loud = np.flatnonzero(np.abs(samples.astype(np.int32)) > threshold)
+    starts = [loud[0]] + [b for a, b in zip(loud[:-1], loud[1:]) if b - a > min_silence * rate]
+    return [s / rate for s in starts]
+
+@needs_ffmpeg
+def test_splice_mp3_onsets(tmp_path):
+    """40개 구간을 이어 붙였을 때 실제 구간 시작이 기록된 시작 시각과 ±11ms, 목표 시각과 반 프레임 이내여야 함"""
+    from media_info import mp3_duration_us
+    from mp3_splice import splice_mp3
+    rng = random.Random(7)
+    parts = []
+    for i in range(40):
+        path = encode_tone(tmp_path / f"part{i:02d}.mp3", round(rng.uniform(0.3, 0.9), 3), 24000,
+                           ("-b:a", "64k"), freq=rng.choice([330, 440, 550]))
+        parts.append({"file": path, "duration": mp3_duration_us(path) / 1e6})
+    out = tmp_path / "spliced.mp3"
+    lead_in, gap = 0.5, 0.25
+    splice_mp3(parts, str(out), lead_in, gap)
+
+    expected, t = [], lead_in
+    for part in parts:
+        expected.append(t)
+        t += part["duration"] + gap
+    found = onsets(decoded_samples(out), 24000)
+    assert len(found) == len(expected)
+    assert max(abs(a - p["start"]) for a, p in zip(found, parts)) < 0.011
+    # 무음은 프레임(576샘플 = 24ms) 단위라 목표 시각과는 반 프레임까지 어긋날 수 있다
+    assert max(abs(p["start"] - b) for p, b in zip(parts, expected)) <= 0.012 + 1e-4
+
+def test_segment_timeline_prefers_spliced_starts(tts_openai):
+    parts = [{"text": "a", "duration": 1.0}, {"text": "b", "duration": 2.0}]
+    lead_in, gap = tts_openai.LEAD_IN_MS / 1000, tts_openai.SEGMENT_GAP_MS / 1000
+    assert [s["start"] for s in tts_openai.segment_timeline(parts)] == [lead_in, round(lead_in + 1.0 + gap, 3)]
+    parts[1]["start"] = 1.76
+    assert tts_openai.segment_timeline(parts)[1] == {"text": "b", "start": 1.76, "end": 3.76}
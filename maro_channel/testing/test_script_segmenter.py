@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+대본 문장 분할(script_segmenter) 테스트
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "media"))
+sys.path.insert(0, str(ROOT / "config"))
+
+def test_segment_script_sentences_and_paragraphs():
+    from script_segmenter import segment_script
+    text = '첫 문장입니다. "따옴표 안 문장이에요!" 그리고… 말줄임표 뒤.\n\n두 번째 문단?\n문장부호 없는 줄\n'
+    segments = segment_script(text)
+    assert [s["text"] for s in segments] == [
+        "첫 문장입니다.", '"따옴표 안 문장이에요!"', "그리고…", "말줄임표 뒤.", "두 번째 문단?", "문장부호 없는 줄"]
+    assert [s["paragraph"] for s in segments] == [0, 0, 0, 0, 1, 1]
+
+def test_segment_script_edge_cases():
+    from script_segmenter import segment_script
+    assert segment_script("") == []
+    assert segment_script("  \n\n \n") == []
+    # 소수점/약어처럼 뒤에 공백이 없는 마침표에서는 나누지 않는다
+    assert [s["text"] for s in segment_script("3.5초 쉬어요.")] == ["3.5초 쉬어요."]
+
+def test_segment_script_long_sentences():
+    from script_segmenter import segment_script
+    long_sentence = "천천히 숨을 들이쉬고, " * 30 + "내쉬어요."
+    pieces = [s["text"] for s in segment_script(long_sentence, max_chars=50)]
+    assert all(len(p) <= 50 for p in pieces)
+    assert pieces[0].endswith(",")  # 쉼표 위치에서 우선 분할
+    assert " ".join(pieces).split() == long_sentence.split()
+    # 공백이 없는 긴 문자열은 글자 단위로 자른다
+    assert [len(s["text"]) for s in segment_script("가" * 120, max_chars=50)] == [50, 50, 20]
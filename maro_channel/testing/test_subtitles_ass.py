@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+ASS 자막 생성(subtitles_ass) 테스트
+"""
+
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "media"))
+sys.path.insert(0, str(ROOT / "config"))
+
+DEJAVU = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+pytestmark = pytest.mark.skipif(not Path(DEJAVU).exists(), reason="DejaVuSans 없음")
+
+def item(text, align="left", position=(40, 60), start=0.0, duration=2.0, fontsize=60, color="white"):
+    return {"text": text, "fontsize": fontsize, "box_width": 560, "align": align, "position": position,
+            "start": start, "duration": duration, "color": color}
+
+def dialogues(ass):
+    return [line for line in ass.splitlines() if line.startswith("Dialogue:")]
+
+def test_build_ass_document():
+    from subtitles_ass import build_ass
+    layout = [item("Title {x}", align="center", position=("center", 40)),
+              item("Body line", align="right", start=2.0, duration=3.0, color="#FF8000"),
+              item("skipped", duration=0.0)]
+    ass = build_ass(layout, 640, 360, "healing_sound", DEJAVU)
+    assert "PlayResX: 640" in ass and "PlayResY: 360" in ass and "WrapStyle: 2" in ass
+    assert re.search(r"^Style: title,DejaVu Sans,", ass, re.M)
+    assert re.search(r"^Style: healing_sound,DejaVu Sans,.*,1,1,0,7,0,0,0,1$", ass, re.M)
+    title, body = dialogues(ass)
+    assert title.startswith("Dialogue: 0,0:00:00.00,0:00:02.00,title,,0,0,0,,{\\an8\\q2\\fs")
+    assert title.endswith("\\pos(320,40)}Title \\{x\\}")
+    assert body.startswith("Dialogue: 0,0:00:02.00,0:00:05.00,healing_sound,,")
+    assert "\\an9" in body and "\\1c&H0080FF&" in body and "\\fad(500,500)" in body
+    assert "\\pos(600,60)" in body
+
+def test_ass_font_size_uses_ascent_plus_descent():
+    """libass는 \\fs를 ascent+descent 높이로 해석하므로 Pillow em 크기보다 그 비율만큼 커야 함"""
+    from PIL import ImageFont
+    from subtitles_ass import ass_font_size
+    ascent, descent = ImageFont.truetype(DEJAVU, 1000).getmetrics()
+    assert ass_font_size(60, DEJAVU) == pytest.approx(60 * (ascent + descent) / 1000, abs=0.01)
+    assert ass_font_size(60, None) == 60
+
+def ink_box(img, threshold=128):
+    """밝은 픽셀(글자)의 경계 상자 (x0, y0, x1, y1)"""
+    ys, xs = np.nonzero(np.asarray(img.convert("L")) > threshold)
+    return xs.min(), ys.min(), xs.max(), ys.max()
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg 없음")
+def test_libass_line_boxes_match_pillow(tmp_path):
+    """libass로 번인한 줄 상자가 Pillow 래스터화 결과와 같은 위치/크기여야 함"""
+    from ffmpeg_encode import has_filter
+    from subtitles_ass import build_ass, ass_filter
+    from text_render import render_text
+    if not has_filter("ass"):
+        pytest.skip("ass 필터 없음")
+    W, H = 640, 360
+    # 첫 항목은 굵은 제목 스타일이라 비교에서 빼고 본문 줄만 비교한다
+    layout = [item("title", duration=0.0), item("Hello World, take a breath")]
+    ass_path = tmp_path / "subs.ass"
+    ass_path.write_text(build_ass(layout, W, H, "healing_sound", DEJAVU), encoding="utf-8")
+    burned = tmp_path / "burned.png"
+    subprocess.run(["ffmpeg", "-y", "-loglevel", "error", "-f", "lavfi", "-i", f"color=black:s={W}x{H}:r=10:d=2",
+                    "-vf", f"{ass_filter(str(ass_path), DEJAVU)},select=eq(n\\,10)", "-frames:v", "1", str(burned)],
+                   check=True)
+
+    rgba = render_text(layout[1]["text"], 60, 560, "left", "white", DEJAVU)
+    expected = Image.new("RGB", (W, H))
+    expected.paste(Image.fromarray(rgba), (40, 60), Image.fromarray(rgba))
+    # 외곽선(1px)과 안티에일리어싱 차이만 허용
+    assert np.abs(np.subtract(ink_box(Image.open(burned)), ink_box(expected))).max() <= 3
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Pillow 텍스트 래스터화 테스트
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "media"))
+sys.path.insert(0, str(ROOT / "config"))
+
+DEJAVU = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+pytestmark = pytest.mark.skipif(not Path(DEJAVU).exists(), reason="DejaVuSans 없음")
+
+def test_font_without_hangul_is_rejected(monkeypatch):
+    """한글 글리프가 없는 폰트는 MARO_FONT_PATH로 지정해도 한글 폰트로 고르지 않아야 함"""
+    import text_render
+    assert not text_render.has_hangul(DEJAVU)
+    monkeypatch.setenv("MARO_FONT_PATH", DEJAVU)
+    monkeypatch.setattr(text_render, "FONT_CANDIDATES", {"Linux": [DEJAVU]})
+    text_render.find_korean_font.cache_clear()
+    try:
+        assert text_render.find_korean_font() is None
+    finally:
+        text_render.find_korean_font.cache_clear()
+
+def test_layout_text_wraps_within_box():
+    import text_render
+    font = text_render.load_font(DEJAVU, 32)
+    text = "You did well today, take a slow breath " + "x" * 40
+    lines, height = text_render.layout_text(text, 32, 300, "center", DEJAVU)
+    assert len(lines) > 1
+    assert all(font.getlength(line) <= 300 for line, _, _ in lines)
+    assert " ".join(line for line, _, _ in lines).replace(" ", "") == text.replace(" ", "")
+    assert [y for _, _, y in lines] == sorted(y for _, _, y in lines) and height > lines[-1][2]
+    # 렌더 결과 크기는 레이아웃과 같다
+    assert text_render.render_text(text, 32, 300, "center", "white", DEJAVU).shape == (height, 300, 4)
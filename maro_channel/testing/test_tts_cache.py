@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+TTS 캐시(tts_cache) 테스트
+"""
+
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "media"))
+sys.path.insert(0, str(ROOT / "config"))
+
+def fake_mp3(path, size):
+    Path(path).write_bytes(b"\xff" * size)
+    return str(path)
+
+def test_tts_key_normalizes_whitespace_only():
+    from tts_cache import tts_key
+    key = tts_key("tts-1", "alloy", 1.0, "괜찮아요.  오늘도\n잘 했어요.")
+    assert key == tts_key("tts-1", "alloy", 1, "괜찮아요. 오늘도 잘 했어요. ")
+    assert key != tts_key("tts-1", "nova", 1.0, "괜찮아요. 오늘도 잘 했어요.")
+    assert key != tts_key("tts-1", "alloy", 1.1, "괜찮아요. 오늘도 잘 했어요.")
+    assert key != tts_key("tts-1", "alloy", 1.0, "괜찮아요! 오늘도 잘 했어요.")
+
+def test_tts_cache_hit_and_miss(tmp_path):
+    from tts_cache import TTSCache, tts_key
+    cache = TTSCache(str(tmp_path / "tts"))
+    key = tts_key("tts-1", "alloy", 1.0, "안녕하세요.")
+    assert cache.get(key) is None
+    stored = cache.put(key, fake_mp3(tmp_path / "a.mp3", 100), 1.25, "안녕하세요.")
+    hit = cache.get(key)
+    assert hit == {"file": stored, "duration": 1.25}
+    assert Path(stored).read_bytes() == (tmp_path / "a.mp3").read_bytes()
+    assert (cache.hits, cache.misses) == (1, 1)
+    # 메타데이터가 없는(기록 중 끊긴) 항목은 적중으로 보지 않는다
+    Path(stored).with_suffix(".json").unlink()
+    assert cache.get(key) is None and cache.misses == 2
+
+def test_tts_cache_prunes_least_recently_used(tmp_path):
+    from tts_cache import TTSCache, tts_key
+    cache = TTSCache(str(tmp_path / "tts"), max_bytes=250)
+    keys = [tts_key("tts-1", "alloy", 1.0, f"문장 {i}") for i in range(4)]
+    for i, key in enumerate(keys):
+        path = cache.put(key, fake_mp3(tmp_path / f"{i}.mp3", 100), 1.0)
+        os.utime(path, (1000 + i, 1000 + i))
+    # 가장 오래된 항목을 다시 쓰면 최근 사용으로 갱신되어 살아남는다
+    assert cache.get(keys[0]) is not None
+    cache.prune()
+    assert [cache.get(key) is not None for key in keys] == [True, False, False, True]
+    assert not cache.path_for(keys[1]).with_suffix(".json").exists()
+    cache.prune(max_bytes=0)
+    assert list(cache.cache_dir.glob("*/*")) == []
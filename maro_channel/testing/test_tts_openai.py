@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+OpenAI TTS 합성(tts_openai) 테스트 - API 요청은 보내지 않음
+"""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+def test_token_bucket_burst_then_rate(tts_openai, monkeypatch):
+    """capacity개는 바로 통과하고 이후에는 분당 rate 속도로 대기해야 함"""
+    clock = {"now": 1000.0}
+    monkeypatch.setattr(tts_openai.time, "monotonic", lambda: clock["now"])
+    monkeypatch.setattr(tts_openai.time, "sleep", lambda s: clock.__setitem__("now", clock["now"] + s))
+    bucket = tts_openai.TokenBucket(rate_per_minute=120, capacity=3)
+    times = []
+    for _ in range(7):
+        bucket.acquire()
+        times.append(clock["now"] - 1000.0)
+    assert times[:3] == [0.0, 0.0, 0.0]
+    assert times[3:] == pytest.approx([0.5, 1.0, 1.5, 2.0])
+
+def test_synthesize_segments_concurrent_in_order(tts_openai, monkeypatch, tmp_path):
+    """캐시에 없는 구간만 제한된 동시 요청으로 합성하고, 결과는 입력 순서를 유지해야 함"""
+    from tts_cache import TTSCache, tts_key
+    lock, state, requested = threading.Lock(), {"running": 0, "peak": 0}, []
+
+    def fake_synthesize(text, filename):
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+            requested.append(text)
+        time.sleep(0.05)
+        Path(filename).write_bytes(text.encode("utf-8"))
+        with lock:
+            state["running"] -= 1
+
+    monkeypatch.setattr(tts_openai, "_synthesize", fake_synthesize)
+    monkeypatch.setattr(tts_openai, "audio_duration", lambda path: len(Path(path).read_bytes()) / 10)
+    monkeypatch.setattr(tts_openai, "rate_limiter", tts_openai.TokenBucket(6000, capacity=10))
+    cache = TTSCache(str(tmp_path / "cache"))
+    texts = [f"문장 {i}" for i in range(8)]
+    cached = tmp_path / "cached.mp3"
+    cached.write_bytes(b"cached")
+    cache.put(tts_key(tts_openai.OPENAI_TTS_MODEL, tts_openai.OPENAI_TTS_VOICE, tts_openai.OPENAI_TTS_SPEED,
+                      texts[3]), str(cached), 9.0)
+
+    parts = tts_openai.synthesize_segments(texts, str(tmp_path / "out"), cache=cache, concurrency=3)
+    assert [p["text"] for p in parts] == texts
+    assert parts[3]["duration"] == 9.0 and Path(parts[3]["file"]).read_bytes() == b"cached"
+    assert sorted(requested) == sorted(texts[:3] + texts[4:])
+    assert 1 < state["peak"] <= 3